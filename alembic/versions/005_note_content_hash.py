@@ -0,0 +1,38 @@
+"""Add content hash to notes
+
+Revision ID: 005_note_content_hash
+Revises: 004_mcp_library
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+from src.models.orm.note import note_content_hash
+
+# revision identifiers, used by Alembic.
+revision = '005_note_content_hash'
+down_revision = '004_mcp_library'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('notes', sa.Column('content_hash', sa.BigInteger(), nullable=True))
+
+    # Backfill existing rows; the hash is computed in Python, not SQL
+    connection = op.get_bind()
+    notes = sa.table('notes', sa.column('id'), sa.column('content'), sa.column('content_hash'))
+    rows = connection.execute(sa.select(notes.c.id, notes.c.content)).all()
+    if rows:
+        connection.execute(
+            notes.update().where(notes.c.id == sa.bindparam('note_id')),
+            [{'note_id': row.id, 'content_hash': note_content_hash(row.content)} for row in rows],
+        )
+
+    op.create_index('ix_notes_content_hash', 'notes', ['content_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_content_hash', table_name='notes')
+    op.drop_column('notes', 'content_hash')
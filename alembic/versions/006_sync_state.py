@@ -0,0 +1,30 @@
+"""Create sync state table
+
+Revision ID: 006_sync_state
+Revises: 005_note_content_hash
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006_sync_state'
+down_revision = '005_note_content_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sync_state',
+        sa.Column('bucket', sa.String(length=64), nullable=False),
+        sa.Column('brainforge_root', sa.BigInteger(), nullable=True),
+        sa.Column('obsidian_root', sa.BigInteger(), nullable=True),
+        sa.Column('last_sync_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('bucket')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sync_state')
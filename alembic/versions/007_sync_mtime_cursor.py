@@ -0,0 +1,24 @@
+"""Add Obsidian mtime cursor to sync state
+
+Revision ID: 007_sync_mtime_cursor
+Revises: 006_sync_state
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_sync_mtime_cursor'
+down_revision = '006_sync_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sync_state', sa.Column('obsidian_mtime_cursor', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sync_state', 'obsidian_mtime_cursor')
@@ -0,0 +1,37 @@
+"""Notify listeners of note changes
+
+Revision ID: 008_note_change_notify
+Revises: 007_sync_mtime_cursor
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_note_change_notify'
+down_revision = '007_sync_mtime_cursor'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Announce the ID of every inserted or updated note on the note_changed
+    # channel, so sync can process changes as they happen instead of scanning
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_note_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('note_changed', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER notes_notify_changed
+        AFTER INSERT OR UPDATE ON notes
+        FOR EACH ROW EXECUTE FUNCTION notify_note_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS notes_notify_changed ON notes")
+    op.execute("DROP FUNCTION IF EXISTS notify_note_changed()")
@@ -0,0 +1,26 @@
+"""Add BrainForge update cursor to sync state and index notes by update time
+
+Revision ID: 009_sync_updated_cursor
+Revises: 008_note_change_notify
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_sync_updated_cursor'
+down_revision = '008_note_change_notify'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sync_state', sa.Column('brainforge_updated_cursor', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_notes_updated_at', 'notes', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_updated_at', table_name='notes')
+    op.drop_column('sync_state', 'brainforge_updated_cursor')
@@ -0,0 +1,31 @@
+"""Make embeddings unique per note
+
+Revision ID: 010_embedding_note_unique
+Revises: 009_sync_updated_cursor
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_embedding_note_unique'
+down_revision = '009_sync_updated_cursor'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the most recently updated embedding of each note
+    op.execute("""
+        DELETE FROM embeddings e
+        USING embeddings newer
+        WHERE e.note_id = newer.note_id
+          AND (e.updated_at, e.id) < (newer.updated_at, newer.id)
+    """)
+    op.drop_index('idx_embeddings_note_id', table_name='embeddings')
+    op.create_index('uq_embeddings_note_id', 'embeddings', ['note_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_embeddings_note_id', table_name='embeddings')
+    op.create_index('idx_embeddings_note_id', 'embeddings', ['note_id'])
@@ -0,0 +1,31 @@
+"""Index embeddings with HNSW on inner product
+
+Revision ID: 011_embedding_hnsw_ip
+Revises: 010_embedding_note_unique
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_embedding_hnsw_ip'
+down_revision = '010_embedding_note_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Inner-product ordering ranks by cosine and L2 distance only for unit
+    # vectors, and embeddings stored before VectorStore normalized them may
+    # not be; normalize them before the index is built over them
+    op.execute("UPDATE embeddings SET vector = l2_normalize(vector) WHERE vector IS NOT NULL")
+
+    op.create_index(
+        'ix_embeddings_vector_hnsw', 'embeddings', ['vector'],
+        postgresql_using='hnsw', postgresql_ops={'vector': 'vector_ip_ops'},
+    )
+
+
+def downgrade() -> None:
+    # Normalized vectors are left as they are; cosine distances are unchanged by it
+    op.drop_index('ix_embeddings_vector_hnsw', table_name='embeddings')
@@ -0,0 +1,31 @@
+"""Index half-precision and binary-quantized embeddings
+
+Revision ID: 012_embedding_quantized_indexes
+Revises: 011_embedding_hnsw_ip
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012_embedding_quantized_indexes'
+down_revision = '011_embedding_hnsw_ip'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Expression indexes match the casts quantized candidate searches order by
+    op.execute("""
+        CREATE INDEX ix_embeddings_vector_halfvec ON embeddings
+        USING hnsw ((vector::halfvec(1536)) halfvec_ip_ops)
+    """)
+    op.execute("""
+        CREATE INDEX ix_embeddings_vector_bit ON embeddings
+        USING hnsw ((binary_quantize(vector)::bit(1536)) bit_hamming_ops)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embeddings_vector_bit', table_name='embeddings')
+    op.drop_index('ix_embeddings_vector_halfvec', table_name='embeddings')
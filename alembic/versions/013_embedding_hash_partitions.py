@@ -0,0 +1,73 @@
+"""Hash-partition embeddings by note_id
+
+Revision ID: 013_embedding_hash_partitions
+Revises: 012_embedding_quantized_indexes
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '013_embedding_hash_partitions'
+down_revision = '012_embedding_quantized_indexes'
+branch_labels = None
+depends_on = None
+
+PARTITIONS = 16
+
+# Indexes created on the parent table cascade to every partition
+INDEXES = (
+    "CREATE UNIQUE INDEX uq_embeddings_note_id ON embeddings (note_id)",
+    "CREATE INDEX ix_embeddings_vector_hnsw ON embeddings USING hnsw (vector vector_ip_ops)",
+    "CREATE INDEX ix_embeddings_vector_halfvec ON embeddings"
+    " USING hnsw ((vector::halfvec(1536)) halfvec_ip_ops)",
+    "CREATE INDEX ix_embeddings_vector_bit ON embeddings"
+    " USING hnsw ((binary_quantize(vector)::bit(1536)) bit_hamming_ops)",
+)
+
+
+def _rebuild(partitioned: bool) -> None:
+    # The old table's indexes are dropped with it after the copy, but the new
+    # table claims the primary key's name as soon as it is created
+    op.execute("ALTER TABLE embeddings RENAME TO embeddings_old")
+    op.execute("ALTER TABLE embeddings_old RENAME CONSTRAINT embeddings_pkey TO embeddings_old_pkey")
+
+    # A partitioned table's primary key must include the partition key
+    primary_key = "PRIMARY KEY (id, note_id)" if partitioned else "PRIMARY KEY (id)"
+    partition_by = "PARTITION BY HASH (note_id)" if partitioned else ""
+    op.execute(f"""
+        CREATE TABLE embeddings (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            note_id UUID NOT NULL,
+            vector vector(1536),
+            model_version VARCHAR(100) NOT NULL,
+            {primary_key},
+            FOREIGN KEY (note_id) REFERENCES notes(id) ON DELETE CASCADE
+        ) {partition_by}
+    """)
+    if partitioned:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE embeddings_p{remainder} PARTITION OF embeddings "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+            )
+
+    op.execute("""
+        INSERT INTO embeddings (id, created_at, updated_at, note_id, vector, model_version)
+        SELECT id, created_at, updated_at, note_id, vector, model_version FROM embeddings_old
+    """)
+    op.execute("DROP TABLE embeddings_old")
+
+    # Indexes are built after the copy, which is faster than maintaining them row by row
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    _rebuild(partitioned=False)
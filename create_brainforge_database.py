@@ -6,51 +6,33 @@ Creates the 'brainforge' database on the PostgreSQL server
 
 import asyncio
 import os
-import sys
 from datetime import datetime
 from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Add src to Python path to import BrainForge modules
-sys.path.insert(0, 'src')
-
 from src.services.sqlalchemy_service import SQLAlchemyService
 from src.models.note import Note  # Using Note model as a sample model
 
 
-async def create_brainforge_database():
-    """Create the brainforge database on the PostgreSQL server"""
-    
-    print("BrainForge Database Creation Script")
-    print("=" * 50)
-    
-    # Get database URL from environment
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        print("ERROR: DATABASE_URL environment variable not found")
-        print("Please ensure .env file contains DATABASE_URL")
-        return False
-    
-    # Create a connection URL to the default 'postgres' database
-    # Replace the database name in the URL with 'postgres' (default database)
-    default_db_url = database_url.replace('/brainforge', '/postgres')
-    
-    # Replace postgresql:// with postgresql+asyncpg:// for async operations
-    if default_db_url.startswith('postgresql://'):
-        default_db_url = default_db_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+def async_database_url(database_url, database):
+    """Parse a server URL for the given database, using the asyncpg driver for PostgreSQL"""
+    url = make_url(database_url)
+    if url.drivername in ('postgresql', 'postgres'):
+        url = url.set(drivername='postgresql+asyncpg')
+    return url.set(database=database)
+
+
+async def create_brainforge_database(service, database_url):
+    """Create the brainforge database on the PostgreSQL server
     
-    print(f"Server URL: {default_db_url.split('@')[0]}@[hidden]")
-    print(f"Target database: brainforge")
-    print(f"Operation started at: {datetime.now().isoformat()}")
+    service is connected to the server's default 'postgres' database.
+    """
     
     try:
-        # Initialize SQLAlchemyService with the default database
-        print("Connecting to default 'postgres' database...")
-        service = SQLAlchemyService(default_db_url, Note, Note)
-        
         async with service.async_session() as session:
             # Check if brainforge database already exists
             print("Checking if 'brainforge' database exists...")
@@ -87,12 +69,10 @@ async def create_brainforge_database():
                 
                 # Test connecting to the new database
                 print("Testing connection to new database...")
-                brainforge_url = database_url.replace('/postgres', '/brainforge')
-                if brainforge_url.startswith('postgresql://'):
-                    brainforge_url = brainforge_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+                brainforge_url = async_database_url(database_url, 'brainforge')
                 
+                brainforge_service = SQLAlchemyService(brainforge_url, Note, Note)
                 try:
-                    brainforge_service = SQLAlchemyService(brainforge_url, Note, Note)
                     async with brainforge_service.async_session() as test_session:
                         test_result = await test_session.execute(text("SELECT 1"))
                         if test_result.scalar() == 1:
@@ -102,6 +82,8 @@ async def create_brainforge_database():
                     print(f"⚠️  Connection test failed: {str(e)}")
                     print("Database was created but connection test failed")
                     return True
+                finally:
+                    await brainforge_service.engine.dispose()
             else:
                 print("ERROR: Database creation verification failed")
                 return False
@@ -115,31 +97,19 @@ async def create_brainforge_database():
         return False
 
 
-async def list_databases():
+async def list_databases(service):
     """List all databases on the server for verification"""
     
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        return
-    
-    # Create a connection URL to the default 'postgres' database
-    default_db_url = database_url.replace('/brainforge', '/postgres')
-    if default_db_url.startswith('postgresql://'):
-        default_db_url = default_db_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
-    
     try:
-        service = SQLAlchemyService(default_db_url, Note, Note)
-        
         async with service.async_session() as session:
             result = await session.execute(text("""
                 SELECT datname FROM pg_database 
                 WHERE datistemplate = false 
                 ORDER BY datname
             """))
-            databases = [row[0] for row in result.fetchall()]
             
             print("\n📊 Available databases on server:")
-            for db in databases:
+            for db in result.scalars():
                 print(f"   - {db}")
             
     except Exception as e:
@@ -149,13 +119,38 @@ async def list_databases():
 async def main():
     """Main function to create the database"""
     
-    # Create the brainforge database
-    success = await create_brainforge_database()
+    print("BrainForge Database Creation Script")
+    print("=" * 50)
     
-    if success:
-        # List databases for verification
-        await list_databases()
+    # Get database URL from environment
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL environment variable not found")
+        print("Please ensure .env file contains DATABASE_URL")
+        success = False
+    else:
+        # Create a connection URL to the default 'postgres' database
+        default_db_url = async_database_url(database_url, 'postgres')
         
+        print(f"Server URL: {default_db_url.render_as_string(hide_password=True).split('@')[0]}@[hidden]")
+        print(f"Target database: brainforge")
+        print(f"Operation started at: {datetime.now().isoformat()}")
+        
+        # One engine to the default database serves both the creation and
+        # the listing, so its connection is set up once per run
+        print("Connecting to default 'postgres' database...")
+        service = SQLAlchemyService(default_db_url, Note, Note)
+        try:
+            # Create the brainforge database
+            success = await create_brainforge_database(service, database_url)
+            
+            if success:
+                # List databases for verification
+                await list_databases(service)
+        finally:
+            await service.engine.dispose()
+    
+    if success:
         print("\nSUCCESS: Database creation completed successfully!")
         print("Next steps:")
         print("   - Run database migrations: alembic upgrade head")
@@ -38,6 +38,12 @@ def get_embedding_service():
     return EmbeddingService()
 
 
+def get_vector_store():
+    """Get the process-wide vector store dependency."""
+    from ..services import vector_store
+    return vector_store.get_vector_store()
+
+
 def get_agent_run_service():
     """Get agent run service dependency."""
     from ..services.database import AgentRunService
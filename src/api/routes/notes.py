@@ -12,12 +12,12 @@ from ...models.note import Note, NoteCreate, NoteUpdate
 from ...models.orm.user import User
 from ...services.database import EmbeddingService, NoteService
 from ...services.embedding_generator import EmbeddingGenerator
-from ...services.vector_store import VectorStore
 from ..dependencies import (
     CurrentUser,
     DatabaseSession,
     EmbeddingServiceDep,
     NoteServiceDep,
+    get_vector_store,
 )
 
 logger = logging.getLogger(__name__)
@@ -61,7 +61,7 @@ async def generate_embedding_for_note(
 
         # Initialize services
         embedding_generator = EmbeddingGenerator(database_service)
-        vector_store = VectorStore(database_service)
+        vector_store = get_vector_store()
 
         # Generate embedding for the note content
         embedding_vector = await embedding_generator.generate_embedding(note_content)
@@ -20,12 +20,12 @@ from ...services.database import EmbeddingService, NoteService
 from ...services.embedding_generator import EmbeddingGenerator
 from ...services.hnsw_index import HNSWIndex
 from ...services.semantic_search import SemanticSearch
-from ...services.vector_store import VectorStore
 from ..dependencies import (
     CurrentUser,
     DatabaseSession,
     EmbeddingServiceDep,
     NoteServiceDep,
+    get_vector_store,
 )
 
 router = APIRouter()
@@ -72,7 +72,7 @@ async def search_notes(
 
         # Initialize services with database service
         embedding_generator = EmbeddingGenerator(database_service)
-        vector_store = VectorStore(database_service)
+        vector_store = get_vector_store()
         hnsw_index = HNSWIndex(database_service)
         semantic_search = SemanticSearch(
             embedding_generator=embedding_generator,
@@ -201,7 +201,7 @@ async def get_search_health(
         vector_store_health = "healthy"
         try:
             database_service = await get_database_service()
-            vector_store = VectorStore(database_service)
+            vector_store = get_vector_store()
         except Exception:
             vector_store_health = "degraded"
 
@@ -255,7 +255,7 @@ async def find_similar_notes(
 
         # Initialize services
         embedding_generator = EmbeddingGenerator(database_service)
-        vector_store = VectorStore(database_service)
+        vector_store = get_vector_store()
         hnsw_index = HNSWIndex(database_service)
         semantic_search = SemanticSearch(
             embedding_generator=embedding_generator,
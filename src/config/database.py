@@ -3,11 +3,14 @@
 import os
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # Import all ORM models to ensure they are registered with Base
 from ..models.orm.base import Base
+from ..models.orm.vector import register_vector_codecs, uses_binary_codec
 
 
 class DatabaseConfig:
@@ -15,6 +18,10 @@ class DatabaseConfig:
 
     def __init__(self) -> None:
         self.database_url = self._get_database_url()
+        # Connections kept open, and extra ones allowed under load; concurrent
+        # queries beyond their sum wait for a connection
+        self.pool_size = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+        self.max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
         self._engine = None
         self._async_session_maker = None
 
@@ -25,11 +32,13 @@ class DatabaseConfig:
             self._engine = create_async_engine(
                 self.database_url,
                 poolclass=AsyncAdaptedQueuePool,
-                pool_size=10,
-                max_overflow=20,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
                 pool_pre_ping=True,
                 echo=os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true",
             )
+            if uses_binary_codec(self._engine.dialect):
+                event.listen(self._engine.sync_engine, "connect", register_vector_codecs)
         return self._engine
 
     @property
@@ -56,9 +65,11 @@ class DatabaseConfig:
                 return "sqlite+aiosqlite:///./test.db"
             raise ValueError("DATABASE_URL environment variable is required")
 
-        # Convert sync URL to async URL if needed
-        if database_url.startswith("postgresql://"):
-            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        # Convert sync URL to async URL if needed, including the postgres://
+        # scheme some hosting providers issue
+        url = make_url(database_url)
+        if url.drivername in ("postgresql", "postgres"):
+            database_url = url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
 
         return database_url
 
@@ -1,11 +1,16 @@
 """Embedding ORM model for vector representations in BrainForge."""
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, ForeignKey, String
+from uuid import uuid4
+
+from sqlalchemy import DDL, Column, ForeignKey, Index, PrimaryKeyConstraint, String, event, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import declared_attr, relationship
 
 from .base import BaseEntity
+from .vector import Vector
+
+# Hash partitions of the embeddings table, each with its own HNSW indexes
+EMBEDDING_PARTITIONS = 16
 
 
 class Embedding(BaseEntity):
@@ -13,6 +18,9 @@ class Embedding(BaseEntity):
 
     __tablename__ = "embeddings"
 
+    # Declared here without primary_key so the table's primary key can be
+    # (id, note_id), as partitioning requires
+    id = Column(PGUUID(as_uuid=True), default=uuid4, nullable=False)
     note_id = Column(PGUUID(as_uuid=True), ForeignKey("notes.id", ondelete="CASCADE"), nullable=False)
     vector = Column(Vector(1536), nullable=True)  # Configurable dimension
     model_version = Column(String(100), nullable=False)
@@ -20,5 +28,48 @@ class Embedding(BaseEntity):
     # Relationships
     note = relationship("Note", back_populates="embeddings")
 
+    # One embedding per note, which bulk upserts resolve conflicts against.
+    # Vectors are unit-normalized, so the HNSW index uses inner product ops,
+    # which serve both cosine and inner product searches. The table is hash
+    # partitioned on note_id, so each partition has its own smaller indexes;
+    # rows are still identified by id alone.
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "note_id"),
+        Index("uq_embeddings_note_id", "note_id", unique=True),
+        Index(
+            "ix_embeddings_vector_hnsw", "vector",
+            postgresql_using="hnsw", postgresql_ops={"vector": "vector_ip_ops"},
+        ),
+        # Half-precision and binary-quantized forms for candidate generation,
+        # indexed by expression so full-precision vectors stay the stored form
+        Index(
+            "ix_embeddings_vector_halfvec",
+            text("(vector::halfvec(1536)) halfvec_ip_ops"),
+            postgresql_using="hnsw",
+        ),
+        Index(
+            "ix_embeddings_vector_bit",
+            text("(binary_quantize(vector)::bit(1536)) bit_hamming_ops"),
+            postgresql_using="hnsw",
+        ),
+        {"postgresql_partition_by": "HASH (note_id)"},
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {"primary_key": [cls.id]}
+
     def __repr__(self) -> str:
         return f"<Embedding(id={self.id}, note_id={self.note_id}, model={self.model_version})>"
+
+
+# Indexes created on the partitioned table cascade to each partition
+for _remainder in range(EMBEDDING_PARTITIONS):
+    event.listen(
+        Embedding.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE embeddings_p{_remainder} PARTITION OF embeddings "
+            f"FOR VALUES WITH (MODULUS {EMBEDDING_PARTITIONS}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
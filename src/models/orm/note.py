@@ -2,11 +2,15 @@
 
 from enum import Enum as PyEnum
 
+import xxhash
 from sqlalchemy import (
+    BigInteger,
     CheckConstraint,
     Column,
     Enum,
+    Index,
     Text,
+    event,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -24,6 +28,18 @@ class NoteType(PyEnum):
     AGENT_GENERATED = "agent_generated"
 
 
+def note_content_hash(content: str) -> int:
+    """Hash note content for change detection.
+
+    The hash only has to detect edits, not resist tampering, so a fast
+    non-cryptographic 64-bit digest (XXH3) is used. It is returned as a
+    signed integer so it fits a BIGINT column and compares as a single
+    machine word.
+    """
+    digest = xxhash.xxh3_64_intdigest(content.encode('utf-8'))
+    return digest - (1 << 64) if digest >= 1 << 63 else digest
+
+
 class Note(BaseEntity, ProvenanceMixin, VersionMixin, AIGeneratedMixin):
     """Note ORM model with constitutional compliance."""
 
@@ -32,6 +48,8 @@ class Note(BaseEntity, ProvenanceMixin, VersionMixin, AIGeneratedMixin):
     content = Column(Text, nullable=False)
     note_type = Column(Enum(NoteType, name="note_type"), nullable=False)
     note_metadata = Column(JSONB, nullable=False, server_default='{}')
+    # Hash of content, kept current on every assignment to content
+    content_hash = Column(BigInteger, nullable=True, index=True)
 
     # Relationships
     embeddings = relationship("Embedding", back_populates="note", cascade="all, delete-orphan")
@@ -48,7 +66,15 @@ class Note(BaseEntity, ProvenanceMixin, VersionMixin, AIGeneratedMixin):
             "NOT (is_ai_generated AND ai_justification IS NULL)",
             name="ck_ai_justification_required"
         ),
+        # Incremental sync reads only the notes updated since its cursor
+        Index("ix_notes_updated_at", "updated_at"),
     )
 
     def __repr__(self) -> str:
         return f"<Note(id={self.id}, type={self.note_type}, created_by={self.created_by})>"
+
+
+@event.listens_for(Note.content, "set")
+def _update_content_hash(target: Note, value: str, oldvalue, initiator) -> None:
+    """Rehash content whenever it is assigned, so the stored hash never goes stale."""
+    target.content_hash = note_content_hash(value) if value is not None else None
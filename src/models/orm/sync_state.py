@@ -0,0 +1,28 @@
+"""SyncState ORM model for Obsidian synchronization bookkeeping in BrainForge."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, String
+
+from .base import Base
+
+
+class SyncState(Base):
+    """Per-bucket record of what the last successful sync saw.
+
+    Each note type is a bucket. The root hashes summarize every note in the
+    bucket on each side, so a bucket whose roots both match the stored ones
+    has not changed since the last sync and can be skipped. The cursors are
+    the latest Obsidian modification time and the latest BrainForge update
+    time seen in the bucket.
+    """
+
+    __tablename__ = "sync_state"
+
+    bucket = Column(String(64), primary_key=True)
+    brainforge_root = Column(BigInteger, nullable=True)
+    obsidian_root = Column(BigInteger, nullable=True)
+    obsidian_mtime_cursor = Column(Float, nullable=True)
+    brainforge_updated_cursor = Column(DateTime(timezone=True), nullable=True)
+    last_sync_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SyncState(bucket={self.bucket}, last_sync_at={self.last_sync_at})>"
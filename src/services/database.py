@@ -1,17 +1,74 @@
 """Database service implementation for BrainForge with async SQLAlchemy."""
 
+import math
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from pgvector import Vector
+from pgvector.sqlalchemy import BIT
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    text,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ..models.orm.agent_run import AgentRunORM as AgentRun
 from ..models.orm.embedding import Embedding
 from ..models.orm.link import Link
-from ..models.orm.note import Note
+from ..models.orm.note import Note, NoteType
+from ..models.orm.vector import HalfVector
 from ..models.orm.version_history import VersionHistory
 from .base import BaseService
 
+# pgvector comparator method for each distance metric other than cosine,
+# which is derived from the inner product of unit-normalized vectors
+DISTANCE_OPERATORS = {
+    "l2": "l2_distance",
+    "inner_product": "max_inner_product",
+}
+
+# Reduced-precision vector forms usable for candidate generation
+QUANTIZATION_MODES = ("fp32", "fp16", "binary")
+
+# Bounds of the HNSW candidate list size set per search: pgvector's default,
+# and its maximum
+EF_SEARCH_MIN = 40
+EF_SEARCH_MAX = 1000
+
+# Filtered searches matching at most this many embeddings compute exact
+# distances over the matches instead of scanning the HNSW index
+EXACT_SEARCH_MAX_ROWS = 10_000
+
+# Planner estimate of the embeddings row count. The partitioned parent has no
+# rows of its own (reltuples is -1 or 0), so the partitions' estimates are
+# summed; an unpartitioned table has no partitions and counts itself.
+EMBEDDING_ROWS_ESTIMATE_SQL = """
+    SELECT sum(greatest(reltuples, 0))::bigint FROM pg_class
+    WHERE oid = 'embeddings'::regclass
+       OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = 'embeddings'::regclass)
+"""
+
+
+def _embedding_record(data: dict[str, Any]) -> dict[str, Any]:
+    """Column values of an embedding from data that may carry other keys."""
+    columns = Embedding.__table__.columns.keys()
+    record = {key: value for key, value in data.items() if key in columns}
+    if isinstance(record.get("note_id"), str):
+        record["note_id"] = UUID(record["note_id"])
+    return record
+
 
 class NoteService(BaseService[Note]):
     """Note-specific database service."""
@@ -69,6 +126,306 @@ class EmbeddingService(BaseService[Embedding]):
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def create_embeddings_bulk(self, session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+        """Insert or replace the embeddings of several notes in one statement.
+
+        Rows are upserted with a single multi-row INSERT ... ON CONFLICT
+        (note_id) DO UPDATE, so a batch costs one round trip whether its notes
+        already have embeddings or not. Keys that are not embeddings columns
+        are ignored. The caller commits. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+
+        records = [_embedding_record(row) for row in rows]
+        stmt = insert(Embedding).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Embedding.note_id],
+            set_={
+                "vector": stmt.excluded.vector,
+                "model_version": stmt.excluded.model_version,
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+        return len(records)
+
+    async def get_statistics(self, session: AsyncSession) -> dict[str, Any]:
+        """Count embeddings in total and per model version."""
+        stmt = select(Embedding.model_version, func.count()).group_by(Embedding.model_version)
+        models = dict((await session.execute(stmt)).all())
+        return {
+            "count": sum(models.values()),
+            "avg_dimensions": Embedding.vector.type.dim if models else 0,
+            "models": models,
+        }
+
+    async def analyze(self, session: AsyncSession) -> None:
+        """Refresh the planner statistics of the embeddings table and its partitions."""
+        await session.execute(text("ANALYZE embeddings"))
+
+    async def delete_orphaned(self, session: AsyncSession) -> int:
+        """Delete embeddings whose note no longer exists. The caller commits."""
+        orphaned = ~exists().where(Note.id == Embedding.note_id)
+        result = await session.execute(delete(Embedding).where(orphaned))
+        return result.rowcount
+
+    async def similarity_search(self, session: AsyncSession, query_vector: list[float], limit: int = 10,
+                                distance_metric: str = "cosine",
+                                note_type_weights: dict[str, float] | None = None,
+                                quantization: str = "fp32",
+                                rerank_k: int | None = None,
+                                exclude_note_ids: list[UUID] | None = None) -> list[tuple[Embedding, float]]:
+        """Get the embeddings nearest to a query vector as (embedding, distance) pairs.
+
+        With note_type_weights, the rerank_k nearest candidates (default 4x
+        limit) are taken from the index first, and only those are re-ranked
+        by similarity boosted by the weight of the note's type, so the
+        weighting never turns the search into a sort over every embedding.
+
+        With quantization "fp16" or "binary", the candidates are found on
+        half-precision or binary-quantized vectors, which moves 2x or 32x
+        fewer bytes per row, and only those are reranked at full precision.
+
+        Embeddings of exclude_note_ids are filtered out in the query itself,
+        so they take no result slot. Bitmap scans are then disabled for the
+        rest of the transaction, which would otherwise lose the index order.
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+
+        reranked = quantization != "fp32" or bool(note_type_weights)
+        candidate_limit = (rerank_k or limit * 4) if reranked else limit
+        await self._set_ef_search(session, max(limit, candidate_limit))
+
+        distance = self._distance(Embedding.vector, query_vector, distance_metric)
+        order_key = self._order_key(Embedding.vector, query_vector, distance_metric)
+        stmt = select(Embedding, distance.label("distance"))
+
+        exclusion = None
+        if exclude_note_ids:
+            exclusion = Embedding.note_id.not_in([UUID(str(note_id)) for note_id in exclude_note_ids])
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+
+        if not reranked:
+            if exclusion is not None:
+                stmt = stmt.where(exclusion)
+            result = await session.execute(stmt.order_by(order_key).limit(limit))
+            return [(embedding, float(embedding_distance)) for embedding, embedding_distance in result.all()]
+
+        # Candidates come from an index scan ordered by the bare operator;
+        # note_id is unique, and as the partition key it lets the outer
+        # lookup go straight to each candidate's partition
+        if quantization != "fp32":
+            candidate_order = self._quantized_distance(query_vector, distance_metric, quantization)
+        else:
+            candidate_order = order_key
+        candidates = select(Embedding.note_id).order_by(candidate_order).limit(candidate_limit)
+        if exclusion is not None:
+            candidates = candidates.where(exclusion)
+        stmt = stmt.where(Embedding.note_id.in_(candidates.scalar_subquery()))
+
+        if note_type_weights:
+            weight = case(
+                {NoteType(value): weight for value, weight in note_type_weights.items()
+                 if value in NoteType._value2member_map_},
+                value=Note.note_type,
+                else_=1.0,
+            )
+            similarity = self._similarity(distance, distance_metric)
+            stmt = stmt.join(Note, Note.id == Embedding.note_id).order_by((similarity * weight).desc())
+        else:
+            stmt = stmt.order_by(distance)
+
+        result = await session.execute(stmt.limit(limit))
+        return [(embedding, float(embedding_distance)) for embedding, embedding_distance in result.all()]
+
+    async def hybrid_search(self, session: AsyncSession, query_vector: list[float],
+                            filters: dict[str, Any], limit: int = 10,
+                            distance_metric: str = "cosine") -> list[tuple[Embedding, float]]:
+        """Get the embeddings nearest to a query vector among notes matching filters.
+
+        Filter keys naming a notes column match that column; any other key
+        matches the note's metadata. The matches are counted first, up to
+        EXACT_SEARCH_MAX_ROWS. When that few match, distances are computed
+        exactly over a materialized set of the matches, which returns every
+        result and cannot run past ef_search. Otherwise the HNSW index is
+        scanned with the filter applied to its output, and ef_search is
+        raised by the fraction of embeddings the filter rejects.
+        """
+        if not filters:
+            return await self.similarity_search(session, query_vector, limit, distance_metric)
+
+        conditions = self._filter_conditions(filters)
+        matching_rows = await session.scalar(
+            select(func.count()).select_from(
+                select(Embedding.id)
+                .join(Note, Note.id == Embedding.note_id)
+                .where(*conditions)
+                .limit(EXACT_SEARCH_MAX_ROWS + 1)
+                .subquery()
+            )
+        )
+        if not matching_rows:
+            return []
+
+        if matching_rows <= EXACT_SEARCH_MAX_ROWS:
+            # MATERIALIZED keeps the planner from folding the filter back
+            # into an index scan ordered by distance
+            matches = (
+                select(Embedding.id, Embedding.vector)
+                .join(Note, Note.id == Embedding.note_id)
+                .where(*conditions)
+                .cte("matches")
+                .prefix_with("MATERIALIZED")
+            )
+            distance = self._distance(matches.c.vector, query_vector, distance_metric)
+            stmt = (
+                select(Embedding, distance.label("distance"))
+                .join(matches, matches.c.id == Embedding.id)
+                .order_by(distance)
+            )
+        else:
+            # The planner's row estimate is enough to size the candidate list
+            total_rows = await session.scalar(text(EMBEDDING_ROWS_ESTIMATE_SQL))
+            survival = min(1.0, matching_rows / total_rows) if total_rows and total_rows > 0 else 1.0
+            await self._set_ef_search(session, math.ceil(limit / survival))
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+            distance = self._distance(Embedding.vector, query_vector, distance_metric)
+            stmt = (
+                select(Embedding, distance.label("distance"))
+                .join(Note, Note.id == Embedding.note_id)
+                .where(*conditions)
+                .order_by(self._order_key(Embedding.vector, query_vector, distance_metric))
+            )
+
+        result = await session.execute(stmt.limit(limit))
+        return [(embedding, float(embedding_distance)) for embedding, embedding_distance in result.all()]
+
+    @staticmethod
+    def _filter_conditions(filters: dict[str, Any]) -> list[Any]:
+        """WHERE conditions on notes for hybrid search filters."""
+        columns = Note.__table__.c
+        conditions = []
+        for key, value in filters.items():
+            if key == "note_type" and value in NoteType._value2member_map_:
+                conditions.append(Note.note_type == NoteType(value))
+            elif key in columns and key != "note_metadata":
+                conditions.append(columns[key] == value)
+            else:
+                conditions.append(Note.note_metadata.contains({key: value}))
+        return conditions
+
+    async def batch_similarity_search(self, session: AsyncSession, query_vectors: list[list[float]],
+                                      limit: int = 10,
+                                      distance_metric: str = "cosine") -> list[list[tuple[Embedding, float]]]:
+        """Get the embeddings nearest to each of several query vectors in one query.
+
+        The query vectors form a VALUES table, and a LATERAL subquery finds
+        the nearest limit embeddings for each of them, so the whole batch
+        costs one round trip and one plan. Results are in query order.
+        """
+        await self._set_ef_search(session, limit)
+        # VALUES columns are untyped in Postgres, so the vectors are sent in
+        # text form, which needs no codec, and cast explicitly
+        queries = values(
+            column("qid", Integer), column("qv", String), name="queries"
+        ).data([(qid, Vector(query).to_text()) for qid, query in enumerate(query_vectors)])
+        query_vector = cast(queries.c.qv, Embedding.vector.type)
+        distance = self._distance(Embedding.vector, query_vector, distance_metric)
+        nearest = (
+            select(Embedding.id.label("embedding_id"), distance.label("distance"))
+            .order_by(self._order_key(Embedding.vector, query_vector, distance_metric))
+            .limit(limit)
+            .correlate(queries)
+            .lateral("nearest")
+        )
+        stmt = (
+            select(queries.c.qid, Embedding, nearest.c.distance)
+            .select_from(queries)
+            .join(nearest, true())
+            .join(Embedding, Embedding.id == nearest.c.embedding_id)
+            .order_by(queries.c.qid, nearest.c.distance)
+        )
+
+        result = await session.execute(stmt)
+        results: list[list[tuple[Embedding, float]]] = [[] for _ in query_vectors]
+        for qid, embedding, embedding_distance in result.all():
+            results[qid].append((embedding, float(embedding_distance)))
+        return results
+
+    @staticmethod
+    async def _set_ef_search(session: AsyncSession, limit: int) -> None:
+        """Size the HNSW candidate list for the rest of the transaction to a search's LIMIT.
+
+        Twice the limit, within EF_SEARCH_MIN and EF_SEARCH_MAX, keeps small
+        searches fast and gives large ones enough candidates to fill the limit.
+        """
+        ef_search = min(max(EF_SEARCH_MIN, 2 * limit), EF_SEARCH_MAX)
+        # SET takes no bind parameters; the value is always an int
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    @classmethod
+    def _distance(cls, stored: Any, query: Any, distance_metric: str) -> Any:
+        """Distance expression between stored vectors and a query vector.
+
+        Embeddings are persisted with unit L2 norm, so cosine distance is one
+        plus pgvector's negative inner product (<#>), with no norms computed.
+        L2 distance is still computed with <->, but only for the rows
+        returned, since rows are ordered by _order_key.
+        """
+        if distance_metric == "l2":
+            return getattr(stored, DISTANCE_OPERATORS["l2"])(query)
+        order_key = cls._order_key(stored, query, distance_metric)
+        return 1.0 + order_key if distance_metric == "cosine" else order_key
+
+    @staticmethod
+    def _similarity(distance: Any, distance_metric: str) -> Any:
+        """Similarity expression, higher for nearer rows, from a _distance expression.
+
+        Cosine similarity is one minus cosine distance, and the inner product
+        is the negation of <#>. For unit-norm stored vectors, L2 distance d
+        corresponds to cosine similarity 1 - d^2/2, which keeps weighted L2
+        rankings on the same scale as cosine ones.
+        """
+        if distance_metric == "cosine":
+            return 1.0 - distance
+        if distance_metric == "l2":
+            return 1.0 - distance * distance / 2.0
+        return -distance
+
+    @staticmethod
+    def _order_key(stored: Any, query: Any, distance_metric: str) -> Any:
+        """Bare pgvector operator expression that orders rows like the distance.
+
+        Ordering by the operator itself, rather than an expression built on
+        it, is what lets an HNSW index serve the ORDER BY ... LIMIT; cosine
+        orders by <#>, which the vector_ip_ops index covers. So does L2: for
+        unit-norm stored vectors the squared L2 distance to a query is a
+        constant plus twice <#>, so both order rows the same way, with no
+        square root or norm computed per row.
+        """
+        operator = (
+            "max_inner_product" if distance_metric in ("cosine", "l2")
+            else DISTANCE_OPERATORS[distance_metric]
+        )
+        return getattr(stored, operator)(query)
+
+    def _quantized_distance(self, query_vector: list[float], distance_metric: str, quantization: str):
+        """Expression ordering rows by their distance to the query in reduced precision."""
+        dimensions = Embedding.vector.type.dim
+        if quantization == "fp16":
+            stored = cast(Embedding.vector, HalfVector(dimensions))
+            query = literal(query_vector, HalfVector(dimensions))
+            return self._order_key(stored, query, distance_metric)
+
+        # Binary quantization keeps one sign bit per dimension; Hamming distance
+        # orders candidates regardless of the final distance metric
+        # The stored side matches the ix_embeddings_vector_bit index expression
+        stored = cast(func.binary_quantize(Embedding.vector), BIT(dimensions))
+        query = func.binary_quantize(literal(query_vector, Embedding.vector.type), type_=BIT(dimensions))
+        return stored.hamming_distance(query)
+
 
 class AgentRunService(BaseService[AgentRun]):
     """Agent run-specific database service."""
@@ -113,6 +470,92 @@ class VersionHistoryService(BaseService[VersionHistory]):
         return result.scalar_one_or_none()
 
 
+class EmbeddingStoreService:
+    """Embedding storage backend of VectorStore, opening a session per call.
+
+    VectorStore calls its backend without a session, so each method runs
+    one EmbeddingService operation in a session of its own, committing
+    writes before it returns.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], pool_size: int | None = None):
+        self.session_maker = session_maker
+        # Lets VectorStore run as many searches at once as there are connections
+        self.pool_size = pool_size
+        self.embedding_service = EmbeddingService()
+
+    async def get_embedding_by_note_id(self, note_id: str | UUID) -> Embedding | None:
+        """Get the embedding of a note, if it has one."""
+        async with self.session_maker() as session:
+            embeddings = await self.embedding_service.get_by_note(session, UUID(str(note_id)))
+            return embeddings[0] if embeddings else None
+
+    async def create_embedding(self, data: dict[str, Any]) -> Embedding:
+        """Create an embedding; keys that are not embeddings columns are ignored."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.create(session, _embedding_record(data))
+
+    async def update_embedding(self, id: UUID, data: dict[str, Any]) -> Embedding | None:
+        """Update an embedding; keys that are not embeddings columns are ignored."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.update(session, id, _embedding_record(data))
+
+    async def create_embeddings_bulk(self, rows: list[dict[str, Any]]) -> int:
+        """Upsert the embeddings of several notes in one transaction."""
+        async with self.session_maker() as session:
+            count = await self.embedding_service.create_embeddings_bulk(session, rows)
+            await session.commit()
+            return count
+
+    async def similarity_search(self, query_vector: list[float], limit: int = 10,
+                                distance_metric: str = "cosine",
+                                **options: Any) -> list[tuple[Embedding, float]]:
+        """Get the embeddings nearest to a query vector; see EmbeddingService.similarity_search."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.similarity_search(
+                session, query_vector=query_vector, limit=limit,
+                distance_metric=distance_metric, **options,
+            )
+
+    async def hybrid_search(self, query_vector: list[float], filters: dict[str, Any],
+                            limit: int = 10,
+                            distance_metric: str = "cosine") -> list[tuple[Embedding, float]]:
+        """Get the nearest embeddings among notes matching filters."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.hybrid_search(
+                session, query_vector=query_vector, filters=filters,
+                limit=limit, distance_metric=distance_metric,
+            )
+
+    async def batch_similarity_search(self, query_vectors: list[list[float]], limit: int = 10,
+                                      distance_metric: str = "cosine") -> list[list[tuple[Embedding, float]]]:
+        """Get the embeddings nearest to each of several query vectors in one query."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.batch_similarity_search(
+                session, query_vectors=query_vectors, limit=limit,
+                distance_metric=distance_metric,
+            )
+
+    async def get_embedding_statistics(self) -> dict[str, Any]:
+        """Count embeddings in total and per model version."""
+        async with self.session_maker() as session:
+            return await self.embedding_service.get_statistics(session)
+
+    async def optimize_vector_index(self) -> bool:
+        """Refresh the statistics the planner and filtered searches estimate from."""
+        async with self.session_maker() as session:
+            await self.embedding_service.analyze(session)
+            await session.commit()
+            return True
+
+    async def cleanup_orphaned_embeddings(self) -> int:
+        """Delete embeddings whose note no longer exists."""
+        async with self.session_maker() as session:
+            count = await self.embedding_service.delete_orphaned(session)
+            await session.commit()
+            return count
+
+
 class DatabaseService:
     """Main database service that provides access to all entity services."""
 
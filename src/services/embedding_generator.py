@@ -11,6 +11,8 @@ import random
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 # Import OpenAI client (will be mocked for testing)
 try:
     from openai import (
@@ -36,6 +38,22 @@ from src.services.database import DatabaseService
 logger = logging.getLogger(__name__)
 
 
+def normalize_embedding(vector: list[float] | None) -> list[float] | None:
+    """Scale an embedding to unit L2 norm.
+
+    All persisted and query embeddings have unit norm, so cosine
+    similarity between them is a plain dot product. Zero vectors and
+    None are returned unchanged.
+    """
+    if vector is None:
+        return None
+    array = np.asarray(vector, dtype=np.float64)
+    norm = np.linalg.norm(array)
+    if not norm:
+        return vector
+    return (array / norm).tolist()
+
+
 class EmbeddingGenerator:
     """Service for generating and managing text embeddings with robust error handling."""
 
@@ -117,12 +135,12 @@ class EmbeddingGenerator:
             self.health_status["successful_requests"] += 1
             self.health_status["consecutive_failures"] = 0
             self.health_status["last_success"] = datetime.now()
-            return embedding
+            return normalize_embedding(embedding)
 
         # If primary method fails and fallback is enabled
         if use_fallback and self.fallback_config["use_fallback"]:
             logger.warning(f"Primary embedding generation failed, attempting fallback for text: {text[:100]}...")
-            return await self._generate_fallback_embedding(text)
+            return normalize_embedding(await self._generate_fallback_embedding(text))
 
         self.health_status["consecutive_failures"] += 1
         self.health_status["error_count"] += 1
@@ -254,7 +272,7 @@ class EmbeddingGenerator:
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
             batch_results = await self._process_batch_with_fallback(batch, use_fallback)
-            results.extend(batch_results)
+            results.extend(normalize_embedding(result) for result in batch_results)
 
         successful_count = sum(1 for result in results if result is not None)
         self.health_status["successful_requests"] += successful_count
@@ -402,7 +420,7 @@ class EmbeddingGenerator:
         try:
             embedding_data = EmbeddingCreate(
                 note_id=note_id,
-                vector=embedding_vector,
+                vector=normalize_embedding(embedding_vector),
                 model_version=self.model_version
             )
 
@@ -439,7 +457,7 @@ class EmbeddingGenerator:
             # Update embedding
             updated_embedding = await self.database_service.update_embedding(
                 existing_embedding.id,
-                {"vector": new_embedding_vector, "model_version": self.model_version}
+                {"vector": normalize_embedding(new_embedding_vector), "model_version": self.model_version}
             )
             logger.info(f"Updated embedding for note {note_id}")
             return updated_embedding
@@ -32,7 +32,7 @@ from src.services.embedding_generator import EmbeddingGenerator
 from src.services.hnsw_index import HNSWIndex
 from src.services.pdf_processor import PDFProcessor
 from src.services.semantic_search import SemanticSearchService
-from src.services.vector_store import VectorStore
+from src.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +47,7 @@ class IngestionService:
         self.embedding_generator = EmbeddingGenerator(self.database_service)
 
         # Initialize semantic search dependencies
-        self.vector_store = VectorStore(database_url)
+        self.vector_store = get_vector_store()
         self.hnsw_index = HNSWIndex(database_url)
         self.semantic_search = SemanticSearchService(
             self.embedding_generator,
@@ -32,6 +32,10 @@ class StructuredLogger:
             user_id: User ID if authenticated
             duration_ms: Request duration in milliseconds
         """
+        # Records the level would discard are not built or serialized
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         log_data = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": "INFO",
@@ -56,6 +60,9 @@ class StructuredLogger:
             status_code: HTTP status code
             user_id: User ID if authenticated
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         log_data = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": "INFO",
@@ -77,6 +84,9 @@ class StructuredLogger:
             request: FastAPI request object (optional)
             user_id: User ID if authenticated
         """
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+
         log_data = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": "ERROR",
@@ -103,6 +113,9 @@ class StructuredLogger:
             value: Metric value
             tags: Additional tags for the metric
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         log_data = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": "INFO",
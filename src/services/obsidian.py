@@ -50,9 +50,19 @@ class ObsidianService(BaseService):
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.client: httpx.AsyncClient | None = None
+        # Number of open contexts sharing the client; it is closed by the last
+        self._client_users = 0
 
     async def __aenter__(self):
-        """Async context manager entry."""
+        """Async context manager entry.
+
+        Nested and concurrent contexts share one client, so concurrent calls
+        reuse its connection pool instead of closing each other's client.
+        """
+        self._client_users += 1
+        if self.client is not None:
+            return self
+
         headers = {}
         if self.token:
             headers['Authorization'] = f'Bearer {self.token}'
@@ -60,15 +70,19 @@ class ObsidianService(BaseService):
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             headers=headers,
-            timeout=30.0,
+            # Connecting to a down or unreachable server fails within seconds
+            # rather than waiting out the full request timeout
+            timeout=httpx.Timeout(30.0, connect=5.0),
             verify=True  # Enable SSL certificate verification to prevent MITM attacks
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.client:
-            await self.client.aclose()
+        self._client_users -= 1
+        if self._client_users == 0 and self.client:
+            client, self.client = self.client, None
+            await client.aclose()
 
     def _sanitize_filename(self, filename: str) -> str:
         """
@@ -236,6 +250,29 @@ class ObsidianService(BaseService):
             )
             response.raise_for_status()
 
+    async def put_note(self, filename: str, content: str) -> None:
+        """
+        Create a note in Obsidian vault, or replace the content of an existing one.
+
+        Unlike create_or_append_note, writing the same content twice leaves
+        the note as it was after the first write, so the call is safe to retry.
+
+        Args:
+            filename: Path to the note relative to vault root
+            content: The full content of the note
+        """
+        # Validate and sanitize filename to prevent path traversal
+        filename = self._sanitize_filename(filename)
+
+        async with self:
+            assert self.client is not None, "Client not initialized"
+            response = await self.client.put(
+                f'/vault/{filename}',
+                content=content,
+                headers={'Content-Type': 'text/markdown'}
+            )
+            response.raise_for_status()
+
     async def get_active_note(self, as_json: bool = False) -> ObsidianNote | None:
         """
         Get the currently active note in Obsidian.
@@ -301,6 +338,26 @@ class ObsidianService(BaseService):
             response.raise_for_status()
             return response.json()['files']
 
+    async def list_vault_index(self) -> dict[str, float]:
+        """
+        Get the modification time of every note in the vault in one request.
+        
+        Uses the API's JsonLogic search, which evaluates the query against each
+        note on the server and returns only the result, not the note content.
+        
+        Returns:
+            Dict[str, float]: Modification time of each note, keyed by path
+        """
+        async with self:
+            assert self.client is not None, "Client not initialized"
+            response = await self.client.post(
+                '/search/',
+                json={'var': 'stat.mtime'},
+                headers={'Content-Type': 'application/vnd.olrapi.jsonlogic+json'}
+            )
+            response.raise_for_status()
+            return {match['filename']: float(match['result']) for match in response.json()}
+
     async def get_available_commands(self) -> list[ObsidianCommand]:
         """
         Get available Obsidian commands.
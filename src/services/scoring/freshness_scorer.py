@@ -1,6 +1,9 @@
 """Freshness scoring service for evaluating content timeliness and recency."""
 
+import asyncio
 import logging
+from bisect import bisect_left
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any
 
@@ -8,6 +11,33 @@ from ...models.content_source import ContentSource
 
 logger = logging.getLogger(__name__)
 
+# Number of sources whose publication date is kept between scorings
+PUBLICATION_DATE_CACHE_SIZE = 4096
+
+# Freshness categories in ascending age order; anything older than "old" is "very_old"
+FRESHNESS_CATEGORIES = (
+    "very_fresh", "fresh", "recent", "somewhat_recent", "aging", "old", "very_old",
+)
+
+# Keyword groups mapped to the topic whose freshness requirement they imply
+TOPIC_KEYWORD_GROUPS = (
+    (("news", "current", "recent", "today"), "news"),
+    (("technology", "tech", "software", "ai"), "technology"),
+    (("science", "research", "study"), "science"),
+    (("politics", "government", "policy"), "politics"),
+    (("health", "medical", "medicine"), "health"),
+    (("finance", "economic", "market"), "finance"),
+)
+
+# Non-ISO date formats tried by _parse_date after the ISO-8601 fast path
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%B %d, %Y",
+    "%d %B %Y",
+)
+
 
 class FreshnessScorer:
     """Scores content freshness based on publication date, update frequency, and temporal relevance."""
@@ -36,12 +66,61 @@ class FreshnessScorer:
             "history": 1825,      # Historical content can be much older
         }
 
+        # Polynomial decay parameters for _calculate_freshness_score
+        self._base = 1.0
+        self._decay_delta = 0.55
+
+        self._compile_lookups()
+
+        # (signature, publication date) by source id, least recently used first
+        self._date_cache: OrderedDict[Any, tuple[int, datetime | None]] = OrderedDict()
+
     async def score_content(self, content_source: ContentSource, research_topic: str = None) -> float:
         """Score content freshness on a scale of 0.0 to 1.0."""
 
+        return self._score_source(content_source, research_topic)
+
+    def _publication_date(self, content_source: ContentSource) -> datetime | None:
+        """Publication date of a source, extracted again only when its metadata changes.
+
+        The score itself is always recomputed from the date, so it follows the
+        research topic's requirement and the current age of the content.
+        """
+
+        source_id = getattr(content_source, 'id', None)
+        if source_id is None:
+            return self._extract_publication_date(content_source)
+
+        signature = self._source_signature(content_source)
+        cached = self._date_cache.get(source_id)
+        if cached is not None and cached[0] == signature:
+            self._date_cache.move_to_end(source_id)
+            return cached[1]
+
+        publication_date = self._extract_publication_date(content_source)
+        self._date_cache[source_id] = (signature, publication_date)
+        self._date_cache.move_to_end(source_id)
+        if len(self._date_cache) > PUBLICATION_DATE_CACHE_SIZE:
+            self._date_cache.popitem(last=False)
+        return publication_date
+
+    def _source_signature(self, content_source: ContentSource) -> int:
+        """Hash the fields that influence a source's freshness score."""
+
+        return hash((
+            getattr(content_source, 'title', None),
+            getattr(content_source, 'description', None),
+            getattr(content_source, 'publication_date', None),
+            getattr(content_source, 'created_at', None),
+            repr(getattr(content_source, 'metadata', None)),
+        ))
+
+    def _score_source(self, content_source: ContentSource, research_topic: str = None) -> float:
+        """Synchronously score a single content source (no I/O is awaited)."""
+
         try:
             # Get publication date from content source
-            publication_date = self._extract_publication_date(content_source)
+            publication_date = self._publication_date(content_source)
 
             if not publication_date:
                 logger.warning(f"No publication date found for {content_source.url}")
@@ -58,11 +137,11 @@ class FreshnessScorer:
 
             # Apply recency bonuses for very fresh content
             if age_days <= self.freshness_thresholds["very_fresh"]:
-                freshness_score = min(1.0, freshness_score + 0.1)
+                freshness_score = freshness_score + 0.1 if freshness_score < 0.9 else 1.0
 
             # Apply penalties for very old content
             if age_days > self.freshness_thresholds["very_old"]:
-                freshness_score = max(0.1, freshness_score - 0.2)
+                freshness_score = freshness_score - 0.2 if freshness_score > 0.3 else 0.1
 
             logger.debug(f"Freshness scoring for {content_source.url}: "
                         f"age={age_days}d, requirement={freshness_requirement}d, "
@@ -111,31 +190,25 @@ class FreshnessScorer:
     def _parse_date(self, date_str: str) -> datetime | None:
         """Parse date string into datetime object."""
 
-        try:
-            # Try common date formats
-            formats = [
-                "%Y-%m-%d",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%d %H:%M:%S",
-                "%d/%m/%Y",
-                "%m/%d/%Y",
-                "%B %d, %Y",
-                "%d %B %Y",
-            ]
-
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-
-            # If none of the formats work, try parsing as ISO format
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-
-        except (ValueError, TypeError):
-            logger.warning(f"Could not parse date string: {date_str}")
-            return None
+        # Fast path: ISO-8601 strings go straight to fromisoformat (which accepts
+        # a trailing 'Z' on Python 3.11+) instead of failing through strptime
+        if len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-':
+            try:
+                parsed = datetime.fromisoformat(date_str)
+            except ValueError:
+                pass
+            else:
+                # The "...Z" strptime format produced naive datetimes; keep that
+                return parsed.replace(tzinfo=None) if date_str[-1] == 'Z' else parsed
+
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+
+        logger.warning(f"Could not parse date string: {date_str}")
+        return None
 
     def _calculate_age_days(self, publication_date: datetime) -> int:
         """Calculate age of content in days."""
@@ -148,36 +221,22 @@ class FreshnessScorer:
         """Get freshness requirement in days based on research topic."""
 
         if not research_topic:
-            return self.freshness_thresholds["recent"]  # Default requirement
+            return self._default_requirement
 
         research_topic_lower = research_topic.lower()
 
         # Match topic to freshness requirements
-        for topic, requirement in self.topic_freshness_requirements.items():
+        for topic, requirement in self._topic_requirements:
             if topic in research_topic_lower:
                 return requirement
 
         # Check for topic keywords that indicate specific freshness needs
-        if any(keyword in research_topic_lower for keyword in ["news", "current", "recent", "today"]):
-            return self.topic_freshness_requirements["news"]
-
-        if any(keyword in research_topic_lower for keyword in ["technology", "tech", "software", "ai"]):
-            return self.topic_freshness_requirements["technology"]
-
-        if any(keyword in research_topic_lower for keyword in ["science", "research", "study"]):
-            return self.topic_freshness_requirements["science"]
-
-        if any(keyword in research_topic_lower for keyword in ["politics", "government", "policy"]):
-            return self.topic_freshness_requirements["politics"]
-
-        if any(keyword in research_topic_lower for keyword in ["health", "medical", "medicine"]):
-            return self.topic_freshness_requirements["health"]
-
-        if any(keyword in research_topic_lower for keyword in ["finance", "economic", "market"]):
-            return self.topic_freshness_requirements["finance"]
+        for keywords, requirement in self._keyword_requirements:
+            if any(keyword in research_topic_lower for keyword in keywords):
+                return requirement
 
         # Default requirement for unknown topics
-        return self.freshness_thresholds["recent"]
+        return self._default_requirement
 
     def _calculate_freshness_score(self, age_days: int, freshness_requirement: int) -> float:
         """Calculate freshness score based on age and requirement."""
@@ -185,27 +244,26 @@ class FreshnessScorer:
         if age_days <= 0:
             return 1.0  # Future or current date - maximum freshness
 
-        # Calculate score using exponential decay
-        # Score decays faster as content ages beyond requirement
-        if age_days <= freshness_requirement:
-            # Within requirement - high score with linear decay
-            ratio = age_days / freshness_requirement
-            score = 1.0 - (ratio * 0.3)  # Only lose 30% at requirement boundary
-        else:
-            # Beyond requirement - exponential decay
-            excess_days = age_days - freshness_requirement
-            decay_factor = min(0.9, excess_days / (freshness_requirement * 2))
-            score = 0.7 * (1.0 - decay_factor)  # Start from 0.7 and decay
+        # Smooth polynomial decay: score = base * (1 - (t / tau) ** (1 / delta)),
+        # with tau at twice the requirement. Content at the requirement boundary
+        # keeps roughly 70% of its score and reaches the floor at tau.
+        tau = 2 * freshness_requirement
+        score = self._base * (1.0 - (age_days / tau) ** (1.0 / self._decay_delta))
 
-        return max(0.1, min(1.0, score))
+        return 0.1 if score < 0.1 else 1.0 if score > 1.0 else score
 
     async def get_freshness_analysis(self, content_source: ContentSource, research_topic: str = None) -> dict[str, Any]:
         """Get detailed freshness analysis for content."""
 
-        publication_date = self._extract_publication_date(content_source)
+        return self._analyze_source(content_source, research_topic)
+
+    def _analyze_source(self, content_source: ContentSource, research_topic: str = None) -> dict[str, Any]:
+        """Synchronously build the freshness analysis for a single content source."""
+
+        publication_date = self._publication_date(content_source)
         age_days = self._calculate_age_days(publication_date) if publication_date else None
         freshness_requirement = self._get_freshness_requirement(research_topic)
-        freshness_score = await self.score_content(content_source, research_topic)
+        freshness_score = self._score_source(content_source, research_topic)
 
         # Determine freshness category
         freshness_category = self._get_freshness_category(age_days) if age_days else "unknown"
@@ -224,33 +282,29 @@ class FreshnessScorer:
     def _get_freshness_category(self, age_days: int) -> str:
         """Get human-readable freshness category."""
 
-        if age_days <= self.freshness_thresholds["very_fresh"]:
-            return "very_fresh"
-        elif age_days <= self.freshness_thresholds["fresh"]:
-            return "fresh"
-        elif age_days <= self.freshness_thresholds["recent"]:
-            return "recent"
-        elif age_days <= self.freshness_thresholds["somewhat_recent"]:
-            return "somewhat_recent"
-        elif age_days <= self.freshness_thresholds["aging"]:
-            return "aging"
-        elif age_days <= self.freshness_thresholds["old"]:
-            return "old"
-        else:
-            return "very_old"
+        # First category whose upper bound is >= age_days; past "old" is "very_old"
+        return FRESHNESS_CATEGORIES[bisect_left(self._category_bounds, age_days)]
 
-    async def score_multiple_contents(self, content_sources: list, research_topic: str = None) -> dict[str, Any]:
-        """Score freshness for multiple content sources and provide comparative analysis."""
+    def _compile_lookups(self) -> None:
+        """Compile the threshold and requirement dicts into tuples for hot-path lookup."""
 
-        scores = []
-        analyses = []
+        self._topic_requirements = tuple(self.topic_freshness_requirements.items())
+        self._keyword_requirements = tuple(
+            (keywords, self.topic_freshness_requirements[topic])
+            for keywords, topic in TOPIC_KEYWORD_GROUPS
+        )
+        self._category_bounds = tuple(
+            self.freshness_thresholds[category] for category in FRESHNESS_CATEGORIES[:-1]
+        )
+        self._default_requirement = self.freshness_thresholds["recent"]
 
-        for content_source in content_sources:
-            score = await self.score_content(content_source, research_topic)
-            analysis = await self.get_freshness_analysis(content_source, research_topic)
+    async def score_multiple_contents(self, content_sources: list, research_topic: str = None) -> dict[str, Any]:
+        """Score freshness for multiple content sources and provide comparative analysis."""
 
-            scores.append(score)
-            analyses.append(analysis)
+        # Scoring is CPU-bound with no awaited I/O, so score the whole batch in a
+        # worker thread instead of allocating two coroutines per source.
+        analyses = await asyncio.to_thread(self._analyze_batch, content_sources, research_topic)
+        scores = [analysis["freshness_score"] for analysis in analyses]
 
         # Calculate statistics
         if scores:
@@ -272,14 +326,21 @@ class FreshnessScorer:
             "research_topic": research_topic
         }
 
+    def _analyze_batch(self, content_sources: list, research_topic: str = None) -> list[dict[str, Any]]:
+        """Build freshness analyses for a batch of content sources."""
+
+        return [self._analyze_source(content_source, research_topic) for content_source in content_sources]
+
     def update_freshness_thresholds(self, new_thresholds: dict[str, int]) -> None:
         """Update freshness scoring thresholds."""
 
         self.freshness_thresholds.update(new_thresholds)
+        self._compile_lookups()
         logger.info(f"Updated freshness thresholds: {new_thresholds}")
 
     def update_topic_requirements(self, new_requirements: dict[str, int]) -> None:
         """Update topic-specific freshness requirements."""
 
         self.topic_freshness_requirements.update(new_requirements)
+        self._compile_lookups()
         logger.info(f"Updated topic freshness requirements: {new_requirements}")
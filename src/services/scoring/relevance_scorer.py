@@ -2,13 +2,36 @@
 
 import logging
 import re
+from collections import Counter
 from difflib import SequenceMatcher
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
 from typing import Any
 
 from ...models.content_source import ContentSource
 
 logger = logging.getLogger(__name__)
 
+# Terms whose presence suggests in-depth content (matched as substrings)
+DEPTH_INDICATORS = (
+    "methodology", "analysis", "results", "discussion", "conclusion",
+    "experiment", "study", "research", "findings", "data"
+)
+
+
+@lru_cache(maxsize=256)
+def _feature_pattern(topic_keywords: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile the keyword and depth indicator scan pattern for a set of topic keywords."""
+
+    # Keywords match case-insensitively on word boundaries; depth indicators
+    # match anywhere, as plain substrings
+    depth_group = '(?P<depth>' + '|'.join(map(re.escape, DEPTH_INDICATORS)) + ')'
+    if not topic_keywords:
+        return re.compile(depth_group, re.IGNORECASE)
+    keyword_group = r'(?P<kw>\b(?:' + '|'.join(map(re.escape, topic_keywords)) + r')\b)'
+    return re.compile(keyword_group + '|' + depth_group, re.IGNORECASE)
+
 
 class RelevanceScorer:
     """Scores content relevance based on topic alignment, keyword matching, and semantic similarity."""
@@ -34,40 +57,15 @@ class RelevanceScorer:
         """Score content relevance on a scale of 0.0 to 1.0."""
 
         try:
-            # If no specific research topic provided, use content source context
-            if not research_topic and hasattr(content_source, 'research_topic'):
-                research_topic = content_source.research_topic
+            research_topic = self._resolve_research_topic(content_source, research_topic)
 
             if not research_topic:
                 logger.warning("No research topic provided for relevance scoring")
                 return 0.5  # Neutral score
 
-            scores = []
-            weights = []
-
-            # 1. Keyword matching scoring
-            keyword_score = self._score_keyword_matching(content_source, research_topic)
-            scores.append(keyword_score)
-            weights.append(0.4)  # 40% weight
-
-            # 2. Semantic similarity scoring
-            semantic_score = self._score_semantic_similarity(content_source, research_topic)
-            scores.append(semantic_score)
-            weights.append(0.3)  # 30% weight
-
-            # 3. Topic alignment scoring
-            topic_score = self._score_topic_alignment(content_source, research_topic)
-            scores.append(topic_score)
-            weights.append(0.2)  # 20% weight
-
-            # 4. Content depth scoring
-            depth_score = self._score_content_depth(content_source, research_topic)
-            scores.append(depth_score)
-            weights.append(0.1)  # 10% weight
-
-            # Calculate weighted average
-            weighted_score = sum(score * weight for score, weight in zip(scores, weights, strict=False))
-            weighted_score = max(0.0, min(1.0, weighted_score))  # Clamp to 0-1 range
+            keyword_score, semantic_score, topic_score, depth_score, weighted_score = (
+                self._compute_components(content_source, research_topic)
+            )
 
             logger.debug(f"Relevance scoring for {content_source.url} on topic '{research_topic}': "
                         f"keyword={keyword_score:.2f}, semantic={semantic_score:.2f}, "
@@ -80,31 +78,80 @@ class RelevanceScorer:
             logger.error(f"Error scoring relevance for {content_source.url}: {e}")
             return 0.5  # Default neutral score on error
 
-    def _score_keyword_matching(self, content_source: ContentSource, research_topic: str) -> float:
-        """Score based on keyword matching between research topic and content."""
+    def _resolve_research_topic(self, content_source: ContentSource, research_topic: str | None) -> str | None:
+        """The given research topic, or the content source's own if none was given."""
 
-        # Extract keywords from research topic
-        topic_keywords = self._extract_keywords(research_topic)
+        if not research_topic and hasattr(content_source, 'research_topic'):
+            return content_source.research_topic
+        return research_topic
+
+    def _compute_components(
+        self, content_source: ContentSource, research_topic: str
+    ) -> tuple[float, float, float, float, float]:
+        """Compute the four component scores and their clamped weighted sum."""
+
+        keyword_score, depth_score = self._score_text_features(content_source, research_topic)
+        semantic_score = self._score_semantic_similarity(content_source, research_topic)
+        topic_score = self._score_topic_alignment(content_source, research_topic)
+
+        weighted_score = (
+            keyword_score * 0.4  # 40% weight
+            + semantic_score * 0.3  # 30% weight
+            + topic_score * 0.2  # 20% weight
+            + depth_score * 0.1  # 10% weight
+        )
+        # Clamp to 0-1 range (a ternary avoids two builtin calls on the hot path)
+        weighted_score = 0.0 if weighted_score < 0.0 else 1.0 if weighted_score > 1.0 else weighted_score
+
+        return keyword_score, semantic_score, topic_score, depth_score, weighted_score
+
+    def _score_text_features(self, content_source: ContentSource, research_topic: str) -> tuple[float, float]:
+        """Score keyword matching and content depth from a single scan of the content text."""
 
         # Combine content text for analysis
         content_text = self._get_content_text(content_source)
 
         if not content_text:
-            return 0.3
+            return 0.3, 0.3
+
+        # Extract keywords from research topic, as a tuple to key the
+        # compiled scan pattern (_extract_keywords already drops duplicates)
+        topic_keywords = tuple(self._extract_keywords(research_topic))
+
+        keyword_matches, depth_matches = self._scan_text_features(content_text, topic_keywords)
+
+        keyword_score = self._score_keyword_matching(len(keyword_matches), len(topic_keywords))
+        depth_score = self._score_content_depth(content_text, len(depth_matches))
+
+        return keyword_score, depth_score
+
+    def _scan_text_features(self, content_text: str,
+                            topic_keywords: tuple[str, ...]) -> tuple[set[str], set[str]]:
+        """Collect matched topic keywords and depth indicators in one regex pass."""
+
+        pattern = _feature_pattern(topic_keywords)
+
+        keyword_matches: set[str] = set()
+        depth_matches: set[str] = set()
 
-        # Calculate keyword matches
-        matches = 0
-        total_keywords = len(topic_keywords)
+        for match in pattern.finditer(content_text):
+            term = match.group().lower()
+            if match.lastgroup == 'kw':
+                keyword_matches.add(term)
+                # A keyword match consumes its text, so pick up any depth
+                # indicators it contains as well
+                depth_matches.update(indicator for indicator in DEPTH_INDICATORS if indicator in term)
+            else:
+                depth_matches.add(term)
+
+        return keyword_matches, depth_matches
+
+    def _score_keyword_matching(self, matches: int, total_keywords: int) -> float:
+        """Score based on keyword matching between research topic and content."""
 
         if total_keywords == 0:
             return 0.5
 
-        for keyword in topic_keywords:
-            # Use case-insensitive matching with word boundaries
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, content_text, re.IGNORECASE):
-                matches += 1
-
         # Calculate match ratio
         match_ratio = matches / total_keywords
 
@@ -118,7 +165,7 @@ class RelevanceScorer:
         else:
             score = 0.7 + ((match_ratio - 0.7) * 0.3)
 
-        return max(0.0, min(1.0, score))
+        return 0.0 if score < 0.0 else 1.0 if score > 1.0 else score
 
     def _score_semantic_similarity(self, content_source: ContentSource, research_topic: str) -> float:
         """Score based on semantic similarity using text similarity algorithms."""
@@ -142,7 +189,7 @@ class RelevanceScorer:
         else:
             score = 0.7 + ((similarity - 0.3) * 0.3)
 
-        return max(0.0, min(1.0, score))
+        return 0.0 if score < 0.0 else 1.0 if score > 1.0 else score
 
     def _score_topic_alignment(self, content_source: ContentSource, research_topic: str) -> float:
         """Score based on broader topic alignment beyond exact keywords."""
@@ -156,6 +203,9 @@ class RelevanceScorer:
         if not content_topic_indicators:
             return 0.3
 
+        # Tokenize the topic once rather than once per indicator
+        topic_tokens = frozenset(normalized_topic.split())
+
         # Calculate topic overlap
         overlap_score = 0.0
 
@@ -163,25 +213,26 @@ class RelevanceScorer:
             # Check if research topic contains indicator or vice versa
             if indicator in normalized_topic or normalized_topic in indicator:
                 overlap_score += 0.2
+            # Check for partial matches only when containment did not match
+            elif self._calculate_partial_match(topic_tokens, frozenset(indicator.split())) > 0.6:
+                overlap_score += 0.1
             else:
-                # Check for partial matches
-                if self._calculate_partial_match(normalized_topic, indicator) > 0.6:
-                    overlap_score += 0.1
+                continue
 
-        return max(0.0, min(1.0, overlap_score))
+            # The score is capped at 1.0, so the remaining indicators cannot matter
+            if overlap_score >= 1.0:
+                return 1.0
 
-    def _score_content_depth(self, content_source: ContentSource, research_topic: str) -> float:
-        """Score based on content depth and comprehensiveness related to the topic."""
+        return 0.0 if overlap_score < 0.0 else 1.0 if overlap_score > 1.0 else overlap_score
 
-        content_text = self._get_content_text(content_source)
-
-        if not content_text:
-            return 0.3
+    def _score_content_depth(self, content_text: str, found_indicators: int) -> float:
+        """Score based on content depth and comprehensiveness related to the topic."""
 
         score = 0.5
 
-        # Length-based scoring (longer content tends to be more comprehensive)
-        word_count = len(content_text.split())
+        # Length-based scoring (longer content tends to be more comprehensive).
+        # Counting separators avoids building a token list just to take its length.
+        word_count = content_text.count(' ') + 1
         if word_count > 1000:
             score += 0.2
         elif word_count > 500:
@@ -189,23 +240,13 @@ class RelevanceScorer:
         elif word_count < 100:
             score -= 0.2
 
-        # Check for depth indicators
-        depth_indicators = [
-            "methodology", "analysis", "results", "discussion", "conclusion",
-            "experiment", "study", "research", "findings", "data"
-        ]
-
-        found_indicators = 0
-        for indicator in depth_indicators:
-            if indicator.lower() in content_text.lower():
-                found_indicators += 1
-
+        # Reward depth indicators found by _scan_text_features
         if found_indicators >= 3:
             score += 0.3
         elif found_indicators >= 1:
             score += 0.1
 
-        return max(0.0, min(1.0, score))
+        return 0.0 if score < 0.0 else 1.0 if score > 1.0 else score
 
     def _extract_keywords(self, text: str) -> list[str]:
         """Extract meaningful keywords from text."""
@@ -264,50 +305,55 @@ class RelevanceScorer:
             # Extract potential topic words (nouns and important terms)
             words = re.findall(r'\b[a-zA-Z]{4,}\b', content_text.lower())
 
-            # Filter for potential topic words (excluding common words)
-            topic_words = [word for word in words
-                          if word not in self.stop_words
-                          and len(word) > 3]
+            # Count potential topic words (excluding common words); the regex
+            # already guarantees a minimum length of four characters
+            stop_words = self.stop_words
+            word_freq = Counter(word for word in words if word not in stop_words)
 
-            # Take top 5 most frequent words as indicators
-            from collections import Counter
-            if topic_words:
-                word_freq = Counter(topic_words)
-                top_words = [word for word, _ in word_freq.most_common(5)]
+            # Take top 5 most frequent words as indicators with a bounded heap
+            # rather than ordering every distinct token
+            if word_freq:
+                top_words = [word for word, _ in nlargest(5, word_freq.items(), key=itemgetter(1))]
                 indicators.extend(top_words)
 
         return indicators
 
-    def _calculate_partial_match(self, text1: str, text2: str) -> float:
-        """Calculate partial match similarity between two texts."""
-
-        if not text1 or not text2:
-            return 0.0
-
-        # Use word-level similarity
-        words1 = set(text1.split())
-        words2 = set(text2.split())
+    def _calculate_partial_match(self, words1: frozenset[str], words2: frozenset[str]) -> float:
+        """Calculate word-level partial match similarity between two pre-tokenized texts."""
 
         if not words1 or not words2:
             return 0.0
 
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        return len(words1 & words2) / len(words1 | words2)
 
-        if not union:
-            return 0.0
+    async def get_relevance_breakdown(self, content_source: ContentSource, research_topic: str = None) -> dict[str, Any]:
+        """Get detailed relevance scoring breakdown.
 
-        return len(intersection) / len(union)
+        The research topic is resolved as in score_content. Without one, or if
+        scoring fails, the overall score is the same neutral 0.5 and the
+        breakdown is empty.
+        """
 
-    async def get_relevance_breakdown(self, content_source: ContentSource, research_topic: str) -> dict[str, Any]:
-        """Get detailed relevance scoring breakdown."""
+        research_topic = self._resolve_research_topic(content_source, research_topic)
+        neutral = {
+            "overall_score": 0.5,
+            "breakdown": {},
+            "research_topic": research_topic,
+            "content_source_id": str(content_source.id) if hasattr(content_source, 'id') else None
+        }
 
-        keyword_score = self._score_keyword_matching(content_source, research_topic)
-        semantic_score = self._score_semantic_similarity(content_source, research_topic)
-        topic_score = self._score_topic_alignment(content_source, research_topic)
-        depth_score = self._score_content_depth(content_source, research_topic)
+        if not research_topic:
+            logger.warning("No research topic provided for relevance breakdown")
+            return neutral
 
-        overall_score = await self.score_content(content_source, research_topic)
+        try:
+            keyword_score, semantic_score, topic_score, depth_score, weighted_score = (
+                self._compute_components(content_source, research_topic)
+            )
+        except Exception as e:
+            logger.error(f"Error scoring relevance breakdown for {content_source.url}: {e}")
+            return neutral
+        overall_score = round(weighted_score, 2)
 
         return {
             "overall_score": overall_score,
@@ -5,22 +5,187 @@ embedding generation, vector similarity search, and advanced result ranking.
 """
 
 import asyncio
+import copy
 import logging
 import math
+import time
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; scoring falls back to the NumPy expression
+    njit = None
+
 from src.models.embedding import Embedding
-from src.models.note import Note
+from src.models.note import Note, NoteType
 from src.services.database import DatabaseService
-from src.services.embedding_generator import EmbeddingGenerator
+from src.services.embedding_generator import EmbeddingGenerator, normalize_embedding
 from src.services.hnsw_index import HNSWIndex
 from src.services.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
 
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the k highest scores, descending, earlier index first on ties.
+
+    Uses an O(n) partition and only sorts the selected candidates, instead of
+    fully sorting every score to keep a handful.
+    """
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        kth_score = -np.partition(-scores, k - 1)[k - 1]
+        # Everything scoring at least the k-th best, so ties at the cut stay stable
+        candidates = np.flatnonzero(scores >= kth_score)
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+
+
+if njit is not None:
+    # Fast-math without the no-NaN/no-inf flags, which would let the
+    # compiler drop the isnan check on unknown creation dates. Not cached on
+    # disk (cached kernels fail to load under a different module name) and
+    # not parallel (candidate sets are around a hundred rows, too few to
+    # cover thread start-up), so it is compiled once per process, on the
+    # first search.
+    @njit(fastmath={"contract", "reassoc", "arcp"})
+    def _score_kernel(similarities, content_lengths, days_ago, note_type_weights,
+                      is_ai_generated, has_justification, semantic_weight,
+                      metadata_weight, quality_weight, content_length_boost,
+                      recency_decay_days):
+        """Fused advanced-score kernel: one pass, no intermediate arrays."""
+        scores = np.empty(similarities.shape[0])
+        for i in range(similarities.shape[0]):
+            # Branchless: +0.1 with a justification, -0.1 without, 0 if not AI-generated
+            quality = 0.5 + is_ai_generated[i] * (has_justification[i] * 0.2 - 0.1)
+            content_length_score = math.log1p(min(content_lengths[i] / 500.0, 2.0)) * content_length_boost
+            days = days_ago[i]
+            recency = 0.5 if math.isnan(days) else math.exp(-days / recency_decay_days)
+            score = (
+                semantic_weight * similarities[i] + metadata_weight * 0.5 + quality_weight * quality
+                + 0.05 * content_length_score + 0.05 * recency
+            ) * note_type_weights[i]
+            scores[i] = min(max(score, 0.0), 1.0)
+        return scores
+else:
+    _score_kernel = None
+
+
+class QueryEmbeddingCache:
+    """In-process cache of query embeddings and search results.
+
+    Embeddings are cached per normalized query text (exact match, LRU with
+    TTL). Final result lists are cached per (query, config) and tagged with the
+    database's data version so any note write invalidates them. On an exact
+    miss, a freshly generated embedding that is nearly identical (cosine
+    similarity above the threshold) to a cached query reuses that query's
+    results without searching again. Embeddings must have unit L2 norm, so
+    cosine similarity is a plain dot product.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0,
+                 similarity_threshold: float = 0.97):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        # normalized query -> (cached_at, embedding, embedding as an array)
+        self._embeddings: OrderedDict[str, tuple[float, list[float], np.ndarray]] = OrderedDict()
+        # (normalized query, config key) -> (cached_at, data version, results)
+        self._results: OrderedDict[tuple[str, str], tuple[float, Any, list[dict[str, Any]]]] = OrderedDict()
+
+        # Stacked unit vectors for similarity lookups, rebuilt lazily after changes
+        self._matrix: np.ndarray | None = None
+        self._matrix_keys: list[str] = []
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize query text for exact-match lookups."""
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def config_key(config: dict[str, Any] | None) -> str:
+        """Build a stable key for a search configuration override."""
+        return repr(sorted((config or {}).items()))
+
+    def get_embedding(self, key: str) -> list[float] | None:
+        """Return the cached embedding for a normalized query, if still fresh."""
+        entry = self._embeddings.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._embeddings[key]
+            self._matrix = None
+            return None
+        self._embeddings.move_to_end(key)
+        return entry[1]
+
+    def put_embedding(self, key: str, embedding: list[float]) -> None:
+        """Cache the embedding generated for a normalized query."""
+        self._embeddings[key] = (time.monotonic(), embedding, np.asarray(embedding, dtype=np.float64))
+        self._embeddings.move_to_end(key)
+        while len(self._embeddings) > self.max_entries:
+            self._embeddings.popitem(last=False)
+        self._matrix = None
+
+    def find_similar_query(self, embedding: list[float], exclude: str) -> str | None:
+        """Return the cached query most similar to an embedding, if above the threshold."""
+        if self._matrix is None:
+            self._matrix_keys = list(self._embeddings)
+            if not self._matrix_keys:
+                return None
+            self._matrix = np.stack([self._embeddings[key][2] for key in self._matrix_keys])
+
+        vector = np.asarray(embedding, dtype=np.float64)
+        if self._matrix.shape[1] != vector.shape[0]:
+            return None
+
+        similarities = self._matrix @ vector
+        for index in np.argsort(-similarities):
+            if similarities[index] < self.similarity_threshold:
+                break
+            if self._matrix_keys[index] != exclude:
+                return self._matrix_keys[index]
+        return None
+
+    def get_results(self, key: str, config_key: str, version: Any) -> list[dict[str, Any]] | None:
+        """Return cached results for a query and config if the data is unchanged."""
+        entry = self._results.get((key, config_key))
+        if entry is None:
+            return None
+        cached_at, cached_version, results = entry
+        if cached_version != version or time.monotonic() - cached_at > self.ttl_seconds:
+            del self._results[(key, config_key)]
+            return None
+        self._results.move_to_end((key, config_key))
+        # Results hold nested note dicts, so callers get a copy they can modify
+        return copy.deepcopy(results)
+
+    def put_results(self, key: str, config_key: str, version: Any, results: list[dict[str, Any]]) -> None:
+        """Cache the final results of a query for a given config and data version."""
+        self._results[(key, config_key)] = (time.monotonic(), version, copy.deepcopy(results))
+        self._results.move_to_end((key, config_key))
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached embeddings and results."""
+        self._embeddings.clear()
+        self._results.clear()
+        self._matrix = None
+
+
 class SemanticSearch:
     """Core semantic search service implementing advanced search algorithms."""
 
@@ -41,6 +206,8 @@ class SemanticSearch:
             "ef_search": 40,
             "min_similarity": 0.3,  # Minimum similarity threshold
             "max_results": 100,     # Maximum results to consider before filtering
+            "quantization": "fp32", # Vector precision for candidates: fp32, fp16 or binary
+            "max_concurrent_queries": 4,  # Batch queries in flight per stage (within the DB pool size)
 
             # Advanced ranking parameters
             "semantic_weight": 0.7,     # Weight for semantic similarity
@@ -57,6 +224,19 @@ class SemanticSearch:
             }
         }
 
+        # Query embedding and result cache shared by all searches on this service
+        self.query_cache = QueryEmbeddingCache()
+
+        # Integer code per note type; unknown types map to the trailing slot
+        self._note_type_codes = {note_type.value: code for code, note_type in enumerate(NoteType)}
+        self._unknown_note_type_code = len(self._note_type_codes)
+        self._note_type_weight_source: dict[str, float] | None = None
+        self._note_type_weight_table = self._build_note_type_weight_table(self.default_config["note_type_weights"])
+
+        # Default config merged with each distinct override, keyed by config key
+        self._merged_configs: dict[str, dict[str, Any]] = {}
+        self._max_merged_configs = 128
+
     async def semantic_search(self, query: str, config: dict[str, Any] = None) -> list[dict[str, Any]]:
         """Perform semantic search based on query meaning with advanced ranking."""
 
@@ -64,110 +244,277 @@ class SemanticSearch:
             logger.warning("Empty query provided for semantic search")
             return []
 
+        job = _SearchJob(index=0, query=query, config=config)
         try:
-            search_config = {**self.default_config, **(config or {})}
-
-            # Step 1: Generate embedding for query
-            query_embedding = await self.embedding_generator.generate_embedding(query)
-            if not query_embedding:
-                logger.error("Failed to generate query embedding")
-                return []
-
-            # Step 2: Perform vector similarity search
-            vector_results = await self.vector_store.similarity_search(
-                query_vector=query_embedding,
-                limit=search_config["max_results"],
-                distance_metric=search_config["distance_metric"]
-            )
-
-            # Step 3: Advanced filtering and ranking with multiple factors
-            filtered_results = await self._advanced_filter_and_rank(
-                vector_results,
-                search_config
-            )
-
-            # Step 4: Enrich results with note metadata
-            enriched_results = await self._enrich_results_with_metadata(filtered_results)
-
-            logger.info(f"Advanced semantic search completed: {len(enriched_results)} results for query: '{query}'")
-            return enriched_results
+            # Run the stages back to back; batch search overlaps them across queries
+            if await self._stage_embed(job) and await self._stage_vector_search(job):
+                # Ranking is the only stage that reads notes from the database
+                async with self._db_session_scope() as session:
+                    job.session = session
+                    ranked = await self._stage_rank(job)
+                if ranked:
+                    await self._stage_enrich(job)
+            return job.results
 
         except Exception as e:
             logger.error(f"Semantic search failed for query '{query}': {e}")
             return []
 
-    async def _advanced_filter_and_rank(self, vector_results: list[tuple[Embedding, float]],
-                                      config: dict[str, Any]) -> list[tuple[Embedding, float, dict[str, float]]]:
-        """Advanced filtering and ranking with multiple scoring factors."""
-
-        scored_results = []
-
-        for embedding, distance in vector_results:
-            base_similarity = 1.0 - distance  # Convert distance to similarity
+    async def _stage_embed(self, job: "_SearchJob") -> bool:
+        """Pipeline stage 1: resolve cached results or the query embedding.
 
-            if base_similarity >= config["min_similarity"]:
-                # Get note metadata for advanced scoring
-                note = await self.database_service.get_note(embedding.note_id)
-                if not note:
-                    continue
-
-                # Calculate advanced score with multiple factors
-                advanced_score, score_breakdown = await self._calculate_advanced_score(
-                    note, base_similarity, config
-                )
+        Returns False when the job is already complete (cache hit or failure).
+        """
+        job.config_key = self.query_cache.config_key(job.config)
+        job.search_config = self._merged_config(job.config, job.config_key)
 
-                scored_results.append((embedding, advanced_score, score_breakdown))
+        # Serve repeated queries from the cache while the note data is unchanged
+        job.cache_key = self.query_cache.normalize_query(job.query)
+        job.data_version = self._data_version()
+        cached_results = (
+            self.query_cache.get_results(job.cache_key, job.config_key, job.data_version)
+            if job.data_version is not None else None
+        )
+        if cached_results is not None:
+            logger.debug("Semantic search cache hit for query: '%s'", job.query)
+            job.results = cached_results
+            return False
+
+        # Step 1: Generate embedding for query (reusing a cached one if possible)
+        job.embedding = self.query_cache.get_embedding(job.cache_key)
+        if job.embedding is None:
+            job.embedding = (
+                job.precomputed_embedding if job.precomputed_embedding is not None
+                else await self.embedding_generator.generate_embedding(job.query)
+            )
+            if not job.embedding:
+                logger.error("Failed to generate query embedding")
+                return False
+            # Unit norm lets cosine similarity be computed as a dot product
+            job.embedding = normalize_embedding(job.embedding)
+            self.query_cache.put_embedding(job.cache_key, job.embedding)
+
+            # A near-identical cached query can share its results
+            similar_key = (
+                self.query_cache.find_similar_query(job.embedding, exclude=job.cache_key)
+                if job.data_version is not None else None
+            )
+            if similar_key is not None:
+                cached_results = self.query_cache.get_results(similar_key, job.config_key, job.data_version)
+                if cached_results is not None:
+                    logger.debug("Semantic search cache hit for query '%s' via '%s'", job.query, similar_key)
+                    job.results = cached_results
+                    return False
+
+        return True
+
+    async def _stage_vector_search(self, job: "_SearchJob") -> bool:
+        """Pipeline stage 2: perform vector similarity search."""
+        # The store can rank candidates by type-weighted similarity in SQL,
+        # so the candidate pool already favours heavily weighted note types
+        job.vector_results = await self.vector_store.similarity_search(
+            query_vector=job.embedding,
+            limit=job.search_config["max_results"],
+            distance_metric=job.search_config["distance_metric"],
+            note_type_weights=job.search_config["note_type_weights"],
+            quantization=job.search_config["quantization"],
+            rerank_k=job.search_config["max_results"] * 4
+        )
+        return True
 
-        # Sort by advanced score (descending)
-        scored_results.sort(key=lambda x: x[1], reverse=True)
+    async def _stage_rank(self, job: "_SearchJob") -> bool:
+        """Pipeline stage 3: advanced filtering and ranking with multiple factors."""
+        job.ranked_results = await self._advanced_filter_and_rank(
+            job.vector_results, job.search_config, session=job.session
+        )
+        return True
+
+    async def _stage_enrich(self, job: "_SearchJob") -> bool:
+        """Pipeline stage 4: enrich results with note metadata and cache them."""
+        job.results = await self._enrich_results_with_metadata(job.ranked_results)
+
+        if job.data_version is not None:
+            self.query_cache.put_results(job.cache_key, job.config_key, job.data_version, job.results)
+
+        logger.info("Advanced semantic search completed: %d results for query: '%s'", len(job.results), job.query)
+        return False
+
+    def _merged_config(self, config: dict[str, Any] | None, config_key: str) -> dict[str, Any]:
+        """Return the default config overlaid with an override, built once per distinct override.
+
+        The merged dict is shared between searches and must not be modified;
+        after changing default_config, clear _merged_configs. Reusing it also
+        keeps its note_type_weights identity stable, so the weight lookup
+        table is not rebuilt per search.
+        """
+        merged = self._merged_configs.get(config_key)
+        if merged is None:
+            if len(self._merged_configs) >= self._max_merged_configs:
+                self._merged_configs.clear()
+            merged = {**self.default_config, **(config or {})}
+            self._merged_configs[config_key] = merged
+        return merged
+
+    def _data_version(self) -> Any:
+        """Current note data version; cached results are discarded when it changes.
+
+        Returns None when the database service does not track versions, in
+        which case only query embeddings are cached.
+        """
+        return getattr(self.database_service, "data_version", None)
+
+    def _db_session_scope(self):
+        """Shared session scope of the database service, or a no-op yielding None."""
+        session_scope = getattr(self.database_service, "session_scope", None)
+        return session_scope() if session_scope is not None else nullcontext()
+
+    async def _get_notes(self, note_ids: list, session: Any = None) -> dict[Any, Note]:
+        """Fetch notes by ID in one call, on the shared session when there is one."""
+        if session is None:
+            return await self.database_service.get_notes(note_ids)
+        return await self.database_service.get_notes(note_ids, session=session)
 
-        # Apply limit
-        return scored_results[:config["limit"]]
+    async def _advanced_filter_and_rank(self, vector_results: list[tuple[Embedding, float]],
+                                      config: dict[str, Any],
+                                      session: Any = None) -> list[tuple[Embedding, Note, float, dict[str, float]]]:
+        """Advanced filtering and ranking with multiple scoring factors."""
 
-    async def _calculate_advanced_score(self, note: Note, base_similarity: float,
-                                      config: dict[str, Any]) -> tuple[float, dict[str, float]]:
-        """Calculate advanced score with multiple ranking factors."""
+        # Apply the similarity threshold before touching the database
+        candidates = [
+            (embedding, 1.0 - distance)  # Convert distance to similarity
+            for embedding, distance in vector_results
+            if 1.0 - distance >= config["min_similarity"]
+        ]
 
-        score_breakdown = {"base_similarity": base_similarity}
+        # Fetch note metadata for all candidates in one round trip
+        notes = await self._get_notes([embedding.note_id for embedding, _ in candidates], session)
 
-        # Factor 1: Note type weighting
-        note_type_weight = config["note_type_weights"].get(note.note_type.value, 1.0)
-        note_type_score = base_similarity * note_type_weight
-        score_breakdown["note_type_score"] = note_type_score
+        # Keep only candidates whose note still exists, preserving vector order
+        ranked = [
+            (embedding, notes[embedding.note_id], base_similarity)
+            for embedding, base_similarity in candidates
+            if notes.get(embedding.note_id)
+        ]
+        if not ranked:
+            return []
 
-        # Factor 2: Content length normalization
-        content_length = len(note.content)
-        content_length_score = self._calculate_content_length_score(content_length, config)
-        score_breakdown["content_length_score"] = content_length_score
+        embeddings, ranked_notes, similarities = zip(*ranked, strict=True)
+        similarities = np.fromiter(similarities, dtype=np.float64, count=len(ranked))
 
-        # Factor 3: Recency factor
-        recency_score = self._calculate_recency_score(note.created_at, config)
-        score_breakdown["recency_score"] = recency_score
+        # Score every candidate column-wise in one pass
+        scores, columns = self._score_batch(ranked_notes, similarities, config)
 
-        # Factor 4: Quality indicators
-        quality_score = self._calculate_quality_score(note, config)
-        score_breakdown["quality_score"] = quality_score
+        # Select the top results by advanced score (descending, stable for ties)
+        top = _top_k_indices(scores, config["limit"])
 
-        # Factor 5: Metadata relevance (placeholder - would need actual metadata analysis)
-        metadata_score = 0.5  # Placeholder
-        score_breakdown["metadata_score"] = metadata_score
+        # Carry each note along so enrichment needs no further lookups
+        return [
+            (embeddings[i], ranked_notes[i], float(scores[i]), self._score_breakdown(i, columns, config))
+            for i in top
+        ]
 
-        # Combine all factors with configurable weights
-        advanced_score = (
-            config["semantic_weight"] * base_similarity +
-            config["metadata_weight"] * metadata_score +
-            config["quality_weight"] * quality_score +
-            0.05 * content_length_score +  # Smaller weight for content length
-            0.05 * recency_score           # Smaller weight for recency
+    def _score_batch(self, notes: list[Note], similarities: np.ndarray,
+                     config: dict[str, Any]) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Calculate advanced scores for a batch of notes with multiple ranking factors.
+
+        Scoring inputs are gathered into one array per column (structure of
+        arrays) and combined by the fused Numba kernel when available, or by
+        vectorized NumPy otherwise. Returns the final scores and the columns.
+        """
+        count = len(notes)
+
+        # Factor 1: Note type weighting, gathered from the weight table by type code
+        note_type_codes = self._note_type_codes
+        unknown_code = self._unknown_note_type_code
+        type_codes = np.fromiter(
+            (note_type_codes.get(note.note_type.value, unknown_code) for note in notes),
+            dtype=np.intp, count=count
         )
 
-        # Apply note type weighting as multiplier
-        advanced_score *= note_type_weight
-
-        # Ensure score stays within valid range
-        advanced_score = min(max(advanced_score, 0.0), 1.0)
+        columns = {
+            "similarity": similarities,
+            "note_type_weight": self._build_note_type_weight_table(config["note_type_weights"])[type_codes],
+            # Factor 2: Content length normalization
+            "content_length": np.fromiter((len(note.content) for note in notes), dtype=np.float64, count=count),
+            # Factor 3: Recency factor (NaN when the creation date is unknown)
+            "days_ago": self._batch_days_ago([note.created_at for note in notes]),
+            # Factor 4: Quality indicators (AI-generated content with/without justification)
+            "is_ai_generated": np.fromiter((bool(note.is_ai_generated) for note in notes), dtype=bool, count=count),
+            "has_justification": np.fromiter((bool(note.ai_justification) for note in notes), dtype=bool, count=count),
+        }
 
-        return advanced_score, score_breakdown
+        if _score_kernel is not None:
+            scores = _score_kernel(
+                columns["similarity"], columns["content_length"], columns["days_ago"],
+                columns["note_type_weight"], columns["is_ai_generated"], columns["has_justification"],
+                float(config["semantic_weight"]), float(config["metadata_weight"]),
+                float(config["quality_weight"]), float(config["content_length_boost"]),
+                float(config["recency_decay_days"])
+            )
+        else:
+            scores = self._score_columns(columns, config)
+
+        return scores, columns
+
+    def _score_columns(self, columns: dict[str, np.ndarray], config: dict[str, Any]) -> np.ndarray:
+        """Combine scoring columns into advanced scores with vectorized NumPy."""
+
+        # Boost for longer, informative content, capped at 2x the optimal length
+        length_ratios = np.minimum(columns["content_length"] / 500.0, 2.0)
+        content_length_scores = np.log1p(length_ratios) * config["content_length_boost"]
+
+        # Exponential decay: newer notes get higher scores, unknown dates are neutral
+        days_ago = columns["days_ago"]
+        recency_scores = np.exp(-days_ago / config["recency_decay_days"])
+        recency_scores[np.isnan(days_ago)] = 0.5
+
+        # Branchless: +0.1 with a justification, -0.1 without, 0 if not AI-generated
+        quality_scores = 0.5 + columns["is_ai_generated"] * (columns["has_justification"] * 0.2 - 0.1)
+
+        # Metadata relevance is a 0.5 placeholder (would need actual metadata analysis)
+        scores = (
+            config["semantic_weight"] * columns["similarity"] +
+            config["metadata_weight"] * 0.5 +
+            config["quality_weight"] * quality_scores +
+            0.05 * content_length_scores +  # Smaller weight for content length
+            0.05 * recency_scores           # Smaller weight for recency
+        ) * columns["note_type_weight"]
+        np.clip(scores, 0.0, 1.0, out=scores)
+        return scores
+
+    def _build_note_type_weight_table(self, weights: dict[str, float]) -> np.ndarray:
+        """Return the weight array indexed by note type code for a weights dict.
+
+        The table is rebuilt only when a different weights dict is passed in.
+        """
+        if weights is not self._note_type_weight_source:
+            table = np.ones(self._unknown_note_type_code + 1, dtype=np.float64)
+            for value, code in self._note_type_codes.items():
+                table[code] = weights.get(value, 1.0)
+            self._note_type_weight_source = weights
+            self._note_type_weight_table = table
+        return self._note_type_weight_table
+
+    def _score_breakdown(self, index: int, columns: dict[str, np.ndarray],
+                         config: dict[str, Any]) -> dict[str, float]:
+        """Build the score breakdown for one candidate of a scored batch."""
+        base_similarity = float(columns["similarity"][index])
+        days_ago = float(columns["days_ago"][index])
+
+        quality_score = 0.5
+        if columns["is_ai_generated"][index]:
+            quality_score += 0.1 if columns["has_justification"][index] else -0.1
+
+        return {
+            "base_similarity": base_similarity,
+            "note_type_score": base_similarity * float(columns["note_type_weight"][index]),
+            "content_length_score": self._calculate_content_length_score(
+                int(columns["content_length"][index]), config
+            ),
+            "recency_score": 0.5 if math.isnan(days_ago) else math.exp(-days_ago / config["recency_decay_days"]),
+            "quality_score": quality_score,
+            "metadata_score": 0.5,
+        }
 
     def _calculate_content_length_score(self, content_length: int, config: dict[str, Any]) -> float:
         """Calculate score based on content length."""
@@ -176,12 +523,16 @@ class SemanticSearch:
         length_ratio = min(content_length / optimal_length, 2.0)  # Cap at 2x optimal
         return math.log(1 + length_ratio) * config["content_length_boost"]
 
-    def _calculate_recency_score(self, created_at: str, config: dict[str, Any]) -> float:
+    def _calculate_recency_score(self, created_at: datetime | str, config: dict[str, Any]) -> float:
         """Calculate recency score with exponential decay."""
         try:
-            # Parse creation date
-            created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            days_ago = (datetime.now().astimezone() - created_date).days
+            if isinstance(created_at, datetime):
+                # Stored timestamps need no parsing; naive values are UTC
+                days_ago = math.floor((time.time() - self._epoch_seconds(created_at)) / 86400.0)
+            else:
+                # Parse creation date
+                created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                days_ago = (datetime.now().astimezone() - created_date).days
 
             # Exponential decay: newer notes get higher scores
             decay_factor = math.exp(-days_ago / config["recency_decay_days"])
@@ -191,6 +542,65 @@ class SemanticSearch:
             # If date parsing fails, return neutral score
             return 0.5
 
+    def _batch_days_ago(self, created_ats: list[datetime | str]) -> np.ndarray:
+        """Calculate whole days since creation for a batch of creation dates.
+
+        Datetimes loaded from the database are reduced to epoch seconds and
+        subtracted from the current time in one step. Anything else is
+        normalized to naive UTC and parsed into a single datetime64 array, so
+        there is no per-note ISO parsing or clock lookup. Dates that cannot be
+        parsed yield NaN.
+        """
+        if all(isinstance(created_at, datetime) for created_at in created_ats):
+            epochs = np.fromiter((self._epoch_seconds(created_at) for created_at in created_ats),
+                                 dtype=np.float64, count=len(created_ats))
+            return np.floor((time.time() - epochs) / 86400.0)
+
+        values = [self._naive_utc(created_at) for created_at in created_ats]
+        try:
+            timestamps = np.array(values, dtype="datetime64[us]")
+        except ValueError:
+            # At least one malformed string; parse individually so only it becomes NaT
+            timestamps = np.array([self._to_datetime64(value) for value in values], dtype="datetime64[us]")
+
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+        # NaT propagates to NaN through the division
+        return np.floor((now - timestamps) / np.timedelta64(1, "D"))
+
+    @staticmethod
+    def _epoch_seconds(created_at: datetime) -> float:
+        """Seconds since the epoch for a creation datetime, treating naive values as UTC."""
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.timestamp()
+
+    @staticmethod
+    def _naive_utc(created_at: datetime | str | None) -> datetime | str | None:
+        """Normalize a creation date to a naive UTC value NumPy can parse."""
+        if isinstance(created_at, datetime):
+            if created_at.tzinfo is not None:
+                return created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            return created_at
+        if isinstance(created_at, str):
+            if created_at.endswith("Z"):
+                return created_at[:-1]
+            if len(created_at) > 19 and created_at[-6] in "+-" and created_at[-3] == ":":
+                # Explicit UTC offset: NumPy has no timezone support, convert here
+                try:
+                    return SemanticSearch._naive_utc(datetime.fromisoformat(created_at))
+                except ValueError:
+                    return None
+            return created_at
+        return None
+
+    @staticmethod
+    def _to_datetime64(value: datetime | str | None) -> np.datetime64:
+        """Parse a single normalized date, returning NaT if it is malformed."""
+        try:
+            return np.datetime64(value, "us")
+        except ValueError:
+            return np.datetime64("NaT", "us")
+
     def _calculate_quality_score(self, note: Note, config: dict[str, Any]) -> float:
         """Calculate quality score based on note characteristics."""
         quality_score = 0.5  # Base quality score
@@ -217,14 +627,19 @@ class SemanticSearch:
             return []
 
         try:
-            search_config = {**self.default_config, **(config or {})}
+            search_config = self._merged_config(config, self.query_cache.config_key(config))
             filters = filters or {}
 
-            # Step 1: Generate embedding for query
-            query_embedding = await self.embedding_generator.generate_embedding(query)
-            if not query_embedding:
-                logger.error("Failed to generate query embedding")
-                return []
+            # Step 1: Generate embedding for query (reusing a cached one if possible)
+            cache_key = self.query_cache.normalize_query(query)
+            query_embedding = self.query_cache.get_embedding(cache_key)
+            if query_embedding is None:
+                query_embedding = await self.embedding_generator.generate_embedding(query)
+                if not query_embedding:
+                    logger.error("Failed to generate query embedding")
+                    return []
+                query_embedding = normalize_embedding(query_embedding)
+                self.query_cache.put_embedding(cache_key, query_embedding)
 
             # Step 2: Perform hybrid search with metadata filtering
             hybrid_results = await self.vector_store.hybrid_search(
@@ -235,7 +650,10 @@ class SemanticSearch:
             )
 
             # Step 3: Calculate advanced hybrid scores
-            scored_results = await self._calculate_advanced_hybrid_scores(hybrid_results, filters, search_config)
+            async with self._db_session_scope() as session:
+                scored_results = await self._calculate_advanced_hybrid_scores(
+                    hybrid_results, filters, search_config, session=session
+                )
 
             # Step 4: Filter and limit results
             filtered_results = self._filter_hybrid_results(
@@ -247,7 +665,7 @@ class SemanticSearch:
             # Step 5: Enrich results with metadata
             enriched_results = await self._enrich_results_with_metadata(filtered_results)
 
-            logger.info(f"Hybrid search completed: {len(enriched_results)} results with filters: {filters}")
+            logger.info("Hybrid search completed: %d results with filters: %s", len(enriched_results), filters)
             return enriched_results
 
         except Exception as e:
@@ -255,48 +673,61 @@ class SemanticSearch:
             return []
 
     async def _calculate_advanced_hybrid_scores(self, hybrid_results: list[tuple[Embedding, float]],
-                                              filters: dict[str, Any], config: dict[str, Any]) -> list[tuple[Embedding, float, float, float, dict[str, float]]]:
+                                              filters: dict[str, Any], config: dict[str, Any],
+                                              session: Any = None) -> list[tuple[Embedding, Note, float, float, float, dict[str, float]]]:
         """Calculate advanced hybrid scores with multiple factors."""
 
+        # Apply the similarity threshold before touching the database
+        candidates = [
+            (embedding, 1.0 - semantic_distance)
+            for embedding, semantic_distance in hybrid_results
+            if 1.0 - semantic_distance >= config["min_similarity"]
+        ]
+
+        # Fetch notes for all candidates in one round trip
+        notes = await self._get_notes([embedding.note_id for embedding, _ in candidates], session)
+
         scored_results = []
 
-        for embedding, semantic_distance in hybrid_results:
-            semantic_similarity = 1.0 - semantic_distance
-
-            if semantic_similarity >= config["min_similarity"]:
-                # Get note for advanced scoring
-                note = await self.database_service.get_note(embedding.note_id)
-                if not note:
-                    continue
-
-                # Calculate metadata relevance
-                metadata_score = await self._calculate_metadata_relevance(note, filters)
-
-                # Calculate advanced factors
-                content_length_score = self._calculate_content_length_score(len(note.content), config)
-                recency_score = self._calculate_recency_score(note.created_at, config)
-                quality_score = self._calculate_quality_score(note, config)
-                note_type_weight = config["note_type_weights"].get(note.note_type.value, 1.0)
-
-                # Combine scores with advanced weighting
-                hybrid_score = (
-                    config["semantic_weight"] * semantic_similarity +
-                    config["metadata_weight"] * metadata_score +
-                    config["quality_weight"] * quality_score +
-                    0.03 * content_length_score +
-                    0.02 * recency_score
-                ) * note_type_weight
-
-                score_breakdown = {
-                    "semantic_similarity": semantic_similarity,
-                    "metadata_score": metadata_score,
-                    "quality_score": quality_score,
-                    "content_length_score": content_length_score,
-                    "recency_score": recency_score,
-                    "note_type_weight": note_type_weight
-                }
+        # Hoist the weights used for every candidate out of the loop
+        semantic_weight = config["semantic_weight"]
+        metadata_weight = config["metadata_weight"]
+        quality_weight = config["quality_weight"]
+        note_type_weights = config["note_type_weights"]
+
+        for embedding, semantic_similarity in candidates:
+            note = notes.get(embedding.note_id)
+            if not note:
+                continue
+
+            # Calculate metadata relevance
+            metadata_score = await self._calculate_metadata_relevance(note, filters)
+
+            # Calculate advanced factors
+            content_length_score = self._calculate_content_length_score(len(note.content), config)
+            recency_score = self._calculate_recency_score(note.created_at, config)
+            quality_score = self._calculate_quality_score(note, config)
+            note_type_weight = note_type_weights.get(note.note_type.value, 1.0)
+
+            # Combine scores with advanced weighting
+            hybrid_score = (
+                semantic_weight * semantic_similarity +
+                metadata_weight * metadata_score +
+                quality_weight * quality_score +
+                0.03 * content_length_score +
+                0.02 * recency_score
+            ) * note_type_weight
+
+            score_breakdown = {
+                "semantic_similarity": semantic_similarity,
+                "metadata_score": metadata_score,
+                "quality_score": quality_score,
+                "content_length_score": content_length_score,
+                "recency_score": recency_score,
+                "note_type_weight": note_type_weight
+            }
 
-                scored_results.append((embedding, semantic_similarity, metadata_score, hybrid_score, score_breakdown))
+            scored_results.append((embedding, note, semantic_similarity, metadata_score, hybrid_score, score_breakdown))
 
         return scored_results
 
@@ -324,28 +755,29 @@ class SemanticSearch:
         else:
             return 0.0  # No filter matches
 
-    def _filter_hybrid_results(self, scored_results: list[tuple[Embedding, float, float, float, dict[str, float]]],
-                              min_similarity: float, limit: int) -> list[tuple[Embedding, float, float, float, dict[str, float]]]:
+    def _filter_hybrid_results(self, scored_results: list[tuple[Embedding, Note, float, float, float, dict[str, float]]],
+                              min_similarity: float, limit: int) -> list[tuple[Embedding, Note, float, float, float, dict[str, float]]]:
         """Filter hybrid search results based on similarity thresholds."""
         filtered_results = [
             result for result in scored_results
-            if result[1] >= min_similarity  # Semantic similarity threshold
+            if result[2] >= min_similarity  # Semantic similarity threshold
         ]
 
-        # Sort by hybrid score (descending)
-        filtered_results.sort(key=lambda x: x[3], reverse=True)
-
-        # Apply limit
-        return filtered_results[:limit]
+        # Select the top results by hybrid score (descending) without a full sort
+        hybrid_scores = np.fromiter((result[4] for result in filtered_results),
+                                    dtype=np.float64, count=len(filtered_results))
+        return [filtered_results[i] for i in _top_k_indices(hybrid_scores, limit)]
 
     async def _enrich_results_with_metadata(self, results: list) -> list[dict[str, Any]]:
-        """Enrich search results with note metadata and scoring details."""
+        """Enrich search results with note metadata and scoring details.
+
+        Results carry the notes fetched during ranking, so no lookups are needed.
+        """
         enriched_results = []
 
         for i, result in enumerate(results):
-            if len(result) == 3:  # Advanced semantic search results
-                embedding, advanced_score, score_breakdown = result
-                note_id = embedding.note_id
+            if len(result) == 4:  # Advanced semantic search results
+                _, note, advanced_score, score_breakdown = result
                 result_data = {
                     "similarity_score": score_breakdown.get("base_similarity", advanced_score),
                     "metadata_score": 0.0,  # Not applicable for pure semantic search
@@ -355,8 +787,7 @@ class SemanticSearch:
                     "rank": i + 1
                 }
             else:  # Hybrid search results
-                embedding, semantic_score, metadata_score, hybrid_score, score_breakdown = result
-                note_id = embedding.note_id
+                _, note, semantic_score, metadata_score, hybrid_score, score_breakdown = result
                 result_data = {
                     "similarity_score": semantic_score,
                     "metadata_score": metadata_score,
@@ -366,11 +797,8 @@ class SemanticSearch:
                     "rank": i + 1
                 }
 
-            # Get note metadata
-            note = await self.database_service.get_note(note_id)
-            if note:
-                result_data["note"] = note.dict()
-                enriched_results.append(result_data)
+            result_data["note"] = note.model_dump()
+            enriched_results.append(result_data)
 
         return enriched_results
 
@@ -381,18 +809,19 @@ class SemanticSearch:
             # Get similar notes using vector similarity
             similar_notes = await self.vector_store.get_similar_notes(note_id, limit)
 
-            # Enrich with note metadata
+            # Enrich with note metadata fetched in one round trip
+            notes = await self.database_service.get_notes([similar_note_id for similar_note_id, _ in similar_notes])
             enriched_results = []
             for similar_note_id, similarity_score in similar_notes:
-                note = await self.database_service.get_note(similar_note_id)
+                note = notes.get(similar_note_id)
                 if note:
                     enriched_results.append({
-                        "note": note.dict(),
+                        "note": note.model_dump(),
                         "similarity_score": similarity_score,
                         "rank": len(enriched_results) + 1
                     })
 
-            logger.info(f"Found {len(enriched_results)} similar notes for note {note_id}")
+            logger.info("Found %d similar notes for note %s", len(enriched_results), note_id)
             return enriched_results
 
         except Exception as e:
@@ -407,31 +836,151 @@ class SemanticSearch:
             return []
 
         try:
-            # Process queries in parallel
-            tasks = []
-            for query in valid_queries:
-                task = self.semantic_search(query, config)
-                tasks.append(task)
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filter out exceptions
-            valid_results = []
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Batch search task failed: {result}")
-                    valid_results.append([])
-                else:
-                    valid_results.append(result)
+            # Stream the queries through the pipelined search stages, with at
+            # most max_concurrent_queries in each stage so a large batch cannot
+            # swamp the embedding service or the connection pool
+            search_config = self._merged_config(config, self.query_cache.config_key(config))
+            pipeline = SemanticSearchPipeline(self, workers_per_stage=search_config["max_concurrent_queries"])
+            results = await pipeline.run(valid_queries, config)
 
             logger.info(f"Batch semantic search processed {len(valid_queries)} queries")
-            return valid_results
+            return results
 
         except Exception as e:
             logger.error(f"Batch semantic search failed: {e}")
             return [[] for _ in valid_queries]
 
 
+@dataclass
+class _SearchJob:
+    """State of one query as it moves through the semantic search stages."""
+    index: int
+    query: str
+    config: dict[str, Any] | None
+    # Embedding generated ahead of time as part of a batch, if any
+    precomputed_embedding: list[float] | None = None
+    search_config: dict[str, Any] = field(default_factory=dict)
+    cache_key: str = ""
+    config_key: str = ""
+    data_version: Any = None
+    embedding: list[float] | None = None
+    vector_results: list[tuple[Embedding, float]] = field(default_factory=list)
+    ranked_results: list[tuple[Embedding, Note, float, dict[str, float]]] = field(default_factory=list)
+    session: Any = None
+    results: list[dict[str, Any]] = field(default_factory=list)
+
+
+class SemanticSearchPipeline:
+    """Runs batch semantic search as four pipelined stages.
+
+    Embed, vector search, rank and enrich each have persistent workers
+    reading from a bounded queue, so embedding one query overlaps the vector
+    search of the previous one and the DB fetches of the one before that.
+    Throughput approaches the slowest stage rather than the sum of stages,
+    and workers_per_stage bounds how many queries each stage runs at once.
+    """
+
+    def __init__(self, search: SemanticSearch, queue_size: int = 4, workers_per_stage: int = 1):
+        self.search = search
+        self.queue_size = queue_size
+        self.workers_per_stage = workers_per_stage
+
+    async def run(self, queries: list[str], config: dict[str, Any] = None) -> list[list[dict[str, Any]]]:
+        """Search every query, returning result lists in query order."""
+        results: list[list[dict[str, Any]]] = [[] for _ in queries]
+        precomputed = await self._precompute_embeddings(queries)
+
+        # (stage, whether it reads from the database); ranking is the only one that does
+        stages = (
+            (self.search._stage_embed, False),
+            (self.search._stage_vector_search, False),
+            (self.search._stage_rank, True),
+            (self.search._stage_enrich, False),
+        )
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in stages]
+
+        workers = [
+            asyncio.create_task(self._worker(
+                stage, uses_db, queues[i], queues[i + 1] if i + 1 < len(queues) else None, results
+            ))
+            for i, (stage, uses_db) in enumerate(stages)
+            for _ in range(self.workers_per_stage)
+        ]
+
+        try:
+            for index, query in enumerate(queries):
+                await queues[0].put(_SearchJob(
+                    index=index, query=query, config=config,
+                    precomputed_embedding=precomputed.get(self.search.query_cache.normalize_query(query))
+                ))
+
+            # A job is forwarded before it is marked done, so joining the
+            # queues in stage order waits for every job to finish
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return results
+
+    async def _precompute_embeddings(self, queries: list[str]) -> dict[str, list[float]]:
+        """Embed every distinct uncached query in one batched generator call.
+
+        Returns embeddings keyed by normalized query. Queries missing from the
+        result (failures, or a generator without a batch API) are embedded
+        individually by the embed stage.
+        """
+        generate_batch = getattr(self.search.embedding_generator, "generate_embeddings_batch", None)
+        if generate_batch is None:
+            return {}
+
+        query_cache = self.search.query_cache
+        pending: dict[str, str] = {}
+        for query in queries:
+            key = query_cache.normalize_query(query)
+            if key not in pending and query_cache.get_embedding(key) is None:
+                pending[key] = query
+        if not pending:
+            return {}
+
+        try:
+            embeddings = await generate_batch(list(pending.values()))
+        except Exception as e:
+            logger.warning(f"Batch query embedding failed, embedding queries individually: {e}")
+            return {}
+
+        return {
+            key: embedding
+            for key, embedding in zip(pending, embeddings, strict=False)
+            if embedding
+        }
+
+    async def _worker(self, stage, uses_db: bool, inbox: asyncio.Queue, outbox: asyncio.Queue | None,
+                      results: list[list[dict[str, Any]]]) -> None:
+        """Apply one stage to each job, forwarding unfinished jobs downstream.
+
+        Workers of a stage that reads from the database hold their own
+        session for the whole batch, since a session must not be shared
+        between concurrently running stages; the other stages hold none.
+        """
+        async with self.search._db_session_scope() if uses_db else nullcontext() as session:
+            while True:
+                job = await inbox.get()
+                try:
+                    job.session = session
+                    if await stage(job) and outbox is not None:
+                        await outbox.put(job)
+                    else:
+                        results[job.index] = job.results
+                except Exception as e:
+                    logger.error(f"Batch search task failed for query '{job.query}': {e}")
+                    results[job.index] = []
+                finally:
+                    inbox.task_done()
+
+
 class MockSemanticSearch(SemanticSearch):
     """Mock semantic search service for testing."""
 
@@ -475,6 +1024,11 @@ class MockSemanticSearch(SemanticSearch):
             }
         ]
 
+    async def batch_semantic_search(self, queries: list[str],
+                                   config: dict[str, Any] = None) -> list[list[dict[str, Any]]]:
+        """Mock batch search returning mock results for each query."""
+        return [await self.semantic_search(q, config) for q in queries if q and q.strip()]
+
 
 # Factory function to create appropriate semantic search service
 def create_semantic_search(embedding_generator: EmbeddingGenerator,
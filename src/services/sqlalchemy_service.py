@@ -1,21 +1,30 @@
 """SQLAlchemy-based service implementations for BrainForge."""
 
 import logging
-from typing import Any, Generic, TypeVar
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from enum import Enum
+from types import UnionType
+from typing import Any, Generic, TypeVar, Union, get_args, get_origin
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, DateTime, any_, bindparam, event, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from ..models.note import Note, NoteCreate, NoteUpdate
+from ..models.orm.note import note_content_hash
 from .base import BaseService
 
 T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
+# Note columns whose attribute name differs from the Pydantic field name
+NOTE_FIELD_ALIASES = {"note_metadata": "metadata"}
+
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
@@ -33,63 +42,133 @@ class NoteModel(Base):
     note_metadata: Mapped[dict] = mapped_column(JSONB, default=dict)
     provenance: Mapped[dict] = mapped_column(JSONB, default=dict)
     version: Mapped[int] = mapped_column(default=1)
-    created_at: Mapped[str] = mapped_column(nullable=False)
-    updated_at: Mapped[str] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_by: Mapped[str] = mapped_column(nullable=False)
     is_ai_generated: Mapped[bool] = mapped_column(default=False)
     ai_justification: Mapped[str] = mapped_column(nullable=True)
+    content_hash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+
+@event.listens_for(NoteModel.content, "set")
+def _update_content_hash(target: NoteModel, value: str, oldvalue, initiator) -> None:
+    """Keep content_hash current on writes through this model, as the Note ORM model does."""
+    target.content_hash = note_content_hash(value) if value is not None else None
 
 
 class SQLAlchemyService(BaseService, Generic[T]):
     """Base service implementation using SQLAlchemy."""
 
-    def __init__(self, database_url: str, model_class: type[Any], pydantic_model: type[Any]):
+    def __init__(self, database_url: str, model_class: type[Any], pydantic_model: type[Any],
+                 field_aliases: dict[str, str] | None = None):
         self.database_url = database_url
         self.model_class = model_class
         self._pydantic_model = pydantic_model
+        self._field_aliases = field_aliases or {}
+        # Column-to-field pairs, built on first conversion
+        self._field_map: tuple[tuple[str, str], ...] | None = None
+        # Batched lookup statement, built on first use
+        self._get_many_stmt = None
+        self._enum_fields: dict[str, type[Enum]] = {}
         self.engine = create_async_engine(database_url)
         self.async_session = async_sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
+        # Bumped on every write so read-side caches can detect stale data
+        self.data_version = 0
 
-    async def create(self, data: Any) -> Any:
-        """Create a new entity in the database."""
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Open one session to reuse across several service calls.
+
+        Pass the yielded session as ``session=`` so the calls share a single
+        connection checkout and transaction. The transaction is committed on
+        exit and rolled back if the block raises.
+        """
         async with self.async_session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    @asynccontextmanager
+    async def _use_session(self, session: AsyncSession | None) -> AsyncIterator[AsyncSession]:
+        """Yield the caller's session, or a new one closed on exit."""
+        if session is not None:
+            yield session
+        else:
+            async with self.async_session() as own_session:
+                yield own_session
+
+    async def _commit_write(self, session: AsyncSession, shared: bool) -> None:
+        """Commit a write, or only flush it when the caller owns the transaction."""
+        if shared:
+            await session.flush()
+        else:
+            await session.commit()
+        self.data_version += 1
+
+    async def create(self, data: Any, *, session: AsyncSession | None = None) -> Any:
+        """Create a new entity in the database."""
+        async with self._use_session(session) as active:
             # Convert Pydantic model to SQLAlchemy model
             db_model = self.model_class(**data.model_dump())
-            session.add(db_model)
-            await session.commit()
-            await session.refresh(db_model)
+            active.add(db_model)
+            await self._commit_write(active, shared=session is not None)
+            await active.refresh(db_model)
 
             # Convert back to Pydantic model
             return self._to_pydantic(db_model)
 
-    async def get(self, id: UUID) -> Any | None:
+    async def get(self, id: UUID, *, session: AsyncSession | None = None) -> Any | None:
         """Get an entity by ID from the database."""
-        async with self.async_session() as session:
+        async with self._use_session(session) as active:
             stmt = select(self.model_class).where(self.model_class.id == id)
-            result = await session.execute(stmt)
+            result = await active.execute(stmt)
             db_model = result.scalar_one_or_none()
 
             if db_model:
                 return self._to_pydantic(db_model)
             return None
 
-    async def list(self, skip: int = 0, limit: int = 100) -> list[Any]:
+    async def get_many(self, ids: list[UUID], *, session: AsyncSession | None = None) -> dict[UUID, Any]:
+        """Get several entities by ID in one query, keyed by ID.
+
+        IDs with no matching row are simply absent from the result.
+        """
+        if not ids:
+            return {}
+
+        if self._get_many_stmt is None:
+            # One array parameter rather than an IN list, so the SQL text is
+            # the same for every batch size and its prepared plan is reused
+            id_column = self.model_class.id
+            self._get_many_stmt = select(self.model_class).where(
+                id_column == any_(bindparam("ids", type_=ARRAY(id_column.type)))
+            )
+
+        async with self._use_session(session) as active:
+            result = await active.execute(self._get_many_stmt, {"ids": list(ids)})
+
+            return {db_model.id: self._to_pydantic(db_model) for db_model in result.scalars().all()}
+
+    async def list(self, skip: int = 0, limit: int = 100, *, session: AsyncSession | None = None) -> list[Any]:
         """List entities from the database with pagination."""
-        async with self.async_session() as session:
+        async with self._use_session(session) as active:
             stmt = select(self.model_class).offset(skip).limit(limit)
-            result = await session.execute(stmt)
+            result = await active.execute(stmt)
             db_models = result.scalars().all()
 
             return [self._to_pydantic(model) for model in db_models]
 
-    async def update(self, id: UUID, data: Any) -> Any | None:
+    async def update(self, id: UUID, data: Any, *, session: AsyncSession | None = None) -> Any | None:
         """Update an entity in the database."""
-        async with self.async_session() as session:
+        async with self._use_session(session) as active:
             # First check if entity exists
             stmt = select(self.model_class).where(self.model_class.id == id)
-            result = await session.execute(stmt)
+            result = await active.execute(stmt)
             db_model = result.scalar_one_or_none()
 
             if not db_model:
@@ -100,38 +179,70 @@ class SQLAlchemyService(BaseService, Generic[T]):
             for field, value in update_data.items():
                 setattr(db_model, field, value)
 
-            await session.commit()
-            await session.refresh(db_model)
+            await self._commit_write(active, shared=session is not None)
+            await active.refresh(db_model)
 
             return self._to_pydantic(db_model)
 
-    async def delete(self, id: UUID) -> bool:
+    async def delete(self, id: UUID, *, session: AsyncSession | None = None) -> bool:
         """Delete an entity from the database."""
-        async with self.async_session() as session:
+        async with self._use_session(session) as active:
             stmt = select(self.model_class).where(self.model_class.id == id)
-            result = await session.execute(stmt)
+            result = await active.execute(stmt)
             db_model = result.scalar_one_or_none()
 
             if not db_model:
                 return False
 
-            await session.delete(db_model)
-            await session.commit()
+            await active.delete(db_model)
+            await self._commit_write(active, shared=session is not None)
             return True
 
+    def _build_field_map(self) -> tuple[tuple[tuple[str, str], ...], dict[str, type[Enum]]]:
+        """Pair mapped column attributes with Pydantic fields.
+
+        Also collects enum-typed fields, which need coercing from the raw
+        column value because model construction skips validation.
+        """
+        model_fields = self._pydantic_model.model_fields
+        field_map = []
+        for attribute in inspect(self.model_class).column_attrs:
+            field_name = self._field_aliases.get(attribute.key, attribute.key)
+            if field_name in model_fields:
+                field_map.append((attribute.key, field_name))
+
+        enum_fields = {}
+        for field_name, field_info in model_fields.items():
+            annotation = field_info.annotation
+            if get_origin(annotation) in (Union, UnionType):
+                annotation = next((arg for arg in get_args(annotation) if arg is not type(None)), None)
+            if isinstance(annotation, type) and issubclass(annotation, Enum):
+                enum_fields[field_name] = annotation
+
+        return tuple(field_map), enum_fields
+
     def _to_pydantic(self, db_model: Base) -> Any:
-        """Convert SQLAlchemy model to Pydantic model."""
-        # This is a simplified conversion - in practice, you'd map fields properly
-        model_data = {column.name: getattr(db_model, column.name)
-                     for column in db_model.__table__.columns}
-        return self._pydantic_model(**model_data)
+        """Convert SQLAlchemy model to Pydantic model.
+
+        Rows loaded from the database are trusted, so the model is built with
+        model_construct rather than re-running field validation per row.
+        """
+        if self._field_map is None:
+            self._field_map, self._enum_fields = self._build_field_map()
+
+        model_data = {field_name: getattr(db_model, attribute) for attribute, field_name in self._field_map}
+        for field_name, enum_class in self._enum_fields.items():
+            value = model_data.get(field_name)
+            if value is not None and not isinstance(value, enum_class):
+                model_data[field_name] = enum_class(value)
+        return self._pydantic_model.model_construct(**model_data)
 
 
 class SQLAlchemyNoteService(SQLAlchemyService):
     """Note service implementation using SQLAlchemy."""
 
     def __init__(self, database_url: str):
-        super().__init__(database_url, NoteModel, Note)
+        super().__init__(database_url, NoteModel, Note, NOTE_FIELD_ALIASES)
 
 
 # Update the database service to use SQLAlchemy implementation
@@ -140,28 +251,32 @@ class DatabaseService(SQLAlchemyService):
 
     def __init__(self, database_url: str):
         # Use NoteModel as default for base implementation
-        super().__init__(database_url, NoteModel, Note)
+        super().__init__(database_url, NoteModel, Note, NOTE_FIELD_ALIASES)
+
+    async def get_notes(self, note_ids: list[UUID], *, session: AsyncSession | None = None) -> dict[UUID, Note]:
+        """Get several notes by ID in a single round trip, keyed by note ID."""
+        return await self.get_many(note_ids, session=session)
 
 
 class NoteService(DatabaseService):
     """Note-specific database service."""
 
-    async def create(self, data: NoteCreate) -> Note:
+    async def create(self, data: NoteCreate, *, session: AsyncSession | None = None) -> Note:
         """Create a new note."""
-        return await super().create(data)
+        return await super().create(data, session=session)
 
-    async def get(self, id: UUID) -> Note | None:
+    async def get(self, id: UUID, *, session: AsyncSession | None = None) -> Note | None:
         """Get a note by ID."""
-        return await super().get(id)
+        return await super().get(id, session=session)
 
-    async def list(self, skip: int = 0, limit: int = 100) -> list[Note]:
+    async def list(self, skip: int = 0, limit: int = 100, *, session: AsyncSession | None = None) -> list[Note]:
         """List notes with pagination."""
-        return await super().list(skip, limit)
+        return await super().list(skip, limit, session=session)
 
-    async def update(self, id: UUID, data: NoteUpdate) -> Note | None:
+    async def update(self, id: UUID, data: NoteUpdate, *, session: AsyncSession | None = None) -> Note | None:
         """Update a note."""
-        return await super().update(id, data)
+        return await super().update(id, data, session=session)
 
-    async def delete(self, id: UUID) -> bool:
+    async def delete(self, id: UUID, *, session: AsyncSession | None = None) -> bool:
         """Delete a note."""
-        return await super().delete(id)
+        return await super().delete(id, session=session)
@@ -1,19 +1,43 @@
 """Note synchronization service between BrainForge and Obsidian."""
 
-import hashlib
+import asyncio
+import re
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import Enum
+from functools import partial
 from typing import Any
+from uuid import UUID
 
-from sqlalchemy import select
+import httpx
+import yaml
+from sqlalchemy import Row, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.orm.note import Note as ORMNote
-from src.models.orm.note import NoteType
+from src.models.orm.note import NoteType, note_content_hash
+from src.models.orm.sync_state import SyncState
 
 from .obsidian import ObsidianNote, ObsidianService
 
+# libyaml-backed dumper when available
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Note type named by a directory anywhere in a vault path
+_NOTE_TYPE_DIRECTORY = re.compile(r'(?:^|/)(fleeting|literature|permanent|insight)/')
+
+# YAML frontmatter block at the start of a note, with the blank line written after it
+_FRONTMATTER_BLOCK = re.compile(r'\A---\r?\n(?:.*?\r?\n)?---[ \t]*(?:\r?\n|\Z)(?:\r?\n)?', re.DOTALL)
+
+# Maximum number of note reads and writes in flight against the Obsidian REST API
+OBSIDIAN_READ_CONCURRENCY = 32
+OBSIDIAN_WRITE_CONCURRENCY = 8
+
+# Note length, in characters, from which content is hashed off the event loop
+LARGE_NOTE_SIZE = 1 << 20
+
 
 class SyncDirection(Enum):
     """Direction of synchronization."""
@@ -63,38 +87,57 @@ class SyncConfig:
     exclude_patterns: list[str] | None = None
 
 
+@dataclass
+class _SyncCounts:
+    """Running tallies of a synchronization."""
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    conflicts: int = 0
+    errors: int = 0
+
+
 class SyncService:
     """Service for synchronizing notes between BrainForge and Obsidian."""
 
     def __init__(self, db_session: AsyncSession, obsidian_service: ObsidianService):
         self.db_session = db_session
         self.obsidian_service = obsidian_service
-
-    def _calculate_content_hash(self, content: str) -> str:
+        # Changed Obsidian paths and BrainForge note IDs awaiting sync_notes_from_queue
+        self._obsidian_changes: asyncio.Queue[str] = asyncio.Queue()
+        self._brainforge_changes: asyncio.Queue[str] = asyncio.Queue()
+        # Rendered frontmatter keyed by (note ID, updated_at), least recently used first
+        self._frontmatter_blocks: OrderedDict[tuple[Any, datetime], str] = OrderedDict()
+        self._max_frontmatter_blocks = 4096
+        # Start time of the running sync, used for missing frontmatter timestamps
+        self._now_iso: str | None = None
+        # Notes read from Obsidian, keyed by path, reused while unmodified
+        self._obsidian_note_cache: dict[str, ObsidianNote] = {}
+        # Content of Obsidian writes that kept failing, by path, replayed by the
+        # next sync of this instance; held in memory only
+        self._offline_buffer: OrderedDict[str, str] = OrderedDict()
+
+    def _calculate_content_hash(self, content: str) -> int:
         """Calculate hash of note content for change detection."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return note_content_hash(content)
 
     def _extract_note_type_from_path(self, path: str) -> NoteType:
         """Extract note type from file path."""
-        if '/fleeting/' in path or path.startswith('fleeting/'):
-            return NoteType.FLEETING
-        elif '/literature/' in path or path.startswith('literature/'):
-            return NoteType.LITERATURE
-        elif '/permanent/' in path or path.startswith('permanent/'):
-            return NoteType.PERMANENT
-        elif '/insight/' in path or path.startswith('insight/'):
-            return NoteType.INSIGHT
-        else:
-            return NoteType.PERMANENT  # Default to permanent
+        match = _NOTE_TYPE_DIRECTORY.search(path)
+        if match:
+            return NoteType(match.group(1))
+        return NoteType.PERMANENT  # Default to permanent
 
     def _create_frontmatter(self, note: ORMNote) -> dict[str, Any]:
         """Create Obsidian frontmatter from BrainForge note."""
+        # Missing timestamps default to the time the current sync started
+        now_iso = self._now_iso or datetime.now(UTC).isoformat()
         # Convert SQLAlchemy model to dict for frontmatter
         frontmatter = {
             "id": str(note.id),
             "type": note.note_type.value,
-            "created": note.created_at.isoformat() if note.created_at else datetime.now(UTC).isoformat(),
-            "updated": note.updated_at.isoformat() if note.updated_at else datetime.now(UTC).isoformat(),
+            "created": note.created_at.isoformat() if note.created_at else now_iso,
+            "updated": note.updated_at.isoformat() if note.updated_at else now_iso,
             "created_by": note.created_by or "obsidian_sync",
             "brainforge": True,  # Mark as synced from BrainForge
         }
@@ -107,6 +150,28 @@ class SyncService:
 
         return frontmatter
 
+    def _format_frontmatter(self, note: ORMNote) -> str:
+        """Render a BrainForge note's frontmatter as a YAML block.
+
+        Every frontmatter field changes only alongside updated_at, so the block
+        is cached per (id, updated_at) and a note written more than once in a
+        sync is rendered once. Notes without updated_at are not cached.
+        """
+        key = (note.id, note.updated_at)
+        block = self._frontmatter_blocks.get(key) if note.updated_at else None
+        if block is not None:
+            self._frontmatter_blocks.move_to_end(key)
+            return block
+
+        frontmatter = self._create_frontmatter(note)
+        block = "---\n" + yaml.dump(frontmatter, Dumper=_YAML_DUMPER, sort_keys=False,
+                                    default_flow_style=False, allow_unicode=True) + "---\n\n"
+        if note.updated_at:
+            self._frontmatter_blocks[key] = block
+            while len(self._frontmatter_blocks) > self._max_frontmatter_blocks:
+                self._frontmatter_blocks.popitem(last=False)
+        return block
+
     def _parse_frontmatter(self, frontmatter: dict[str, Any]) -> dict[str, Any]:
         """Parse Obsidian frontmatter for BrainForge metadata."""
         metadata = frontmatter.copy()
@@ -121,29 +186,197 @@ class SyncService:
 
         return metadata
 
-    async def _get_brainforge_notes(self) -> list[ORMNote]:
-        """Get all notes from BrainForge database."""
-        result = await self.db_session.execute(select(ORMNote))
-        return list(result.scalars().all())
+    def _obsidian_bucket(self, note: ObsidianNote) -> str:
+        """Note type bucket of an Obsidian note, matching its BrainForge note's type."""
+        note_type = note.frontmatter.get("type")
+        if note_type in NoteType._value2member_map_:
+            return note_type
+        return self._extract_note_type_from_path(note.path).value
+
+    async def _get_brainforge_roots(self) -> tuple[dict[str, int], dict[str, datetime]]:
+        """Root hash and latest update time of each note type bucket, aggregated in one query.
+
+        The root folds the XOR of the bucket's stored content hashes with its
+        row count and latest update, so any insert, delete, content edit or
+        metadata edit changes it.
+        """
+        stmt = select(
+            ORMNote.note_type,
+            func.bit_xor(ORMNote.content_hash),
+            func.count(),
+            func.max(ORMNote.updated_at),
+        ).group_by(ORMNote.note_type)
+        result = await self.db_session.execute(stmt)
+
+        roots = {}
+        cursors = {}
+        for note_type, hash_xor, count, last_updated in result.all():
+            summary = f"{count}:{hash_xor}:{last_updated.isoformat() if last_updated else ''}"
+            roots[note_type.value] = note_content_hash(summary)
+            if last_updated is not None:
+                cursors[note_type.value] = last_updated
+        return roots, cursors
+
+    async def _hash_obsidian_notes(self, notes: list[ObsidianNote]) -> dict[str, int]:
+        """Content hash of each Obsidian note, keyed by path.
+
+        Notes of LARGE_NOTE_SIZE characters or more are hashed in worker
+        threads so a very large note does not stall the event loop; smaller
+        ones are hashed inline, where a thread handoff would cost more than
+        the hash.
+        """
+        hashes = {}
+        large_notes = []
+        for note in notes:
+            if len(note.content) >= LARGE_NOTE_SIZE:
+                large_notes.append(note)
+            else:
+                hashes[note.path] = self._calculate_content_hash(note.content)
+
+        if large_notes:
+            large_hashes = await asyncio.gather(
+                *(asyncio.to_thread(self._calculate_content_hash, note.content) for note in large_notes)
+            )
+            hashes.update(zip((note.path for note in large_notes), large_hashes))
+        return hashes
+
+    def _get_obsidian_roots(self, notes: list[ObsidianNote], content_hashes: dict[str, int]) -> dict[str, int]:
+        """Root hash of each note type bucket of the Obsidian vault."""
+        folded: dict[str, list[int]] = {}
+        for note in notes:
+            leaf = note_content_hash(note.path) ^ content_hashes[note.path]
+            bucket = folded.setdefault(self._obsidian_bucket(note), [0, 0])
+            bucket[0] ^= leaf
+            bucket[1] += 1
+        return {bucket: note_content_hash(f"{count}:{hash_xor}") for bucket, (hash_xor, count) in folded.items()}
+
+    def _get_obsidian_cursors(self, notes: list[ObsidianNote]) -> dict[str, float]:
+        """Latest modification time seen in each note type bucket of the Obsidian vault."""
+        cursors: dict[str, float] = {}
+        for note in notes:
+            mtime = note.stat.get('mtime')
+            if mtime is not None:
+                bucket = self._obsidian_bucket(note)
+                cursors[bucket] = max(cursors.get(bucket, mtime), mtime)
+        return cursors
+
+    async def _load_sync_state(self) -> dict[str, SyncState]:
+        """Sync state recorded by the last successful sync, keyed by bucket."""
+        result = await self.db_session.execute(select(SyncState))
+        return {state.bucket: state for state in result.scalars().all()}
+
+    def _get_unchanged_buckets(self, sync_state: dict[str, SyncState], brainforge_roots: dict[str, int],
+                               obsidian_roots: dict[str, int]) -> set[str]:
+        """Buckets whose roots on both sides match those stored by the last sync."""
+        return {
+            bucket for bucket, state in sync_state.items()
+            if state.brainforge_root == brainforge_roots.get(bucket)
+            and state.obsidian_root == obsidian_roots.get(bucket)
+        }
 
-    async def _get_obsidian_notes(self) -> list[ObsidianNote]:
-        """Get all notes from Obsidian vault."""
-        files = await self.obsidian_service.list_vault_files()
-        notes = []
+    async def _save_sync_state(self, brainforge_roots: dict[str, int], obsidian_roots: dict[str, int],
+                               obsidian_cursors: dict[str, float], brainforge_cursors: dict[str, datetime]) -> None:
+        """Record the roots and cursors seen by a successful sync for the next one to compare."""
+        now = datetime.now(UTC)
+        for bucket in brainforge_roots.keys() | obsidian_roots.keys():
+            await self.db_session.merge(SyncState(
+                bucket=bucket,
+                brainforge_root=brainforge_roots.get(bucket),
+                obsidian_root=obsidian_roots.get(bucket),
+                obsidian_mtime_cursor=obsidian_cursors.get(bucket),
+                brainforge_updated_cursor=brainforge_cursors.get(bucket),
+                last_sync_at=now,
+            ))
+
+    async def _iter_brainforge_note_headers(self, since: datetime | None = None,
+                                            note_ids: Iterable[str] = ()) -> AsyncIterator[Row]:
+        """Stream the id, type, update time and content hash of BrainForge notes.
+
+        Content is left out and rows arrive in batches from a server-side
+        cursor, so pairing notes never holds every note body in memory. With
+        since, only notes updated after it or named in note_ids are read, and
+        the filter uses the updated_at index.
+        """
+        stmt = select(
+            ORMNote.id, ORMNote.note_type, ORMNote.updated_at, ORMNote.content_hash
+        ).execution_options(yield_per=1000)
+        if since is not None:
+            changed = ORMNote.updated_at > since
+            ids = self._parse_note_ids(note_ids)
+            stmt = stmt.where(or_(changed, ORMNote.id.in_(ids)) if ids else changed)
+        result = await self.db_session.stream(stmt)
+        async for row in result:
+            yield row
+
+    async def _get_obsidian_notes(self, paths: Iterable[str] | None = None) -> list[ObsidianNote]:
+        """Get all notes from Obsidian vault, or only those at the given paths.
+
+        Notes are read concurrently, at most OBSIDIAN_READ_CONCURRENCY at a
+        time, so the listing costs a few round trips rather than one per note.
+        Paths that cannot be read, such as deleted notes, are left out.
+
+        For the whole vault, the modification time index is fetched first and
+        only notes that are new or modified since they were last read are
+        fetched; the rest come from the note cache. Without the index, every
+        note is fetched.
+        """
+        if paths is not None:
+            notes = await self._fetch_obsidian_notes(paths)
+            self._obsidian_note_cache.update((note.path, note) for note in notes)
+            return notes
 
-        for file_path in files:
-            if file_path.endswith('.md'):
+        try:
+            index = await self.obsidian_service.list_vault_index()
+        except (httpx.HTTPError, KeyError, TypeError, ValueError):
+            notes = await self._fetch_obsidian_notes(await self.obsidian_service.list_vault_files())
+            self._obsidian_note_cache = {note.path: note for note in notes}
+            return notes
+
+        cache = self._obsidian_note_cache
+        cached = {
+            path: cache[path] for path, mtime in index.items()
+            if path in cache and cache[path].stat.get('mtime') == mtime
+        }
+        fetched = await self._fetch_obsidian_notes(path for path in index if path not in cached)
+        # Paths no longer in the index are dropped from the cache
+        self._obsidian_note_cache = {**cached, **{note.path: note for note in fetched}}
+        return list(self._obsidian_note_cache.values())
+
+    async def _fetch_obsidian_notes(self, files: Iterable[str]) -> list[ObsidianNote]:
+        """Read the Markdown notes at the given paths from Obsidian."""
+        semaphore = asyncio.Semaphore(OBSIDIAN_READ_CONCURRENCY)
+
+        async def fetch(file_path: str) -> ObsidianNote | None:
+            async with semaphore:
                 try:
                     note = await self.obsidian_service.get_note(file_path, as_json=True)
-                    notes.append(note)
                 except Exception:
                     # Skip files that can't be read
-                    continue
-
-        return notes
+                    return None
+            return self._strip_frontmatter(note)
+
+        notes = await asyncio.gather(*(fetch(file_path) for file_path in files if file_path.endswith('.md')))
+        return [note for note in notes if note is not None]
+
+    def _strip_frontmatter(self, note: ObsidianNote) -> ObsidianNote:
+        """Leave only the body of a note read from Obsidian in its content.
+
+        The REST API returns the whole file as content, frontmatter included,
+        and parses the frontmatter separately. BrainForge stores and hashes
+        the body alone, so the block is cut off here, before the note is
+        hashed, compared or copied into BrainForge.
+        """
+        match = _FRONTMATTER_BLOCK.match(note.content)
+        if match:
+            note.content = note.content[match.end():]
+        return note
 
     async def _create_brainforge_note(self, obsidian_note: ObsidianNote) -> ORMNote:
-        """Create a BrainForge note from Obsidian note."""
+        """Create a BrainForge note from Obsidian note.
+
+        The note is not added to the session; callers add new notes in bulk
+        so they are inserted with a single flush.
+        """
         note_type = self._extract_note_type_from_path(obsidian_note.path)
         metadata = self._parse_frontmatter(obsidian_note.frontmatter)
 
@@ -157,8 +390,6 @@ class SyncService:
             updated_at=datetime.now(UTC)
         )
 
-        self.db_session.add(note)
-        await self.db_session.flush()
         return note
 
     async def _update_brainforge_note(self, brainforge_note: ORMNote, obsidian_note: ObsidianNote) -> ORMNote:
@@ -185,209 +416,485 @@ class SyncService:
         filename = f"{brainforge_note.id}.md"
         file_path = f"{base_path}/{filename}"
 
-        # Create frontmatter
-        frontmatter = self._create_frontmatter(brainforge_note)
-
-        # Format as YAML frontmatter
-        frontmatter_yaml = "---\n"
-        for key, value in frontmatter.items():
-            frontmatter_yaml += f"{key}: {repr(value)}\n"
-        frontmatter_yaml += "---\n\n"
-
-        # Combine frontmatter and content
-        full_content = frontmatter_yaml + brainforge_note.content
-
-        # Convert content to string for Obsidian API
-        content_str = str(brainforge_note.content) if hasattr(brainforge_note.content, '__str__') else str(full_content)
-        await self.obsidian_service.create_or_append_note(file_path, content_str)
+        # The frontmatter carries the note's ID, which later syncs match on
+        await self._obsidian_write_with_retry(
+            file_path, self._format_frontmatter(brainforge_note) + brainforge_note.content
+        )
 
     async def _update_obsidian_note(self, brainforge_note: ORMNote, obsidian_note: ObsidianNote) -> None:
         """Update an Obsidian note with BrainForge content."""
-        # Create updated frontmatter
-        frontmatter = self._create_frontmatter(brainforge_note)
-
-        # Format as YAML frontmatter
-        frontmatter_yaml = "---\n"
-        for key, value in frontmatter.items():
-            frontmatter_yaml += f"{key}: {repr(value)}\n"
-        frontmatter_yaml += "---\n\n"
-
-        # Combine frontmatter and content
-        full_content = frontmatter_yaml + brainforge_note.content
-
-        # Replace the entire note content
-        # Convert content to string for Obsidian API
-        content_str = str(brainforge_note.content) if hasattr(brainforge_note.content, '__str__') else str(full_content)
-        await self.obsidian_service.create_or_append_note(obsidian_note.path, content_str)
+        # Replace the entire note content, frontmatter included
+        await self._obsidian_write_with_retry(
+            obsidian_note.path, self._format_frontmatter(brainforge_note) + brainforge_note.content
+        )
 
-    async def _detect_conflicts(self, brainforge_note: ORMNote, obsidian_note: ObsidianNote) -> bool:
-        """Detect if there are conflicts between BrainForge and Obsidian versions."""
+    async def _obsidian_write_with_retry(self, path: str, content: str, *, attempts: int = 3,
+                                         base_delay: float = 1.0, factor: float = 2.0) -> None:
+        """Write a note to Obsidian, retrying transient failures with exponential backoff.
+
+        The note is written with a PUT, which replaces its whole content, so
+        a write the server applied before the connection failed is harmless
+        to repeat; an append would add the content twice. Connection errors
+        and timeouts are retried after base_delay, base_delay * factor, ...
+        seconds. If every attempt fails, the write is kept in the offline
+        buffer for the next sync to replay, replacing any older buffered
+        write to the same path, and the error is raised. A write that
+        succeeds drops the path from the buffer. Other errors, such as HTTP
+        error responses, are raised at once.
+
+        The offline buffer is in-process memory of this SyncService: writes
+        still buffered are lost when the instance is discarded or the process
+        exits, and are then made again only if a later full sync finds the
+        notes out of date.
+        """
+        for attempt in range(attempts):
+            try:
+                await self.obsidian_service.put_note(path, content)
+                self._offline_buffer.pop(path, None)
+                return
+            except (httpx.TransportError, TimeoutError):
+                if attempt == attempts - 1:
+                    self._offline_buffer[path] = content
+                    self._offline_buffer.move_to_end(path)
+                    raise
+                await asyncio.sleep(base_delay * factor ** attempt)
+
+    async def _replay_offline_writes(self) -> int:
+        """Replay writes buffered by earlier syncs, returning how many succeeded.
+
+        Each is tried once; one that fails transiently again stays buffered.
+        """
+        pending = list(self._offline_buffer.items())
+        self._offline_buffer.clear()
+        replayed = 0
+        for path, content in pending:
+            try:
+                await self._obsidian_write_with_retry(path, content, attempts=1)
+                replayed += 1
+            except Exception:
+                continue
+        return replayed
+
+    def _merge_contents(self, brainforge_note: ORMNote, obsidian_note: ObsidianNote) -> str:
+        """Simple merge: keep both contents, each under its own heading.
+
+        The result is built with one join into a single allocation; it is
+        stored on the BrainForge note, so it has to exist as one string anyway.
+        """
+        return "".join((
+            "# BrainForge Version\n\n", brainforge_note.content,
+            "\n\n# Obsidian Version\n\n", obsidian_note.content,
+        ))
+
+    async def _detect_conflicts(self, brainforge_note: ORMNote, obsidian_note: ObsidianNote,
+                                obsidian_hash: int | None = None) -> bool:
+        """Detect if there are conflicts between BrainForge and Obsidian versions.
+
+        Pass obsidian_hash when the Obsidian content hash is already known.
+        """
         if not brainforge_note.updated_at or not obsidian_note.stat.get('mtime'):
             return False
 
-        # Compare modification times
-        brainforge_time = brainforge_note.updated_at
-        obsidian_time = datetime.fromtimestamp(obsidian_note.stat.get('mtime', 0), UTC)
+        # Compare modification times as epoch seconds
+        time_diff = abs(brainforge_note.updated_at.timestamp() - obsidian_note.stat['mtime'])
 
         # If both were modified recently, check content
-        time_diff = abs((brainforge_time - obsidian_time).total_seconds())
         if time_diff < 300:  # 5 minutes threshold
-            # Get content as string for hash calculation
-            content_str = str(brainforge_note.content) if hasattr(brainforge_note.content, '__str__') else ""
-            brainforge_hash = self._calculate_content_hash(content_str)
-            obsidian_hash = self._calculate_content_hash(obsidian_note.content)
+            # The BrainForge hash is stored with the row; only rows written
+            # before the column existed need hashing here
+            brainforge_hash = brainforge_note.content_hash
+            if brainforge_hash is None:
+                brainforge_hash = self._calculate_content_hash(brainforge_note.content)
+            if obsidian_hash is None:
+                obsidian_hash = self._calculate_content_hash(obsidian_note.content)
             return brainforge_hash != obsidian_hash
 
         return False
 
+    def enqueue_change(self, path: str) -> None:
+        """Queue an Obsidian note reported changed, e.g. by a vault file-watcher webhook."""
+        self._obsidian_changes.put_nowait(path)
+
+    def enqueue_brainforge_change(self, note_id: str) -> None:
+        """Queue a BrainForge note reported changed, e.g. by a note_changed notification."""
+        self._brainforge_changes.put_nowait(note_id)
+
+    async def listen_for_note_changes(self, connection: Any) -> None:
+        """Queue BrainForge note changes announced on the note_changed channel.
+
+        Args:
+            connection: An asyncpg connection to listen on; the notes table
+                trigger sends each changed note's ID as the payload.
+        """
+        await connection.add_listener(
+            'note_changed', lambda _connection, _pid, _channel, payload: self.enqueue_brainforge_change(payload)
+        )
+
+    def _drain(self, queue: asyncio.Queue, limit: int) -> list[str]:
+        """Pop up to limit distinct items from a change queue without waiting."""
+        items: dict[str, None] = {}
+        while len(items) < limit and not queue.empty():
+            items[queue.get_nowait()] = None
+        return list(items)
+
+    def _parse_note_ids(self, note_ids: Iterable[str]) -> list[UUID]:
+        """The given note IDs as UUIDs, leaving out any that are malformed."""
+        ids = []
+        for note_id in note_ids:
+            try:
+                ids.append(UUID(note_id))
+            except (TypeError, ValueError):
+                continue
+        return ids
+
+    async def _get_brainforge_notes_by_id(self, note_ids: set[str]) -> list[ORMNote]:
+        """Get the BrainForge notes with the given IDs."""
+        ids = self._parse_note_ids(note_ids)
+        if not ids:
+            return []
+        result = await self.db_session.execute(select(ORMNote).where(ORMNote.id.in_(ids)))
+        return list(result.scalars().all())
+
+    async def _get_brainforge_dedup_keys(self, content_hashes: set[int]) -> set[tuple[str, str | None, int]]:
+        """(note type, creator, content hash) keys of BrainForge notes with the given hashes.
+
+        Each note also yields a key with no creator, which matches Obsidian
+        notes whose frontmatter does not name one. The lookup uses the
+        content_hash index.
+        """
+        if not content_hashes:
+            return set()
+        stmt = select(ORMNote.note_type, ORMNote.created_by, ORMNote.content_hash).where(
+            ORMNote.content_hash.in_(content_hashes)
+        )
+        result = await self.db_session.execute(stmt)
+
+        keys: set[tuple[str, str | None, int]] = set()
+        for note_type, created_by, content_hash in result.all():
+            keys.add((note_type.value, created_by, content_hash))
+            keys.add((note_type.value, None, content_hash))
+        return keys
+
+    def _note_path(self, note: ORMNote) -> str:
+        """Obsidian path of a BrainForge note."""
+        return f"{note.note_type.value}/{note.id}.md"
+
+    async def sync_notes_from_queue(self, config: SyncConfig, max_changes: int = 100) -> SyncResult:
+        """Synchronize only the notes queued as changed, instead of scanning both sides.
+
+        Up to max_changes queued Obsidian paths and as many queued BrainForge
+        note IDs are drained; the notes they name and their counterparts on the
+        other side are the only ones read and synchronized.
+        """
+        counts = _SyncCounts()
+        self._now_iso = datetime.now(UTC).isoformat()
+        paths = self._drain(self._obsidian_changes, max_changes)
+        note_ids = self._drain(self._brainforge_changes, max_changes)
+        details = {"queued_paths": len(paths), "queued_notes": len(note_ids)}
+
+        try:
+            details["replayed_writes"] = 0 if config.dry_run else await self._replay_offline_writes()
+            if not paths and not note_ids:
+                return self._build_result(counts, config, details)
+
+            brainforge_notes = await self._get_brainforge_notes_by_id(set(note_ids))
+            paths.extend(self._note_path(note) for note in brainforge_notes)
+            obsidian_notes = await self._get_obsidian_notes(dict.fromkeys(paths))
+
+            # Load the BrainForge counterparts of changed Obsidian notes
+            loaded_ids = {str(note.id) for note in brainforge_notes}
+            counterpart_ids = {note.frontmatter.get('id') for note in obsidian_notes} - loaded_ids - {None}
+            brainforge_notes += await self._get_brainforge_notes_by_id(counterpart_ids)
+
+            content_hashes = await self._hash_obsidian_notes(obsidian_notes)
+            await self._sync_note_sets(config, counts, brainforge_notes, obsidian_notes, content_hashes)
+
+            if not config.dry_run:
+                await self.db_session.commit()
+
+            return self._build_result(counts, config, {
+                **details,
+                "brainforge_notes_count": len(brainforge_notes),
+                "obsidian_notes_count": len(obsidian_notes),
+            })
+
+        except Exception as e:
+            await self.db_session.rollback()
+            return self._failed_result(counts, e)
+
     async def sync_notes(self, config: SyncConfig) -> SyncResult:
         """Synchronize notes between BrainForge and Obsidian."""
-        processed = 0
-        created = 0
-        updated = 0
-        conflicts = 0
-        errors = 0
+        counts = _SyncCounts()
+        self._now_iso = datetime.now(UTC).isoformat()
 
         try:
-            # Get notes from both sources
-            brainforge_notes = await self._get_brainforge_notes()
+            replayed_writes = 0 if config.dry_run else await self._replay_offline_writes()
+
             obsidian_notes = await self._get_obsidian_notes()
 
-            # Create mapping for quick lookup
-            brainforge_by_path = {}
-            obsidian_by_id = {}
-
-            # Map BrainForge notes by their expected Obsidian path
-            for note in brainforge_notes:
-                base_path = note.note_type.value
-                filename = f"{note.id}.md"
-                file_path = f"{base_path}/{filename}"
-                brainforge_by_path[file_path] = note
-
-            # Map Obsidian notes by BrainForge ID from frontmatter
-            for note in obsidian_notes:
-                brainforge_id = note.frontmatter.get('id')
-                if brainforge_id:
-                    obsidian_by_id[brainforge_id] = note
-
-            # Perform synchronization based on direction
-            if config.direction in [SyncDirection.BIDIRECTIONAL, SyncDirection.OBSIDIAN_TO_BRAINFORGE]:
-                # Sync from Obsidian to BrainForge
-                for obsidian_note in obsidian_notes:
-                    try:
-                        processed += 1
-                        brainforge_id = obsidian_note.frontmatter.get('id')
-
-                        if brainforge_id and brainforge_id in obsidian_by_id:
-                            # Update existing note
-                            brainforge_note = brainforge_by_path.get(obsidian_note.path)
-                            if brainforge_note:
-                                if await self._detect_conflicts(brainforge_note, obsidian_note):
-                                    conflicts += 1
-                                    # Apply conflict resolution
-                                    if config.conflict_resolution == ConflictResolution.KEEP_OBSIDIAN:
-                                        await self._update_brainforge_note(brainforge_note, obsidian_note)
-                                        updated += 1
-                                    elif config.conflict_resolution == ConflictResolution.MERGE:
-                                        # Simple merge: keep both contents separated
-                                        merged_content = f"# BrainForge Version\n\n{brainforge_note.content}\n\n# Obsidian Version\n\n{obsidian_note.content}"
-                                        brainforge_note.content = merged_content
-                                        updated += 1
-                                    # Skip if KEEP_BRAINFORGE or SKIP
-                                else:
-                                    await self._update_brainforge_note(brainforge_note, obsidian_note)
-                                    updated += 1
-                        else:
-                            # Create new note
-                            if not config.dry_run:
-                                await self._create_brainforge_note(obsidian_note)
-                            created += 1
-
-                    except Exception:
-                        errors += 1
-                        continue
-
-            if config.direction in [SyncDirection.BIDIRECTIONAL, SyncDirection.BRAINFORGE_TO_OBSIDIAN]:
-                # Sync from BrainForge to Obsidian
-                for brainforge_note in brainforge_notes:
-                    try:
-                        processed += 1
-                        base_path = brainforge_note.note_type.value
-                        filename = f"{brainforge_note.id}.md"
-                        file_path = f"{base_path}/{filename}"
-
-                        obsidian_note = obsidian_by_id.get(str(brainforge_note.id))
-                        if obsidian_note:
-                            # Update existing note
-                            if await self._detect_conflicts(brainforge_note, obsidian_note):
-                                conflicts += 1
+            # Compare per-type root hashes first; buckets unchanged on both
+            # sides since the last sync need no per-note work
+            brainforge_roots, brainforge_cursors = await self._get_brainforge_roots()
+            content_hashes = await self._hash_obsidian_notes(obsidian_notes)
+            obsidian_roots = self._get_obsidian_roots(obsidian_notes, content_hashes)
+            sync_state = await self._load_sync_state()
+            unchanged_buckets = self._get_unchanged_buckets(sync_state, brainforge_roots, obsidian_roots)
+
+            # Obsidian notes not modified since the last sync have nothing new
+            # to bring into BrainForge when syncing incrementally
+            obsidian_cursors = self._get_obsidian_cursors(obsidian_notes)
+            mtime_cursors = {
+                bucket: state.obsidian_mtime_cursor for bucket, state in sync_state.items()
+                if config.incremental and state.obsidian_mtime_cursor is not None
+            }
+
+            def skip_obsidian(note: ObsidianNote) -> bool:
+                bucket = self._obsidian_bucket(note)
+                if bucket in unchanged_buckets:
+                    return True
+                mtime = note.stat.get('mtime')
+                return bucket in mtime_cursors and mtime is not None and mtime <= mtime_cursors[bucket]
+
+            # Likewise, BrainForge notes not updated since the last sync have
+            # nothing new to send; headers are read only for notes updated since
+            # the oldest bucket cursor and for Obsidian notes with changes to pair
+            since = None
+            if config.incremental and brainforge_roots:
+                updated_cursors = [
+                    sync_state[bucket].brainforge_updated_cursor if bucket in sync_state else None
+                    for bucket in brainforge_roots
+                ]
+                if None not in updated_cursors:
+                    since = min(updated_cursors)
+            changed_obsidian_ids = [
+                note.frontmatter.get('id') for note in obsidian_notes
+                if note.frontmatter.get('id') and not skip_obsidian(note)
+            ]
+            brainforge_headers = {
+                str(row.id): row
+                async for row in self._iter_brainforge_note_headers(since, changed_obsidian_ids)
+            }
+
+            # Load full BrainForge notes only where there is work: notes with no
+            # Obsidian counterpart, and pairs whose contents differ
+            obsidian_hash_by_id = {
+                note.frontmatter.get('id'): content_hashes[note.path] for note in obsidian_notes
+            }
+
+            def needs_sync(note_id: str, header: Row) -> bool:
+                obsidian_hash = obsidian_hash_by_id.get(note_id)
+                if obsidian_hash is None:
+                    return header.note_type.value not in unchanged_buckets
+                return header.content_hash != obsidian_hash
+
+            brainforge_notes = await self._get_brainforge_notes_by_id({
+                note_id for note_id, header in brainforge_headers.items() if needs_sync(note_id, header)
+            })
+
+            await self._sync_note_sets(
+                config, counts, brainforge_notes, obsidian_notes, content_hashes,
+                skip_obsidian=skip_obsidian,
+                skip_brainforge=lambda note: note.note_type.value in unchanged_buckets,
+            )
+
+            # Commit changes if not dry run. The roots and cursors are those read
+            # before this sync's own writes, so a bucket it changed is revisited once
+            if not config.dry_run:
+                if counts.errors == 0 and counts.conflicts == 0:
+                    await self._save_sync_state(brainforge_roots, obsidian_roots, obsidian_cursors,
+                                                brainforge_cursors)
+                await self.db_session.commit()
+
+            return self._build_result(counts, config, {
+                "brainforge_notes_count": len(brainforge_headers),
+                "brainforge_notes_loaded": len(brainforge_notes),
+                "obsidian_notes_count": len(obsidian_notes),
+                "unchanged_buckets": sorted(unchanged_buckets),
+                "replayed_writes": replayed_writes,
+            })
+
+        except Exception as e:
+            await self.db_session.rollback()
+            return self._failed_result(counts, e)
+
+    async def _sync_note_sets(self, config: SyncConfig, counts: "_SyncCounts",
+                              brainforge_notes: list[ORMNote], obsidian_notes: list[ObsidianNote],
+                              content_hashes: dict[str, int],
+                              skip_obsidian: Callable[[ObsidianNote], bool] | None = None,
+                              skip_brainforge: Callable[[ORMNote], bool] | None = None) -> None:
+        """Synchronize two sets of notes in the configured direction, tallying into counts.
+
+        content_hashes holds each Obsidian note's content hash, keyed by path.
+        """
+        # Map both sides by BrainForge ID; Obsidian notes carry it in frontmatter
+        brainforge_by_id = {str(note.id): note for note in brainforge_notes}
+        obsidian_by_id = {}
+        for note in obsidian_notes:
+            brainforge_id = note.frontmatter.get('id')
+            if brainforge_id:
+                obsidian_by_id[brainforge_id] = note
+
+        # A pair needs syncing only while its Obsidian hash differs from the
+        # stored BrainForge hash, which is compared live because the first
+        # phase may already have brought a pair in line
+        obsidian_hashes = {
+            brainforge_id: content_hashes[obsidian_by_id[brainforge_id].path]
+            for brainforge_id in brainforge_by_id.keys() & obsidian_by_id.keys()
+        }
+
+        # Perform synchronization based on direction
+        if config.direction in [SyncDirection.BIDIRECTIONAL, SyncDirection.OBSIDIAN_TO_BRAINFORGE]:
+            # Sync from Obsidian to BrainForge
+            to_create: list[ORMNote] = []
+            existing_keys = await self._get_brainforge_dedup_keys({
+                content_hashes[note.path] for note in obsidian_notes if not note.frontmatter.get('id')
+            })
+            for obsidian_note in obsidian_notes:
+                if skip_obsidian and skip_obsidian(obsidian_note):
+                    continue
+                try:
+                    counts.processed += 1
+                    brainforge_id = obsidian_note.frontmatter.get('id')
+
+                    if brainforge_id:
+                        # Update existing note
+                        obsidian_hash = obsidian_hashes.get(brainforge_id)
+                        brainforge_note = brainforge_by_id.get(brainforge_id)
+                        if obsidian_hash is not None and brainforge_note.content_hash != obsidian_hash:
+                            if await self._detect_conflicts(brainforge_note, obsidian_note, obsidian_hash):
+                                counts.conflicts += 1
                                 # Apply conflict resolution
-                                if config.conflict_resolution == ConflictResolution.KEEP_BRAINFORGE:
-                                    if not config.dry_run:
-                                        await self._update_obsidian_note(brainforge_note, obsidian_note)
-                                    updated += 1
+                                if config.conflict_resolution == ConflictResolution.KEEP_OBSIDIAN:
+                                    await self._update_brainforge_note(brainforge_note, obsidian_note)
+                                    counts.updated += 1
                                 elif config.conflict_resolution == ConflictResolution.MERGE:
-                                    # Simple merge: keep both contents separated
-                                    merged_content = f"# BrainForge Version\n\n{brainforge_note.content}\n\n# Obsidian Version\n\n{obsidian_note.content}"
-                                    # Update content using setattr for SQLAlchemy compatibility
-                                    brainforge_note.content = merged_content
-                                    if not config.dry_run:
-                                        await self._update_obsidian_note(brainforge_note, obsidian_note)
-                                    updated += 1
-                                # Skip if KEEP_OBSIDIAN or SKIP
+                                    brainforge_note.content = self._merge_contents(brainforge_note, obsidian_note)
+                                    counts.updated += 1
+                                # Skip if KEEP_BRAINFORGE or SKIP
                             else:
-                                if not config.dry_run:
-                                    await self._update_obsidian_note(brainforge_note, obsidian_note)
-                                updated += 1
+                                await self._update_brainforge_note(brainforge_note, obsidian_note)
+                                counts.updated += 1
+                    else:
+                        # A note without an ID may still match one already in
+                        # BrainForge or one created earlier in this loop
+                        dedup_key = (
+                            self._extract_note_type_from_path(obsidian_note.path).value,
+                            obsidian_note.frontmatter.get('created_by'),
+                            content_hashes[obsidian_note.path],
+                        )
+                        if dedup_key in existing_keys:
+                            continue
+                        existing_keys.add(dedup_key)
+
+                        # Create new note, inserted with the others after the loop
+                        if not config.dry_run:
+                            to_create.append(await self._create_brainforge_note(obsidian_note))
+                        counts.created += 1
+
+                except Exception:
+                    counts.errors += 1
+                    continue
+
+            # One flush inserts every new note; updates wait for the commit
+            if to_create:
+                self.db_session.add_all(to_create)
+                await self.db_session.flush()
+
+        if config.direction in [SyncDirection.BIDIRECTIONAL, SyncDirection.BRAINFORGE_TO_OBSIDIAN]:
+            # Sync from BrainForge to Obsidian. Writes are collected as
+            # (tally, write) pairs and run concurrently after classification.
+            writes: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+            for brainforge_note in brainforge_notes:
+                if skip_brainforge and skip_brainforge(brainforge_note):
+                    continue
+                try:
+                    counts.processed += 1
+
+                    brainforge_id = str(brainforge_note.id)
+                    obsidian_note = obsidian_by_id.get(brainforge_id)
+                    if obsidian_note:
+                        obsidian_hash = obsidian_hashes[brainforge_id]
+                        if brainforge_note.content_hash == obsidian_hash:
+                            continue
+                        update = partial(self._update_obsidian_note, brainforge_note, obsidian_note)
+                        # Update existing note
+                        if await self._detect_conflicts(brainforge_note, obsidian_note, obsidian_hash):
+                            counts.conflicts += 1
+                            # Apply conflict resolution
+                            if config.conflict_resolution == ConflictResolution.KEEP_BRAINFORGE:
+                                writes.append(("updated", update))
+                            elif config.conflict_resolution == ConflictResolution.MERGE:
+                                brainforge_note.content = self._merge_contents(brainforge_note, obsidian_note)
+                                writes.append(("updated", update))
+                            # Skip if KEEP_OBSIDIAN or SKIP
                         else:
-                            # Create new note
-                            if not config.dry_run:
-                                await self._create_obsidian_note(brainforge_note)
-                            created += 1
+                            writes.append(("updated", update))
+                    else:
+                        # Create new note
+                        writes.append(("created", partial(self._create_obsidian_note, brainforge_note)))
 
-                    except Exception:
-                        errors += 1
-                        continue
+                except Exception:
+                    counts.errors += 1
+                    continue
 
-            # Commit changes if not dry run
-            if not config.dry_run:
-                await self.db_session.commit()
+            await self._run_obsidian_writes(config, counts, writes)
+
+    async def _run_obsidian_writes(self, config: SyncConfig, counts: "_SyncCounts",
+                                   writes: list[tuple[str, Callable[[], Awaitable[None]]]]) -> None:
+        """Run Obsidian writes concurrently, tallying each success under its name.
 
-            # Determine status
-            if errors == 0 and conflicts == 0:
-                status = SyncStatus.SUCCESS
-                message = f"Sync completed: {created} created, {updated} updated"
-            elif errors > 0 or conflicts > 0:
-                status = SyncStatus.PARTIAL
-                message = f"Sync completed with issues: {created} created, {updated} updated, {conflicts} conflicts, {errors} errors"
+        At most OBSIDIAN_WRITE_CONCURRENCY writes are in flight; a failed write
+        counts as an error. In a dry run nothing is written but the tallies are
+        still made.
+        """
+        if config.dry_run:
+            for tally, _ in writes:
+                setattr(counts, tally, getattr(counts, tally) + 1)
+            return
+
+        semaphore = asyncio.Semaphore(OBSIDIAN_WRITE_CONCURRENCY)
+
+        async def run(write: Callable[[], Awaitable[None]]) -> None:
+            async with semaphore:
+                await write()
+
+        results = await asyncio.gather(*(run(write) for _, write in writes), return_exceptions=True)
+        for (tally, _), result in zip(writes, results):
+            if isinstance(result, Exception):
+                counts.errors += 1
             else:
-                status = SyncStatus.FAILED
-                message = "Sync failed"
-
-            return SyncResult(
-                status=status,
-                processed=processed,
-                created=created,
-                updated=updated,
-                conflicts=conflicts,
-                errors=errors,
-                message=message,
-                details={
-                    "brainforge_notes_count": len(brainforge_notes),
-                    "obsidian_notes_count": len(obsidian_notes),
-                    "dry_run": config.dry_run
-                }
-            )
+                setattr(counts, tally, getattr(counts, tally) + 1)
 
-        except Exception as e:
-            await self.db_session.rollback()
-            return SyncResult(
-                status=SyncStatus.FAILED,
-                processed=processed,
-                created=created,
-                updated=updated,
-                conflicts=conflicts,
-                errors=errors + 1,
-                message=f"Sync failed: {str(e)}",
-                details={"error": str(e)}
-            )
+    def _build_result(self, counts: "_SyncCounts", config: SyncConfig, details: dict[str, Any]) -> SyncResult:
+        """Build the result of a completed sync from its tallies."""
+        if counts.errors == 0 and counts.conflicts == 0:
+            status = SyncStatus.SUCCESS
+            message = f"Sync completed: {counts.created} created, {counts.updated} updated"
+        else:
+            status = SyncStatus.PARTIAL
+            message = (f"Sync completed with issues: {counts.created} created, {counts.updated} updated, "
+                       f"{counts.conflicts} conflicts, {counts.errors} errors")
+
+        return SyncResult(
+            status=status,
+            processed=counts.processed,
+            created=counts.created,
+            updated=counts.updated,
+            conflicts=counts.conflicts,
+            errors=counts.errors,
+            message=message,
+            details={**details, "dry_run": config.dry_run}
+        )
+
+    def _failed_result(self, counts: "_SyncCounts", error: Exception) -> SyncResult:
+        """Build the result of a sync aborted by an error."""
+        return SyncResult(
+            status=SyncStatus.FAILED,
+            processed=counts.processed,
+            created=counts.created,
+            updated=counts.updated,
+            conflicts=counts.conflicts,
+            errors=counts.errors + 1,
+            message=f"Sync failed: {str(error)}",
+            details={"error": str(error)}
+        )
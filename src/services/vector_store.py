@@ -5,24 +5,78 @@ and similarity search using PostgreSQL with PGVector extension.
 """
 
 import asyncio
+import hashlib
 import logging
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 from src.models.embedding import Embedding
-from src.services.database import DatabaseService
+from src.services.database import EmbeddingStoreService
 
 logger = logging.getLogger(__name__)
 
+# Dimensions of OpenAI text-embedding-3-small vectors
+VECTOR_DIMENSIONS = 1536
+
+# Reasonable range for embedding values
+VECTOR_VALUE_LIMIT = 10.0
+
+# Models whose output is known to be unit-normalized floats of the expected
+# dimensions, so their vectors skip the range check; they are still checked
+# for NaN and infinite values, which a failed request can produce
+TRUSTED_EMBEDDING_MODELS = frozenset({"text-embedding-3-small", "text-embedding-ada-002"})
+
+# Concurrent searches in a fanned-out batch when the database service does
+# not report its connection pool size
+DEFAULT_SEARCH_CONCURRENCY = 10
+
+# Bounds of the per-note embedding lookup cache
+EMBEDDING_CACHE_SIZE = 10_000
+EMBEDDING_CACHE_TTL_SECONDS = 60.0
+
+# Bounds of the similarity search result cache
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL_SECONDS = 30.0
+
 
 class VectorStore:
     """Service for vector storage and similarity search operations."""
 
-    def __init__(self, database_service: DatabaseService):
+    def __init__(self, database_service: EmbeddingStoreService):
         self.database_service = database_service
         self.default_distance_metric = "cosine"  # cosine distance for normalized vectors
         self.default_search_limit = 10
+        # (fetch time, embedding) by note ID, least recently used first
+        self._embedding_cache: OrderedDict[str, tuple[float, Embedding]] = OrderedDict()
+        # (search time, results) by query key, least recently used first;
+        # cleared on every write
+        self._query_cache: OrderedDict[tuple, tuple[float, list[tuple[Embedding, float]]]] = OrderedDict()
+
+    async def _get_embedding(self, note_id: str) -> Embedding | None:
+        """Get a note's embedding, from the lookup cache while it is fresh."""
+        cached = self._embedding_cache.get(note_id)
+        if cached is not None and time.monotonic() - cached[0] < EMBEDDING_CACHE_TTL_SECONDS:
+            self._embedding_cache.move_to_end(note_id)
+            return cached[1]
+
+        embedding = await self.database_service.get_embedding_by_note_id(note_id)
+        self._cache_embedding(note_id, embedding)
+        return embedding
+
+    def _cache_embedding(self, note_id: str, embedding: Embedding | None) -> None:
+        """Record a note's current embedding in the lookup cache, or forget it."""
+        if embedding is None:
+            self._embedding_cache.pop(note_id, None)
+            return
+        self._embedding_cache[note_id] = (time.monotonic(), embedding)
+        self._embedding_cache.move_to_end(note_id)
+        if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
 
     async def store_vector(self, note_id: str, vector: list[float],
                           model_name: str, model_version: str) -> Embedding | None:
@@ -39,27 +93,30 @@ class VectorStore:
         """
         try:
             # Validate vector dimensions and values
-            if not self._validate_vector(vector):
+            if not self._validate_vector(vector, model_name):
                 logger.error("Invalid vector provided for storage")
                 return None
 
             # Check if embedding already exists for this note
-            existing_embedding = await self.database_service.get_embedding_by_note_id(note_id)
+            existing_embedding = await self._get_embedding(note_id)
             if existing_embedding:
                 logger.info(f"Updating existing embedding for note {note_id}")
-                return await self.update_vector(note_id, vector, model_name, model_version)
+                return await self.update_vector(note_id, vector, model_name, model_version,
+                                                existing=existing_embedding)
 
             # Create new embedding record
             embedding_data = {
                 "note_id": note_id,
-                "vector": vector,
+                "vector": self._normalize_vector(vector),
                 "model_name": model_name,
                 "model_version": model_version,
                 "dimensions": len(vector),
-                "normalized": True  # Assuming OpenAI embeddings are normalized
+                "normalized": True
             }
 
             embedding = await self.database_service.create_embedding(embedding_data)
+            self._cache_embedding(note_id, embedding)
+            self._query_cache.clear()
             logger.info(f"Stored vector for note {note_id}")
             return embedding
 
@@ -67,8 +124,48 @@ class VectorStore:
             logger.error(f"Failed to store vector for note {note_id}: {e}")
             return None
 
+    async def store_vectors_batch(self, items: list[tuple[str, list[float], str, str]],
+                                  batch_size: int = 500) -> int:
+        """Store many vectors, upserting each batch in a single statement.
+        
+        Args:
+            items: (note_id, vector, model_name, model_version) tuples
+            batch_size: Maximum number of vectors written per statement
+            
+        Returns:
+            Number of vectors stored
+        """
+        rows = []
+        for note_id, vector, model_name, model_version in items:
+            if not self._validate_vector(vector, model_name):
+                logger.error(f"Invalid vector provided for note {note_id}, skipping")
+                continue
+            rows.append({
+                "note_id": note_id,
+                "vector": self._normalize_vector(vector),
+                "model_name": model_name,
+                "model_version": model_version,
+                "dimensions": len(vector),
+                "normalized": True
+            })
+
+        stored = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                stored += await self.database_service.create_embeddings_bulk(batch)
+                for row in batch:
+                    self._cache_embedding(row["note_id"], None)
+                self._query_cache.clear()
+            except Exception as e:
+                logger.error(f"Failed to store batch of {len(batch)} vectors: {e}")
+
+        logger.info(f"Stored {stored} of {len(items)} vectors in batches of {batch_size}")
+        return stored
+
     async def update_vector(self, note_id: str, new_vector: list[float],
-                           model_name: str, model_version: str) -> Embedding | None:
+                           model_name: str, model_version: str,
+                           existing: Embedding | None = None) -> Embedding | None:
         """Update an existing vector in the database.
         
         Args:
@@ -76,22 +173,24 @@ class VectorStore:
             new_vector: New embedding vector
             model_name: Name of the embedding model
             model_version: Version of the embedding model
+            existing: The note's current embedding, when the caller already
+                has it, which saves looking it up again
             
         Returns:
             Updated embedding record or None if update fails
         """
         try:
-            if not self._validate_vector(new_vector):
+            if not self._validate_vector(new_vector, model_name):
                 logger.error("Invalid vector provided for update")
                 return None
 
-            existing_embedding = await self.database_service.get_embedding_by_note_id(note_id)
+            existing_embedding = existing or await self._get_embedding(note_id)
             if not existing_embedding:
                 logger.warning(f"No existing embedding found for note {note_id}")
                 return None
 
             update_data = {
-                "vector": new_vector,
+                "vector": self._normalize_vector(new_vector),
                 "model_name": model_name,
                 "model_version": model_version,
                 "dimensions": len(new_vector)
@@ -100,6 +199,8 @@ class VectorStore:
             updated_embedding = await self.database_service.update_embedding(
                 existing_embedding.id, update_data
             )
+            self._cache_embedding(note_id, updated_embedding)
+            self._query_cache.clear()
             logger.info(f"Updated vector for note {note_id}")
             return updated_embedding
 
@@ -117,8 +218,9 @@ class VectorStore:
             Embedding vector or None if not found
         """
         try:
-            embedding = await self.database_service.get_embedding_by_note_id(note_id)
-            if embedding and embedding.vector:
+            embedding = await self._get_embedding(note_id)
+            # pgvector loads vectors as arrays, which have no truth value
+            if embedding is not None and embedding.vector is not None and len(embedding.vector):
                 return embedding.vector
             return None
 
@@ -126,15 +228,43 @@ class VectorStore:
             logger.error(f"Failed to retrieve vector for note {note_id}: {e}")
             return None
 
+    async def get_vector_array(self, note_id: str) -> np.ndarray | None:
+        """Retrieve a vector as a float32 array.
+        
+        Vectors loaded by pgvector are already float32 arrays and are returned
+        without a copy, so callers can pass them on without building a list.
+        
+        Args:
+            note_id: ID of the note to retrieve vector for
+            
+        Returns:
+            Embedding vector or None if not found
+        """
+        vector = await self.get_vector(note_id)
+        if vector is None:
+            return None
+        return np.asarray(vector, dtype=np.float32)
+
     async def similarity_search(self, query_vector: list[float],
                                limit: int = 10,
-                               distance_metric: str = "cosine") -> list[tuple[Embedding, float]]:
+                               distance_metric: str = "cosine",
+                               note_type_weights: dict[str, float] | None = None,
+                               quantization: str = "fp32",
+                               rerank_k: int | None = None,
+                               exclude_note_ids: list[str] | None = None) -> list[tuple[Embedding, float]]:
         """Perform similarity search using vector distance.
         
         Args:
             query_vector: Query vector to compare against
             limit: Maximum number of results to return
             distance_metric: Distance metric to use ("cosine", "l2", "inner_product")
+            note_type_weights: Optional weights by note type; when given, the
+                database ranks candidates by weighted similarity
+            quantization: Vector precision for candidate generation ("fp32",
+                "fp16", "binary"); reduced precision candidates are reranked
+                at full precision
+            rerank_k: Number of quantized candidates to rerank (default 4x limit)
+            exclude_note_ids: Notes whose embeddings are left out of the results
             
         Returns:
             List of (embedding, distance) tuples sorted by similarity
@@ -142,16 +272,45 @@ class VectorStore:
         if not self._validate_vector(query_vector):
             logger.error("Invalid query vector provided for search")
             return []
+        # Cosine distance is computed from the inner product, which is only
+        # right for a unit query
+        query_vector = self._normalize_vector(query_vector)
+
+        # Identical searches since the last write are answered from the cache
+        cache_key = (
+            hashlib.blake2b(np.asarray(query_vector, dtype=np.float32).tobytes(), digest_size=16).digest(),
+            limit, distance_metric, tuple(sorted((note_type_weights or {}).items())),
+            quantization, rerank_k, tuple(exclude_note_ids or ()),
+        )
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < QUERY_CACHE_TTL_SECONDS:
+            self._query_cache.move_to_end(cache_key)
+            return list(cached[1])
 
         try:
+            # Only forward optional ranking options when set, for backends without them
+            options = {}
+            if note_type_weights:
+                options["note_type_weights"] = note_type_weights
+            if quantization != "fp32":
+                options["quantization"] = quantization
+                options["rerank_k"] = rerank_k or limit * 4
+            if exclude_note_ids:
+                options["exclude_note_ids"] = exclude_note_ids
+
             results = await self.database_service.similarity_search(
                 query_vector=query_vector,
                 limit=limit,
-                distance_metric=distance_metric
+                distance_metric=distance_metric,
+                **options
             )
 
-            logger.info(f"Similarity search returned {len(results)} results")
-            return results
+            # Per-search logs format lazily, only if the record is emitted
+            logger.info("Similarity search returned %d results", len(results))
+            self._query_cache[cache_key] = (time.monotonic(), results)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return list(results)
 
         except Exception as e:
             logger.error(f"Similarity search failed: {e}")
@@ -175,6 +334,7 @@ class VectorStore:
         if not self._validate_vector(query_vector):
             logger.error("Invalid query vector provided for hybrid search")
             return []
+        query_vector = self._normalize_vector(query_vector)
 
         try:
             results = await self.database_service.hybrid_search(
@@ -184,52 +344,78 @@ class VectorStore:
                 distance_metric=distance_metric
             )
 
-            logger.info(f"Hybrid search returned {len(results)} results with filters: {filters}")
+            logger.info("Hybrid search returned %d results with filters: %s", len(results), filters)
             return results
 
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
             return []
 
-    async def batch_similarity_search(self, query_vectors: list[list[float]],
+    async def batch_similarity_search(self, query_vectors: list[list[float]] | np.ndarray,
                                      limit_per_query: int = 5,
                                      distance_metric: str = "cosine") -> list[list[tuple[Embedding, float]]]:
         """Perform similarity search for multiple query vectors.
         
         Args:
-            query_vectors: List of query vectors
+            query_vectors: List of query vectors, or an (N, 1536) array of
+                them, which is validated in one vectorized pass
             limit_per_query: Results limit per query
             distance_metric: Distance metric to use
             
         Returns:
-            List of results for each query vector
+            List of results for each valid query vector
         """
-        valid_vectors = [vec for vec in query_vectors if self._validate_vector(vec)]
+        if isinstance(query_vectors, np.ndarray):
+            valid = query_vectors[self._valid_rows(query_vectors)].astype(np.float64)
+            norms = np.linalg.norm(valid, axis=1, keepdims=True)
+            valid_vectors = list(np.divide(valid, norms, out=valid, where=norms > 0))
+        else:
+            valid_vectors = [self._normalize_vector(vec) for vec in query_vectors if self._validate_vector(vec)]
         if not valid_vectors:
             logger.warning("No valid query vectors provided for batch search")
             return []
 
-        try:
-            # Process queries in parallel
-            tasks = []
-            for query_vector in valid_vectors:
-                task = self.similarity_search(
-                    query_vector=query_vector,
+        # Backends that support it search the whole batch in one query
+        batch_search = getattr(self.database_service, "batch_similarity_search", None)
+        if batch_search is not None:
+            try:
+                results = await batch_search(
+                    query_vectors=valid_vectors,
                     limit=limit_per_query,
                     distance_metric=distance_metric
                 )
-                tasks.append(task)
+                logger.info(f"Batch similarity search processed {len(valid_vectors)} queries")
+                return results
+            except Exception as e:
+                logger.error(f"Batch similarity search failed: {e}")
+                return [[] for _ in valid_vectors]
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filter out exceptions
-            valid_results = []
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Batch search task failed: {result}")
-                    valid_results.append([])
-                else:
-                    valid_results.append(result)
+        try:
+            # Process queries in parallel, no more at once than there are
+            # pooled connections, so searches do not queue for one
+            pool_size = getattr(self.database_service, "pool_size", None) or DEFAULT_SEARCH_CONCURRENCY
+            semaphore = asyncio.Semaphore(min(len(valid_vectors), pool_size))
+
+            async def search(index: int, query_vector: list[float]) -> tuple[int, list[tuple[Embedding, float]]]:
+                async with semaphore:
+                    try:
+                        return index, await self.similarity_search(
+                            query_vector=query_vector,
+                            limit=limit_per_query,
+                            distance_metric=distance_metric
+                        )
+                    except Exception as e:
+                        logger.error(f"Batch search task failed: {e}")
+                        return index, []
+
+            # Results are placed by query index as each search finishes, so a
+            # slow search does not hold back handling of the others
+            valid_results: list[list[tuple[Embedding, float]]] = [[] for _ in valid_vectors]
+            for finished in asyncio.as_completed(
+                [search(index, query_vector) for index, query_vector in enumerate(valid_vectors)]
+            ):
+                index, result = await finished
+                valid_results[index] = result
 
             logger.info(f"Batch similarity search processed {len(valid_vectors)} queries")
             return valid_results
@@ -250,62 +436,97 @@ class VectorStore:
         """
         try:
             # Get the vector for the reference note
-            reference_vector = await self.get_vector(note_id)
-            if not reference_vector:
+            reference_vector = await self.get_vector_array(note_id)
+            if reference_vector is None:
                 logger.warning(f"No vector found for note {note_id}")
                 return []
 
-            # Perform similarity search
+            # Perform similarity search, leaving out the reference note itself
             similar_embeddings = await self.similarity_search(
                 query_vector=reference_vector,
-                limit=limit + 1,  # +1 to exclude the reference note itself
-                distance_metric="cosine"
+                limit=limit,
+                distance_metric="cosine",
+                exclude_note_ids=[note_id]
             )
 
-            # Filter out the reference note and return note IDs with scores
-            results = []
-            for embedding, distance in similar_embeddings:
-                if embedding.note_id != note_id:
-                    # Convert distance to similarity score (1 - distance for cosine)
-                    similarity_score = 1.0 - distance
-                    results.append((embedding.note_id, similarity_score))
-
-            # Limit results
-            results = results[:limit]
-            logger.info(f"Found {len(results)} similar notes for note {note_id}")
+            # Convert distance to similarity score (1 - distance for cosine)
+            results = [(embedding.note_id, 1.0 - distance) for embedding, distance in similar_embeddings]
+            logger.info("Found %d similar notes for note %s", len(results), note_id)
             return results
 
         except Exception as e:
             logger.error(f"Failed to find similar notes for {note_id}: {e}")
             return []
 
-    def _validate_vector(self, vector: list[float]) -> bool:
+    def _validate_vector(self, vector: list[float] | np.ndarray, model_name: str | None = None) -> bool:
         """Validate that a vector meets requirements.
         
+        The values are checked in one vectorized pass rather than element by
+        element; NaN and infinite values fall outside the range. Vectors from
+        TRUSTED_EMBEDDING_MODELS skip the range check but must still be
+        finite, since one NaN would poison every distance computed against
+        them.
+        
         Args:
             vector: The vector to validate
+            model_name: Name of the model that produced the vector, if known
             
         Returns:
             True if valid, False otherwise
         """
-        if not vector:
+        if vector is None or len(vector) == 0:
             return False
 
         # Check dimensions (OpenAI text-embedding-3-small uses 1536 dimensions)
-        if len(vector) != 1536:
-            logger.warning(f"Invalid vector dimensions: {len(vector)} != 1536")
+        if len(vector) != VECTOR_DIMENSIONS:
+            logger.warning(f"Invalid vector dimensions: {len(vector)} != {VECTOR_DIMENSIONS}")
             return False
 
-        # Check for valid numeric values
-        for value in vector:
-            if not isinstance(value, (int, float)):
+        # Check for valid numeric values. Lists, the usual input, are read
+        # with fromiter, which skips asarray's shape and type discovery.
+        if isinstance(vector, np.ndarray):
+            values = vector
+            if values.shape != (VECTOR_DIMENSIONS,) or values.dtype.kind not in "biuf":
                 return False
-            if not (-10 <= value <= 10):  # Reasonable range for embeddings
-                logger.warning(f"Vector value out of expected range: {value}")
+        else:
+            try:
+                values = np.fromiter(vector, dtype=np.float64, count=VECTOR_DIMENSIONS)
+            except (TypeError, ValueError):
                 return False
 
+        if model_name in TRUSTED_EMBEDDING_MODELS:
+            if not np.isfinite(values).all():
+                logger.warning("Vector contains NaN or infinite values")
+                return False
+            return True
+
+        largest = np.abs(values).max()
+        if not largest <= VECTOR_VALUE_LIMIT:
+            logger.warning(f"Vector value out of expected range: {largest}")
+            return False
+
         return True
 
+    @staticmethod
+    def _normalize_vector(vector: list[float] | np.ndarray) -> list[float]:
+        """Scale a vector to unit L2 norm, for storage and for search queries.
+
+        Every stored vector and query having unit norm is what lets searches
+        rank cosine and L2 distance by inner product alone. Zero vectors have
+        no direction and are left unchanged.
+        """
+        values = np.asarray(vector, dtype=np.float64)
+        norm = np.linalg.norm(values)
+        if norm:
+            values = values / norm
+        return values.tolist()
+
+    def _valid_rows(self, vectors: np.ndarray) -> np.ndarray:
+        """Mask of the rows of a stacked (N, dimensions) matrix that are valid vectors."""
+        if vectors.ndim != 2 or vectors.shape[1] != VECTOR_DIMENSIONS or vectors.dtype.kind not in "biuf":
+            return np.zeros(len(vectors), dtype=bool)
+        return (np.abs(vectors) <= VECTOR_VALUE_LIMIT).all(axis=1)
+
     async def get_vector_statistics(self) -> dict[str, Any]:
         """Get statistics about stored vectors.
         
@@ -349,6 +570,8 @@ class VectorStore:
         """
         try:
             count = await self.database_service.cleanup_orphaned_embeddings()
+            self._embedding_cache.clear()
+            self._query_cache.clear()
             logger.info(f"Removed {count} orphaned vectors")
             return count
         except Exception as e:
@@ -359,21 +582,24 @@ class VectorStore:
 class MockVectorStore(VectorStore):
     """Mock vector store for testing without database dependency."""
 
-    def __init__(self, database_service: DatabaseService):
+    def __init__(self, database_service: EmbeddingStoreService):
         super().__init__(database_service)
         self._vectors = {}  # In-memory storage for testing
+        # Stored embeddings stacked as rows, rebuilt after writes
+        self._embeddings: list[Embedding] = []
+        self._matrix: np.ndarray | None = None
 
     async def store_vector(self, note_id: str, vector: list[float],
                           model_name: str, model_version: str) -> Embedding | None:
         """Store vector in mock storage."""
-        if not self._validate_vector(vector):
+        if not self._validate_vector(vector, model_name):
             return None
 
         # Create mock embedding
         embedding = Embedding(
             id=str(uuid.uuid4()),
             note_id=note_id,
-            vector=vector,
+            vector=self._normalize_vector(vector),
             model_name=model_name,
             model_version=model_version,
             dimensions=len(vector),
@@ -382,8 +608,18 @@ class MockVectorStore(VectorStore):
         )
 
         self._vectors[note_id] = embedding
+        self._matrix = None
         return embedding
 
+    async def store_vectors_batch(self, items: list[tuple[str, list[float], str, str]],
+                                  batch_size: int = 500) -> int:
+        """Store many vectors in mock storage."""
+        stored = 0
+        for note_id, vector, model_name, model_version in items:
+            if await self.store_vector(note_id, vector, model_name, model_version):
+                stored += 1
+        return stored
+
     async def get_vector(self, note_id: str) -> list[float] | None:
         """Retrieve vector from mock storage."""
         embedding = self._vectors.get(note_id)
@@ -391,40 +627,57 @@ class MockVectorStore(VectorStore):
 
     async def similarity_search(self, query_vector: list[float],
                                limit: int = 10,
-                               distance_metric: str = "cosine") -> list[tuple[Embedding, float]]:
-        """Mock similarity search using cosine distance."""
+                               distance_metric: str = "cosine",
+                               note_type_weights: dict[str, float] | None = None,
+                               quantization: str = "fp32",
+                               rerank_k: int | None = None,
+                               exclude_note_ids: list[str] | None = None) -> list[tuple[Embedding, float]]:
+        """Mock similarity search using full-precision cosine distance.
+
+        Distances to every stored vector come from one matrix-vector product,
+        and only the nearest limit are sorted. Note type weights and
+        quantization options are accepted but ignored.
+        """
         if not self._validate_vector(query_vector):
             return []
+        if not self._vectors:
+            return []
 
-        results = []
-        for embedding in self._vectors.values():
-            # Simple mock cosine distance calculation
-            distance = self._mock_cosine_distance(query_vector, embedding.vector)
-            results.append((embedding, distance))
-
-        # Sort by distance (ascending) and limit results
-        results.sort(key=lambda x: x[1])
-        return results[:limit]
-
-    def _mock_cosine_distance(self, vec1: list[float], vec2: list[float]) -> float:
-        """Calculate mock cosine distance between two vectors."""
-        if len(vec1) != len(vec2):
-            return 1.0  # Maximum distance for different dimensions
-
-        # Simple mock implementation
-        dot_product = sum(a * b for a, b in zip(vec1, vec2, strict=False))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
-
-        if norm1 == 0 or norm2 == 0:
-            return 1.0
+        distances = self._mock_cosine_distances(np.asarray(query_vector, dtype=np.float64))
+        if exclude_note_ids:
+            excluded = set(map(str, exclude_note_ids))
+            for row, embedding in enumerate(self._embeddings):
+                if str(embedding.note_id) in excluded:
+                    distances[row] = np.inf
+
+        # Select the nearest limit rows, then sort only those (ascending)
+        if limit < len(distances):
+            nearest = np.argpartition(distances, limit)[:limit]
+        else:
+            nearest = np.arange(len(distances))
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return [
+            (self._embeddings[row], float(distances[row])) for row in nearest if distances[row] != np.inf
+        ]
+
+    def _mock_cosine_distances(self, query: np.ndarray) -> np.ndarray:
+        """Cosine distance from a query vector to every stored vector, by row.
+
+        Stored vectors have unit norm, or are zero, so only the query's norm
+        is needed; a zero vector on either side gets distance 1.
+        """
+        if self._matrix is None:
+            self._embeddings = list(self._vectors.values())
+            self._matrix = np.array([embedding.vector for embedding in self._embeddings], dtype=np.float64)
 
-        cosine_similarity = dot_product / (norm1 * norm2)
-        return 1.0 - cosine_similarity  # Convert to distance
+        query_norm = np.linalg.norm(query)
+        if not query_norm:
+            return np.ones(len(self._matrix))
+        return 1.0 - (self._matrix @ query) / query_norm
 
 
 # Factory function to create appropriate vector store
-def create_vector_store(database_service: DatabaseService, use_mock: bool = False) -> VectorStore:
+def create_vector_store(database_service: EmbeddingStoreService, use_mock: bool = False) -> VectorStore:
     """Create a vector store instance.
     
     Args:
@@ -440,5 +693,23 @@ def create_vector_store(database_service: DatabaseService, use_mock: bool = Fals
         return VectorStore(database_service)
 
 
+# Process-wide vector store (lazy initialization)
+_vector_store: VectorStore | None = None
+
+
+def get_vector_store() -> VectorStore:
+    """Get the vector store shared by every caller in this process.
+
+    Sharing one instance shares its lookup and search caches, so a write
+    through any caller invalidates what the others read. Other processes
+    see the write once their cached entries expire.
+    """
+    global _vector_store
+    if _vector_store is None:
+        from src.config.database import db_config
+        _vector_store = VectorStore(EmbeddingStoreService(db_config.async_session_maker, db_config.pool_size))
+    return _vector_store
+
+
 # Backward compatibility alias
 VectorStoreService = VectorStore
@@ -0,0 +1,48 @@
+"""Unit tests for embedding service search planning."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services.database import (
+    EMBEDDING_ROWS_ESTIMATE_SQL,
+    EXACT_SEARCH_MAX_ROWS,
+    EmbeddingService,
+)
+
+VECTOR = [0.5] * 1536
+
+
+class TestHybridSearchEstimate:
+    """Filtered searches size the HNSW candidate list from the row estimate."""
+
+    @pytest.fixture
+    def session(self):
+        """A session whose statements are recorded instead of executed."""
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(**{"all.return_value": []})
+        return session
+
+    async def search_ef(self, session, estimate):
+        """The ef_search set for a filter matching more rows than the exact-search cap."""
+        session.scalar.side_effect = [EXACT_SEARCH_MAX_ROWS + 1, estimate]
+        with patch.object(EmbeddingService, "_set_ef_search", new=AsyncMock()) as set_ef_search:
+            await EmbeddingService().hybrid_search(session, VECTOR, {"note_type": "permanent"}, limit=10)
+        return set_ef_search.await_args.args[1]
+
+    @pytest.mark.asyncio
+    async def test_estimate_reads_partitions(self, session):
+        await self.search_ef(session, 200_000)
+
+        estimate_query = session.scalar.await_args_list[1].args[0]
+        assert str(estimate_query) == EMBEDDING_ROWS_ESTIMATE_SQL
+        assert "pg_inherits" in EMBEDDING_ROWS_ESTIMATE_SQL
+
+    @pytest.mark.asyncio
+    async def test_ef_search_grows_with_selectivity(self, session):
+        assert await self.search_ef(session, 200_000) == 200
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("estimate", [None, -1, 0])
+    async def test_missing_estimate_assumes_no_filtering(self, session, estimate):
+        assert await self.search_ef(session, estimate) == 10
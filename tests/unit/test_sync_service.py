@@ -0,0 +1,382 @@
+"""Unit tests for the BrainForge-Obsidian sync service."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import httpx
+import pytest
+import yaml
+
+# Register the models Note's relationships name
+import src.models.orm.embedding  # noqa: F401
+import src.models.orm.link  # noqa: F401
+import src.models.orm.version_history  # noqa: F401
+from src.models.orm.note import Note, NoteType
+from src.models.orm.sync_state import SyncState
+from src.services.obsidian import ObsidianNote
+from src.services.sync import ConflictResolution, SyncConfig, SyncDirection, SyncService, _SyncCounts
+
+
+class FakeObsidianService:
+    """In-memory vault behaving like the Local REST API."""
+
+    def __init__(self):
+        self.files: dict[str, str] = {}
+        self.mtimes: dict[str, float] = {}
+        self.writes: list[str] = []
+        # Errors raised by the next writes, in order
+        self.failures: list[Exception] = []
+
+    async def create_or_append_note(self, filename: str, content: str) -> None:
+        # POST appends to an existing file
+        self.files[filename] = self.files.get(filename, "") + content
+        self.mtimes[filename] = datetime.now(UTC).timestamp()
+        self.writes.append(filename)
+
+    async def put_note(self, filename: str, content: str) -> None:
+        # PUT replaces the file
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, httpx.ReadTimeout):
+                # The server applied the write but the response was lost
+                self.files[filename] = content
+            raise failure
+        self.files[filename] = content
+        self.mtimes[filename] = datetime.now(UTC).timestamp()
+        self.writes.append(filename)
+
+    async def list_vault_index(self) -> dict[str, float]:
+        return dict(self.mtimes)
+
+    async def get_note(self, filename: str, as_json: bool = False) -> ObsidianNote:
+        # Like the note+json response, content is the whole file
+        content = self.files[filename]
+        frontmatter = {}
+        if content.startswith("---\n"):
+            frontmatter = yaml.safe_load(content[4:content.index("\n---\n", 3)]) or {}
+        return ObsidianNote(content=content, frontmatter=frontmatter, path=filename,
+                            stat={"mtime": self.mtimes[filename]}, tags=[])
+
+
+def make_note(content: str = "A note body.\n\nWith two paragraphs.") -> Note:
+    """A BrainForge note as loaded from the database."""
+    now = datetime.now(UTC)
+    return Note(id=uuid4(), content=content, note_type=NoteType.PERMANENT, note_metadata={"topic": "sync"},
+                created_by="tester", created_at=now, updated_at=now)
+
+
+@pytest.fixture
+def obsidian():
+    return FakeObsidianService()
+
+
+@pytest.fixture
+def sync_service(obsidian):
+    session = AsyncMock()
+    session.add_all = MagicMock()
+    return SyncService(session, obsidian)
+
+
+@pytest.fixture
+def brainforge(sync_service):
+    """BrainForge notes served to sync_notes in place of database queries.
+
+    Tests append notes to the returned list. Sync state starts empty and is
+    replaced by whatever the last sync saved.
+    """
+    notes: list[Note] = []
+    state: dict[str, SyncState] = {}
+
+    async def get_roots():
+        # One fixed root per bucket: the BrainForge side never changes on its own
+        buckets = {note.note_type.value for note in notes}
+        cursors = {bucket: max(note.updated_at for note in notes if note.note_type.value == bucket)
+                   for bucket in buckets}
+        return dict.fromkeys(buckets, 1), cursors
+
+    async def iter_headers(since=None, note_ids=()):
+        for note in notes:
+            if since is None or note.updated_at > since or str(note.id) in note_ids:
+                yield SimpleNamespace(id=note.id, note_type=note.note_type, content_hash=note.content_hash)
+
+    async def get_notes_by_id(note_ids):
+        return [note for note in notes if str(note.id) in note_ids]
+
+    async def save_state(sync_state):
+        state[sync_state.bucket] = sync_state
+
+    sync_service._get_brainforge_roots = get_roots
+    sync_service._load_sync_state = AsyncMock(side_effect=lambda: dict(state))
+    sync_service._iter_brainforge_note_headers = iter_headers
+    sync_service._get_brainforge_notes_by_id = get_notes_by_id
+    sync_service._get_brainforge_dedup_keys = AsyncMock(return_value=set())
+    sync_service.db_session.merge.side_effect = save_state
+    return notes
+
+
+class TestFrontmatterRoundTrip:
+    """Notes written to Obsidian must read back as the same note."""
+
+    @pytest.mark.asyncio
+    async def test_created_note_reads_back_unchanged(self, sync_service, obsidian):
+        note = make_note()
+        await sync_service._create_obsidian_note(note)
+
+        [read_back] = await sync_service._get_obsidian_notes([sync_service._note_path(note)])
+        hashes = await sync_service._hash_obsidian_notes([read_back])
+
+        assert read_back.frontmatter["id"] == str(note.id)
+        assert read_back.content == note.content
+        assert hashes[read_back.path] == note.content_hash
+
+    @pytest.mark.asyncio
+    async def test_synced_pair_needs_no_update(self, sync_service, obsidian):
+        note = make_note()
+        await sync_service._create_obsidian_note(note)
+        obsidian_notes = await sync_service._get_obsidian_notes([sync_service._note_path(note)])
+        hashes = await sync_service._hash_obsidian_notes(obsidian_notes)
+        writes = len(obsidian.writes)
+
+        counts = _SyncCounts()
+        config = SyncConfig(direction=SyncDirection.BIDIRECTIONAL,
+                            conflict_resolution=ConflictResolution.KEEP_OBSIDIAN)
+        await sync_service._sync_note_sets(config, counts, [note], obsidian_notes, hashes)
+
+        assert counts.updated == counts.created == counts.conflicts == counts.errors == 0
+        assert len(obsidian.writes) == writes
+        assert note.content == "A note body.\n\nWith two paragraphs."
+
+    @pytest.mark.asyncio
+    async def test_obsidian_edit_updates_body_only(self, sync_service, obsidian):
+        note = make_note()
+        path = sync_service._note_path(note)
+        await sync_service._create_obsidian_note(note)
+        obsidian.files[path] = obsidian.files[path].replace("two paragraphs", "an edit")
+        obsidian_notes = await sync_service._get_obsidian_notes([path])
+
+        await sync_service._update_brainforge_note(note, obsidian_notes[0])
+
+        assert note.content == "A note body.\n\nWith an edit."
+        assert note.content_hash == (await sync_service._hash_obsidian_notes(obsidian_notes))[path]
+
+
+class TestObsidianWriteRetry:
+    """Writes retry transient failures and are buffered when they keep failing."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_applied_write_does_not_duplicate(self, sync_service, obsidian):
+        obsidian.failures = [httpx.ReadTimeout("lost response"), httpx.ConnectError("refused")]
+
+        await sync_service._obsidian_write_with_retry("permanent/a.md", "body", base_delay=0)
+
+        assert obsidian.files["permanent/a.md"] == "body"
+        assert not sync_service._offline_buffer
+
+    @pytest.mark.asyncio
+    async def test_exhausted_write_is_buffered_and_replayed_once(self, sync_service, obsidian):
+        obsidian.failures = [httpx.ConnectError("refused")] * 2
+        with pytest.raises(httpx.ConnectError):
+            await sync_service._obsidian_write_with_retry("permanent/a.md", "body", attempts=2, base_delay=0)
+        assert dict(sync_service._offline_buffer) == {"permanent/a.md": "body"}
+
+        assert await sync_service._replay_offline_writes() == 1
+        assert await sync_service._replay_offline_writes() == 0
+        assert obsidian.files["permanent/a.md"] == "body"
+        assert obsidian.writes == ["permanent/a.md"]
+
+    @pytest.mark.asyncio
+    async def test_buffer_keeps_only_latest_write_per_path(self, sync_service, obsidian):
+        for content in ("first", "second"):
+            obsidian.failures = [httpx.ConnectError("refused")]
+            with pytest.raises(httpx.ConnectError):
+                await sync_service._obsidian_write_with_retry("permanent/a.md", content, attempts=1)
+
+        await sync_service._replay_offline_writes()
+
+        assert obsidian.files["permanent/a.md"] == "second"
+        assert obsidian.writes == ["permanent/a.md"]
+
+    @pytest.mark.asyncio
+    async def test_successful_write_drops_buffered_one(self, sync_service, obsidian):
+        obsidian.failures = [httpx.ConnectError("refused")]
+        with pytest.raises(httpx.ConnectError):
+            await sync_service._obsidian_write_with_retry("permanent/a.md", "stale", attempts=1)
+
+        await sync_service._obsidian_write_with_retry("permanent/a.md", "fresh")
+
+        assert await sync_service._replay_offline_writes() == 0
+        assert obsidian.files["permanent/a.md"] == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_http_errors_are_not_retried(self, sync_service, obsidian):
+        request = httpx.Request("PUT", "https://obsidian/vault/permanent/a.md")
+        obsidian.failures = [httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400))]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await sync_service._obsidian_write_with_retry("permanent/a.md", "body", base_delay=0)
+
+        assert not sync_service._offline_buffer
+        assert "permanent/a.md" not in obsidian.files
+
+    @pytest.mark.asyncio
+    async def test_sync_replays_buffered_writes_first(self, sync_service, obsidian, brainforge):
+        obsidian.failures = [httpx.ConnectError("refused")]
+        with pytest.raises(httpx.ConnectError):
+            await sync_service._obsidian_write_with_retry("permanent/a.md", "body", attempts=1)
+
+        result = await sync_service.sync_notes(SyncConfig())
+
+        assert result.details["replayed_writes"] == 1
+        assert obsidian.files["permanent/a.md"] == "body"
+
+
+class TestBucketSkip:
+    """Buckets whose roots match the last sync on both sides are skipped."""
+
+    def test_unchanged_buckets_need_both_roots_to_match(self, sync_service):
+        now = datetime.now(UTC)
+        sync_state = {
+            "permanent": SyncState(bucket="permanent", brainforge_root=1, obsidian_root=2, last_sync_at=now),
+            "fleeting": SyncState(bucket="fleeting", brainforge_root=3, obsidian_root=4, last_sync_at=now),
+            "insight": SyncState(bucket="insight", brainforge_root=5, obsidian_root=6, last_sync_at=now),
+        }
+
+        unchanged = sync_service._get_unchanged_buckets(
+            sync_state, {"permanent": 1, "fleeting": 3, "insight": 7}, {"permanent": 2, "fleeting": 8, "insight": 6}
+        )
+
+        assert unchanged == {"permanent"}
+
+    @pytest.mark.asyncio
+    async def test_bucket_is_skipped_once_roots_settle(self, sync_service, obsidian, brainforge):
+        brainforge.append(make_note())
+
+        first = await sync_service.sync_notes(SyncConfig())
+        # Roots are read before the sync's own writes, so the next sync revisits the bucket
+        second = await sync_service.sync_notes(SyncConfig())
+        # A full sync reads every note but the settled bucket's
+        third = await sync_service.sync_notes(SyncConfig(incremental=False))
+
+        assert first.created == 1
+        assert first.details["unchanged_buckets"] == second.details["unchanged_buckets"] == []
+        assert third.details["unchanged_buckets"] == ["permanent"]
+        assert third.processed == third.details["brainforge_notes_loaded"] == 0
+        assert obsidian.writes == [sync_service._note_path(brainforge[0])]
+
+    @pytest.mark.asyncio
+    async def test_edit_in_skipped_bucket_is_synced(self, sync_service, obsidian, brainforge):
+        note = make_note()
+        note.updated_at -= timedelta(hours=1)
+        brainforge.append(note)
+        for _ in range(3):
+            await sync_service.sync_notes(SyncConfig())
+
+        path = sync_service._note_path(note)
+        obsidian.files[path] = obsidian.files[path].replace("two paragraphs", "an edit")
+        obsidian.mtimes[path] += 1
+        result = await sync_service.sync_notes(SyncConfig())
+
+        assert result.details["unchanged_buckets"] == []
+        assert note.content == "A note body.\n\nWith an edit."
+
+
+class TestCursorAdvancement:
+    """Each successful sync records the latest modification time it saw per bucket."""
+
+    def test_cursor_is_latest_mtime_per_bucket(self, sync_service):
+        notes = [
+            ObsidianNote(content="", frontmatter={}, path=path, stat={"mtime": mtime}, tags=[])
+            for path, mtime in [("permanent/a.md", 30.0), ("permanent/b.md", 10.0),
+                                ("fleeting/c.md", 20.0), ("fleeting/d.md", None)]
+        ]
+
+        assert sync_service._get_obsidian_cursors(notes) == {"permanent": 30.0, "fleeting": 20.0}
+
+    @pytest.mark.asyncio
+    async def test_cursor_advances_and_skips_unmodified_notes(self, sync_service, obsidian, brainforge):
+        edited, untouched = make_note(), make_note("Another body.")
+        for note in (edited, untouched):
+            note.updated_at -= timedelta(hours=1)
+            brainforge.append(note)
+        await sync_service.sync_notes(SyncConfig())
+        await sync_service.sync_notes(SyncConfig())
+        cursor = (await sync_service._load_sync_state())["permanent"].obsidian_mtime_cursor
+
+        path = sync_service._note_path(edited)
+        obsidian.files[path] = obsidian.files[path].replace("two paragraphs", "an edit")
+        obsidian.mtimes[path] = cursor + 60
+        result = await sync_service.sync_notes(SyncConfig())
+
+        # The edited note is processed once in each direction; the untouched one not at all
+        assert result.processed == 2
+        assert edited.content == "A note body.\n\nWith an edit."
+        assert (await sync_service._load_sync_state())["permanent"].obsidian_mtime_cursor == cursor + 60
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_not_saved_after_conflicts(self, sync_service, obsidian, brainforge):
+        note = make_note()
+        brainforge.append(note)
+        await sync_service.sync_notes(SyncConfig())
+        await sync_service.sync_notes(SyncConfig())
+        state = await sync_service._load_sync_state()
+
+        path = sync_service._note_path(note)
+        obsidian.files[path] = obsidian.files[path].replace("two paragraphs", "an edit")
+        obsidian.mtimes[path] = note.updated_at.timestamp() + 1
+        result = await sync_service.sync_notes(SyncConfig(conflict_resolution=ConflictResolution.SKIP))
+
+        assert result.conflicts
+        assert await sync_service._load_sync_state() == state
+
+
+class TestConflictDirection:
+    """Notes edited on both sides within the conflict window resolve as configured."""
+
+    async def edit_both_sides(self, sync_service, obsidian):
+        note = make_note()
+        path = sync_service._note_path(note)
+        await sync_service._create_obsidian_note(note)
+        obsidian.files[path] = obsidian.files[path].replace("two paragraphs", "an Obsidian edit")
+        note.content = "A note body.\n\nWith a BrainForge edit."
+        obsidian_notes = await sync_service._get_obsidian_notes([path])
+        return note, path, obsidian_notes, await sync_service._hash_obsidian_notes(obsidian_notes)
+
+    @pytest.mark.asyncio
+    async def test_keep_brainforge_overwrites_obsidian(self, sync_service, obsidian):
+        note, path, obsidian_notes, hashes = await self.edit_both_sides(sync_service, obsidian)
+
+        counts = _SyncCounts()
+        config = SyncConfig(conflict_resolution=ConflictResolution.KEEP_BRAINFORGE)
+        await sync_service._sync_note_sets(config, counts, [note], obsidian_notes, hashes)
+
+        assert counts.conflicts
+        assert note.content == "A note body.\n\nWith a BrainForge edit."
+        assert obsidian.files[path].endswith("With a BrainForge edit.")
+
+    @pytest.mark.asyncio
+    async def test_keep_obsidian_overwrites_brainforge(self, sync_service, obsidian):
+        note, path, obsidian_notes, hashes = await self.edit_both_sides(sync_service, obsidian)
+        writes = len(obsidian.writes)
+
+        counts = _SyncCounts()
+        config = SyncConfig(conflict_resolution=ConflictResolution.KEEP_OBSIDIAN)
+        await sync_service._sync_note_sets(config, counts, [note], obsidian_notes, hashes)
+
+        assert counts.conflicts
+        assert note.content == "A note body.\n\nWith an Obsidian edit."
+        assert len(obsidian.writes) == writes
+
+    @pytest.mark.asyncio
+    async def test_skip_leaves_both_sides(self, sync_service, obsidian):
+        note, path, obsidian_notes, hashes = await self.edit_both_sides(sync_service, obsidian)
+        before = obsidian.files[path]
+
+        counts = _SyncCounts()
+        await sync_service._sync_note_sets(SyncConfig(conflict_resolution=ConflictResolution.SKIP),
+                                           counts, [note], obsidian_notes, hashes)
+
+        assert counts.conflicts
+        assert note.content == "A note body.\n\nWith a BrainForge edit."
+        assert obsidian.files[path] == before
@@ -0,0 +1,120 @@
+"""Unit tests for the vector store against the real embedding service signatures."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.models.orm.embedding import Embedding
+from src.services.database import EmbeddingService, EmbeddingStoreService
+from src.services import vector_store as vector_store_module
+from src.services.vector_store import VectorStore, get_vector_store
+
+VECTOR = [0.5] * 1536
+
+
+@pytest.fixture
+def session():
+    """A session whose statements are recorded instead of executed."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    return session
+
+
+@pytest.fixture
+def vector_store(session):
+    """A vector store on the session-per-call backend."""
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    return VectorStore(EmbeddingStoreService(session_maker, pool_size=4))
+
+
+class TestVectorStoreBackend:
+    """VectorStore calls must reach EmbeddingService with a session."""
+
+    @pytest.mark.asyncio
+    async def test_store_vector_creates_embedding(self, vector_store, session):
+        note_id = uuid4()
+        session.execute.return_value = MagicMock(**{"scalars.return_value.all.return_value": []})
+
+        embedding = await vector_store.store_vector(str(note_id), VECTOR, "text-embedding-3-small", "v1.0")
+
+        assert isinstance(embedding, Embedding)
+        assert embedding.note_id == note_id
+        assert embedding.model_version == "v1.0"
+        session.add.assert_called_once_with(embedding)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_store_vectors_batch_commits_once_per_batch(self, vector_store, session):
+        items = [(str(uuid4()), VECTOR, "text-embedding-3-small", "v1.0") for _ in range(3)]
+
+        stored = await vector_store.store_vectors_batch(items, batch_size=2)
+
+        assert stored == 3
+        assert session.execute.await_count == 2
+        assert session.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_similarity_search_forwards_options(self, vector_store, session):
+        exclude = [uuid4()]
+        with patch.object(EmbeddingService, "similarity_search", autospec=True, return_value=[]) as search:
+            results = await vector_store.similarity_search(
+                VECTOR, limit=5, note_type_weights={"permanent": 1.5}, exclude_note_ids=exclude
+            )
+
+        assert results == []
+        search.assert_awaited_once_with(
+            search.call_args.args[0], session, query_vector=VectorStore._normalize_vector(VECTOR), limit=5,
+            distance_metric="cosine", note_type_weights={"permanent": 1.5},
+            exclude_note_ids=exclude,
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_similarity_search_uses_one_query(self, vector_store, session):
+        with patch.object(EmbeddingService, "batch_similarity_search", autospec=True,
+                          return_value=[[], []]) as search:
+            results = await vector_store.batch_similarity_search([VECTOR, VECTOR], limit_per_query=3)
+
+        assert results == [[], []]
+        search.assert_awaited_once()
+        assert search.call_args.args[1] is session
+
+
+class TestQueryNormalization:
+    """Queries reach the database with unit norm, as cosine distance assumes."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["similarity_search", "hybrid_search"])
+    async def test_single_query_is_normalized(self, vector_store, method):
+        with patch.object(EmbeddingService, method, autospec=True, return_value=[]) as search:
+            await getattr(vector_store, method)(VECTOR, limit=5)
+
+        query = np.asarray(search.call_args.kwargs["query_vector"])
+        assert np.linalg.norm(query) == pytest.approx(1.0)
+        assert query == pytest.approx(np.full(1536, 1 / np.sqrt(1536)))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("as_array", [False, True])
+    async def test_batch_queries_are_normalized(self, vector_store, as_array):
+        queries = [VECTOR, [2.0] * 1536]
+        with patch.object(EmbeddingService, "batch_similarity_search", autospec=True,
+                          return_value=[[], []]) as search:
+            await vector_store.batch_similarity_search(np.array(queries) if as_array else queries)
+
+        norms = np.linalg.norm(np.asarray(search.call_args.kwargs["query_vectors"]), axis=1)
+        assert norms == pytest.approx([1.0, 1.0])
+
+
+class TestSharedVectorStore:
+    """Every caller in a process shares one store, so writes invalidate every reader's cache."""
+
+    def test_callers_share_one_store(self, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "_vector_store", None)
+        database = MagicMock(db_config=MagicMock(pool_size=4))
+        with patch.dict("sys.modules", {"src.config.database": database}):
+            store = get_vector_store()
+
+            assert get_vector_store() is store
+        assert store.database_service.pool_size == 4